@@ -0,0 +1,53 @@
+"""Add user email and item owner indexes
+
+Revision ID: 5f3c8b1d2a47
+Revises: 1a31ce608336
+Create Date: 2026-10-17 09:12:41.318205
+
+Both indexes are built with CREATE INDEX CONCURRENTLY outside of the
+migration transaction, so they do not block writes on large tables.
+ix_user_email was already part of the initial migration; it is only
+created here when missing (e.g. tables created with create_all). If a
+concurrent build fails it leaves an INVALID index behind: drop it and
+rerun the migration.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5f3c8b1d2a47'
+down_revision = '1a31ce608336'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_email',
+            'user',
+            ['email'],
+            unique=True,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_item_owner_id_id',
+            'item',
+            ['owner_id', 'id'],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_item_owner_id_id',
+            table_name='item',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -1,18 +1,20 @@
-from collections.abc import Generator
+import uuid
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
-import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import async_engine, engine
+from app.core.replicas import replica_router
+from app.core.user_cache import user_cache
 from app.models import User
-from app.schemas import TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -20,28 +22,58 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 
 def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+    # 寫入透過 RETURNING 取回資料列，commit 後不需要再重新載入
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # commit 後不讓物件過期，否則在 async 路由中讀取屬性會觸發隱含的同步載入
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
 
 
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def _user_id_from_token(token: str) -> uuid.UUID:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
+        token_data = security.decode_access_token(token)
+        return uuid.UUID(token_data.sub)
+    except (InvalidTokenError, ValidationError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+
+
+def get_read_db(token: TokenDep) -> Generator[Session, None, None]:
+    # 唯讀路由使用：有設定副本時分派到副本，寫入後的短暫時間內仍讀主庫
+    with replica_router.connect(_user_id_from_token(token)) as connection:
+        with Session(connection) as session:
+            yield session
+
+
+async def get_async_read_db(token: TokenDep) -> AsyncGenerator[AsyncSession, None]:
+    async with replica_router.connect_async(_user_id_from_token(token)) as connection:
+        async with AsyncSession(connection, expire_on_commit=False) as session:
+            yield session
+
+
+ReadSessionDep = Annotated[Session, Depends(get_read_db)]
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_db)]
+
+
+def get_current_user(session: SessionDep, token: TokenDep) -> User:
+    user_id = _user_id_from_token(token)
+    user = user_cache.get(session, user_id)
     if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+        user = session.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        user_cache.set(user)
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
@@ -50,9 +82,33 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def get_current_user_async(session: AsyncSessionDep, token: TokenDep) -> User:
+    user_id = _user_id_from_token(token)
+    user = await user_cache.get_async(session, user_id)
+    if not user:
+        user = await session.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        user_cache.set(user)
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+
+AsyncCurrentUser = Annotated[User, Depends(get_current_user_async)]
+
+
 def get_current_active_superuser(current_user: CurrentUser) -> User:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+async def get_current_active_superuser_async(current_user: AsyncCurrentUser) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403, detail="The user doesn't have enough privileges"
+        )
+    return current_user
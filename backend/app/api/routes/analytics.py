@@ -0,0 +1,47 @@
+import io
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.api.deps import ReadSessionDep, get_current_active_superuser
+from app.schemas import AnalyticsPublic
+from app.services.analytics import AnalyticsReport, AnalyticsService
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+    dependencies=[Depends(get_current_active_superuser)],
+)
+
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+@router.get(
+    "/{report}",
+    response_model=AnalyticsPublic,
+    responses={200: {"content": {PARQUET_MEDIA_TYPE: {}}}},
+)
+def read_report(
+    session: ReadSessionDep,
+    report: AnalyticsReport,
+    format: Literal["json", "parquet"] = "json",
+    limit: int = Query(default=100, ge=1),
+) -> AnalyticsPublic | Response:
+    """
+    Aggregate items and users with polars.
+
+    Reports: `items-per-owner` (top `limit` owners by item count),
+    `user-activity` (active and item-owning user ratios) and
+    `description-lengths` (item description length distribution).
+    `format=parquet` downloads the report as a Parquet file.
+    """
+    frame = AnalyticsService(session).report(report, limit=limit)
+    if format == "parquet":
+        buffer = io.BytesIO()
+        frame.write_parquet(buffer)
+        return Response(
+            buffer.getvalue(),
+            media_type=PARQUET_MEDIA_TYPE,
+            headers={"Content-Disposition": f'attachment; filename="{report}.parquet"'},
+        )
+    return AnalyticsPublic(report=report, rows=frame.to_dicts())
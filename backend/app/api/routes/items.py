@@ -1,53 +1,160 @@
 import uuid
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Any, Literal, cast
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser, SessionDep
-from app.models import Item
-from app.schemas import ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncReadSessionDep,
+    AsyncSessionDep,
+    CurrentUser,
+    SessionDep,
+    get_current_active_superuser,
+)
+from app.core.config import settings
+from app.core.deadlines import deadline
+from app.core.export import MEDIA_TYPES, ExportFormat, encode_export
+from app.core.replicas import replica_router
+from app.models import Item, User
+from app.schemas import (
+    ItemBatch,
+    ItemBatchResult,
+    ItemBatchResults,
+    ItemCreate,
+    ItemImportReport,
+    ItemPublic,
+    ItemsPublic,
+    ItemUpdate,
+    Message,
+)
+from app.services.item import EXPORT_COLUMNS, AsyncItemService
+from app.services.item_import import ImportFormat, ItemImportService
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
-@router.get("/", response_model=ItemsPublic)
-def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+@router.get(
+    "/",
+    response_model=ItemsPublic,
+    dependencies=[Depends(deadline(settings.ITEM_LIST_TIMEOUT_MS))],
+)
+async def read_items(
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: bool = True,
+    approximate_count: bool = False,
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: str | None = None,
 ) -> Any:
     """
     Retrieve items.
+
+    The page and its total come back from a single statement. Pass
+    `include_count=false` to skip the total (`count` is then null).
+
+    With `approximate_count=true` a superuser's total may come from the
+    planner statistics on large tables; `count_exact` tells which one was used.
+
+    With `pagination=cursor` (or any `cursor`), items are returned in id order
+    after the given cursor and `next_cursor` points at the following page;
+    `skip` is ignored in that mode.
     """
+    item_service = AsyncItemService(session)
+    owner_id = None if current_user.is_superuser else current_user.id
 
-    if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Item)
-        count = session.exec(count_statement).one()
-        statement = select(Item).offset(skip).limit(limit)
-        items = session.exec(statement).all()
-    else:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.owner_id == current_user.id)
+    if pagination == "cursor" or cursor is not None:
+        try:
+            items, next_cursor = await item_service.get_page_after(
+                cursor=cursor, limit=limit, owner_id=owner_id
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        count: int | None = None
+        count_exact = True
+        if include_count:
+            if owner_id is None:
+                count, count_exact = await item_service.count_total(
+                    approximate=approximate_count
+                )
+            else:
+                count = await item_service.count_by_owner(owner_id)
+        # 資料表模型由 pydantic 以 from_attributes 轉為 ItemPublic
+        return ItemsPublic(
+            data=cast(list[ItemPublic], items),
+            count=count,
+            skip=0,
+            limit=limit,
+            count_exact=count_exact,
+            next_cursor=next_cursor,
         )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Item)
-            .where(Item.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        items = session.exec(statement).all()
 
-    return ItemsPublic(data=items, count=count, skip=skip, limit=limit)
+    items, count, count_exact = await item_service.get_page(
+        skip=skip,
+        limit=limit,
+        owner_id=owner_id,
+        include_count=include_count,
+        approximate=approximate_count,
+    )
+    return ItemsPublic(
+        data=cast(list[ItemPublic], items),
+        count=count,
+        skip=skip,
+        limit=limit,
+        count_exact=count_exact,
+    )
+
+
+@router.get("/export")
+async def export_items(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    format: ExportFormat = "ndjson",
+    owner_id: uuid.UUID | None = None,
+) -> StreamingResponse:
+    """
+    Export items as NDJSON or CSV.
+
+    Rows are streamed in id order from a server-side cursor, so memory use stays
+    flat however many items there are. Superusers export every item, or one
+    owner's with `owner_id`; other users export their own items.
+    """
+    user_id = current_user.id
+    if not current_user.is_superuser:
+        if owner_id not in (None, user_id):
+            raise HTTPException(status_code=400, detail="Not enough permissions")
+        owner_id = user_id
+    # 匯出可能持續很久，先歸還認證時使用的主庫連線
+    await session.close()
+
+    async def content() -> AsyncIterator[bytes]:
+        async with replica_router.connect_async(user_id) as connection:
+            async with AsyncSession(connection) as export_session:
+                rows = AsyncItemService(export_session).stream_export(
+                    owner_id, size=settings.ITEM_EXPORT_BATCH_SIZE
+                )
+                async for chunk in encode_export(format, EXPORT_COLUMNS, rows):
+                    yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'},
+    )
 
 
 @router.get("/{id}", response_model=ItemPublic)
-def read_item(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+async def read_item(
+    session: AsyncReadSessionDep, current_user: AsyncCurrentUser, id: uuid.UUID
+) -> Any:
     """
     Get item by ID.
     """
-    item = session.get(Item, id)
+    item = await session.get(Item, id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     if not current_user.is_superuser and (item.owner_id != current_user.id):
@@ -56,55 +163,109 @@ def read_item(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) ->
 
 
 @router.post("/", response_model=ItemPublic)
-def create_item(
-    *, session: SessionDep, current_user: CurrentUser, item_in: ItemCreate
+async def create_item(
+    *, session: AsyncSessionDep, current_user: AsyncCurrentUser, item_in: ItemCreate
 ) -> Any:
     """
     Create new item.
     """
-    item = Item.model_validate(item_in, update={"owner_id": current_user.id})
-    session.add(item)
-    session.commit()
-    session.refresh(item)
-    return item
+    return await AsyncItemService(session).create(item_in, owner_id=current_user.id)
 
 
-@router.put("/{id}", response_model=ItemPublic)
-def update_item(
-    *,
+@router.post("/batch", response_model=ItemBatchResults)
+async def batch_items(
+    *, session: AsyncSessionDep, current_user: AsyncCurrentUser, batch: ItemBatch
+) -> Any:
+    """
+    Create, update and delete many items in one request.
+
+    Operations run in a single transaction: all creates, then all updates, then
+    all deletes. Each result carries the status code the matching single-item
+    route would have returned, in the same order as the operations.
+    """
+    if len(batch.operations) > settings.ITEM_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.ITEM_BATCH_MAX_SIZE} operations per batch",
+        )
+    outcomes = await AsyncItemService(session).batch(batch.operations, current_user)
+    results = []
+    for op, (item, found) in zip(batch.operations, outcomes, strict=True):
+        if item is None and found:
+            results.append(ItemBatchResult(status=400, detail="Not enough permissions"))
+        elif item is None:
+            results.append(ItemBatchResult(status=404, detail="Item not found"))
+        elif op.op == "delete":
+            results.append(
+                ItemBatchResult(status=200, detail="Item deleted successfully")
+            )
+        else:
+            results.append(ItemBatchResult(status=200, item=cast(ItemPublic, item)))
+    return ItemBatchResults(results=results)
+
+
+@router.post(
+    "/import",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=ItemImportReport,
+)
+def import_items(
     session: SessionDep,
     current_user: CurrentUser,
+    file: UploadFile,
+    format: ImportFormat | None = None,
+    owner_id: uuid.UUID | None = None,
+) -> Any:
+    """
+    Bulk import items from an uploaded CSV or NDJSON file.
+
+    Valid rows are loaded with COPY and committed together; invalid rows are
+    skipped and reported with their line numbers. `format` defaults to the file
+    extension. Items belong to `owner_id`, or to the caller when it is omitted.
+    """
+    owner_id = owner_id or current_user.id
+    if not session.get(User, owner_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "csv" if filename.endswith(".csv") else "ndjson"
+    try:
+        return ItemImportService(session).import_file(file.file, format, owner_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="File is not valid UTF-8")
+
+
+@router.put("/{id}", response_model=ItemPublic)
+async def update_item(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     id: uuid.UUID,
     item_in: ItemUpdate,
 ) -> Any:
     """
     Update an item.
     """
-    item = session.get(Item, id)
+    try:
+        item = await AsyncItemService(session).update(id, item_in, current_user)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    if not current_user.is_superuser and (item.owner_id != current_user.id):
-        raise HTTPException(status_code=400, detail="Not enough permissions")
-    update_dict = item_in.model_dump(exclude_unset=True)
-    item.sqlmodel_update(update_dict)
-    session.add(item)
-    session.commit()
-    session.refresh(item)
     return item
 
 
 @router.delete("/{id}")
-def delete_item(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+async def delete_item(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, id: uuid.UUID
 ) -> Message:
     """
     Delete an item.
     """
-    item = session.get(Item, id)
+    try:
+        item = await AsyncItemService(session).delete(id, current_user)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    if not current_user.is_superuser and (item.owner_id != current_user.id):
-        raise HTTPException(status_code=400, detail="Not enough permissions")
-    session.delete(item)
-    session.commit()
     return Message(message="Item deleted successfully")
@@ -1,29 +1,41 @@
 import uuid
-from typing import Any
+from typing import Any, Literal, cast
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlmodel import func, select
 
-from app.services.user import UserService
+from app.services.email_outbox import AsyncEmailOutboxService
+from app.services.user import AsyncUserService, UserService
+from app.services.user_deletion import (
+    UserDeletionService,
+    run_user_deletion,
+    user_deletion_jobs,
+)
 from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncSessionDep,
     CurrentUser,
+    ReadSessionDep,
     SessionDep,
     get_current_active_superuser,
+    get_current_active_superuser_async,
 )
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
-from app.models import User, Item
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.user_cache import user_cache
+from app.models import User
 from app.schemas import (
     Message,
     UpdatePassword,
     UserCreate,
+    UserDeletionJob,
     UserPublic,
     UserRegister,
     UsersPublic,
     UserUpdate,
     UserUpdateMe,
 )
-from app.utils import generate_new_account_email, send_email
+from app.utils import generate_new_account_email
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -33,38 +45,87 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+    session: ReadSessionDep,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: bool = True,
+    approximate_count: bool = False,
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: str | None = None,
+) -> Any:
     """
     Retrieve users.
+
+    The page and its total come back from a single statement. Pass
+    `include_count=false` to skip the total (`count` is then null).
+
+    With `approximate_count=true` the total may come from the planner
+    statistics on large tables; `count_exact` tells which one was used.
+
+    With `pagination=cursor` (or any `cursor`), users are returned in email
+    order after the given cursor and `next_cursor` points at the following
+    page; `skip` is ignored in that mode.
     """
     user_service = UserService(session)
-    count = user_service.count()
-    users = user_service.get_all(skip=skip, limit=limit)
 
-    return UsersPublic(data=users, count=count, skip=skip, limit=limit)
+    if pagination == "cursor" or cursor is not None:
+        try:
+            users, next_cursor = user_service.get_page_after(cursor=cursor, limit=limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        count: int | None = None
+        count_exact = True
+        if include_count:
+            count, count_exact = user_service.count_total(approximate=approximate_count)
+        # 資料表模型由 pydantic 以 from_attributes 轉為 UserPublic
+        return UsersPublic(
+            data=cast(list[UserPublic], users),
+            count=count,
+            skip=0,
+            limit=limit,
+            count_exact=count_exact,
+            next_cursor=next_cursor,
+        )
+
+    users, count, count_exact = user_service.get_page(
+        skip=skip,
+        limit=limit,
+        include_count=include_count,
+        approximate=approximate_count,
+    )
+    return UsersPublic(
+        data=cast(list[UserPublic], users),
+        count=count,
+        skip=skip,
+        limit=limit,
+        count_exact=count_exact,
+    )
 
 
 @router.post(
-    "/", dependencies=[Depends(get_current_active_superuser)], response_model=UserPublic
+    "/",
+    dependencies=[Depends(get_current_active_superuser_async)],
+    response_model=UserPublic,
 )
-def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
+async def create_user(*, session: AsyncSessionDep, user_in: UserCreate) -> Any:
     """
     Create new user.
     """
-    user_service = UserService(session)
-    user = user_service.get_by_email(user_in.email)
+    user_service = AsyncUserService(session)
+    user = await user_service.get_by_email(user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
 
-    user = user_service.create(user_in)
+    user = await user_service.create(user_in)
     if settings.emails_enabled and user_in.email:
         email_data = generate_new_account_email(
             email_to=user_in.email, username=user_in.email, password=user_in.password
         )
-        send_email(
+        await AsyncEmailOutboxService(session).enqueue(
             email_to=user_in.email,
             subject=email_data.subject,
             html_content=email_data.html_content,
@@ -89,28 +150,31 @@ def update_user_me(
     user_data = user_in.model_dump(exclude_unset=True)
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
+    user_cache.invalidate_on_commit(session, current_user.id)
     session.commit()
-    session.refresh(current_user)
     return current_user
 
 
 @router.patch("/me/password", response_model=Message)
-def update_password_me(
-    *, session: SessionDep, body: UpdatePassword, current_user: CurrentUser
+async def update_password_me(
+    *, session: AsyncSessionDep, body: UpdatePassword, current_user: AsyncCurrentUser
 ) -> Any:
     """
     Update own password.
     """
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password_async(
+        body.current_password, current_user.hashed_password
+    ):
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = await get_password_hash_async(body.new_password)
     current_user.hashed_password = hashed_password
     session.add(current_user)
-    session.commit()
+    user_cache.invalidate_on_commit(session, current_user.id)
+    await session.commit()
     return Message(message="Password updated successfully")
 
 
@@ -132,73 +196,88 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
     session.delete(current_user)
+    user_cache.invalidate_on_commit(session, current_user.id)
     session.commit()
     return Message(message="User deleted successfully")
 
 
 @router.post("/signup", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserRegister) -> Any:
+async def register_user(session: AsyncSessionDep, user_in: UserRegister) -> Any:
     """
     Create new user without the need to be logged in.
     """
-    user_service = UserService(session)
-    user = user_service.get_by_email(user_in.email)
+    user_service = AsyncUserService(session)
+    user = await user_service.get_by_email(user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
-    user = user_service.register(user_in)
+    user = await user_service.register(user_in)
     return user
 
 
+@router.get(
+    "/deletions/{job_id}",
+    dependencies=[Depends(get_current_active_superuser_async)],
+    response_model=UserDeletionJob,
+)
+async def read_user_deletion(job_id: uuid.UUID) -> Any:
+    """
+    Get the progress of a chunked user deletion.
+    """
+    job = user_deletion_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Deletion job not found")
+    return job
+
+
 @router.get("/{user_id}", response_model=UserPublic)
 def read_user_by_id(
-    user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+    user_id: uuid.UUID, session: ReadSessionDep, current_user: CurrentUser
 ) -> Any:
     """
     Get a specific user by id.
     """
-    user = session.get(User, user_id)
-    if user == current_user:
-        return user
+    if user_id == current_user.id:
+        return current_user
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403,
             detail="The user doesn't have enough privileges",
         )
-    return user
+    return session.get(User, user_id)
 
 
 @router.patch(
     "/{user_id}",
-    dependencies=[Depends(get_current_active_superuser)],
+    dependencies=[Depends(get_current_active_superuser_async)],
     response_model=UserPublic,
 )
-def update_user(
+async def update_user(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     user_id: uuid.UUID,
     user_in: UserUpdate,
 ) -> Any:
     """
     Update a user.
     """
-    user_service = UserService(session)
-    db_user = user_service.get(user_id)
+    user_service = AsyncUserService(session)
+    db_user = await user_service.get(user_id)
     if not db_user:
         raise HTTPException(
             status_code=404,
             detail="The user with this id does not exist in the system",
         )
     if user_in.email:
-        existing_user = user_service.get_by_email(user_in.email)
+        existing_user = await user_service.get_by_email(user_in.email)
         if existing_user and existing_user.id != user_id:
             raise HTTPException(
                 status_code=409, detail="User with this email already exists"
             )
 
-    db_user = user_service.update(user_id, user_in)
+    db_user = await user_service.update(user_id, user_in)
     return db_user
 
 
@@ -217,7 +296,38 @@ def delete_user(
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    statement = delete(Item).where(col(Item.owner_id) == user_id)
-    session.exec(statement)  # type: ignore
     user_service.delete(user_id)
     return Message(message="User deleted successfully")
+
+
+@router.post(
+    "/{user_id}/deletion",
+    dependencies=[Depends(get_current_active_superuser_async)],
+    response_model=UserDeletionJob,
+    status_code=202,
+)
+async def start_user_deletion(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    background_tasks: BackgroundTasks,
+    user_id: uuid.UUID,
+) -> Any:
+    """
+    Delete a user with many items in the background.
+
+    The user is deactivated at once; their items are then deleted in chunks of
+    `USER_DELETION_CHUNK_SIZE`, one transaction each, and the user last. Poll
+    `GET /users/deletions/{job_id}` for progress.
+    """
+    if not await AsyncUserService(session).get(user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=403, detail="Super users are not allowed to delete themselves"
+        )
+    try:
+        job = await UserDeletionService(session).start(user_id)
+    except ValueError:
+        raise HTTPException(status_code=409, detail="User deletion already running")
+    background_tasks.add_task(run_user_deletion, job)
+    return job
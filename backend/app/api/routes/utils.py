@@ -1,9 +1,33 @@
-from fastapi import APIRouter, Depends
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from pydantic.networks import EmailStr
 
-from app.api.deps import get_current_active_superuser
-from app.schemas import Message
-from app.utils import generate_test_email, send_email
+from app.api.deps import (
+    AsyncSessionDep,
+    SessionDep,
+    get_current_active_superuser,
+    get_current_active_superuser_async,
+)
+from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.core.email_metrics import email_metrics
+from app.core.pool import async_pool_metrics, pool_metrics
+from app.core.replicas import replica_router
+from app.core.security import password_hasher
+from app.core.slow_queries import slow_query_log
+from app.core.smtp import smtp_pool
+from app.core.token_cache import token_cache
+from app.core.user_cache import user_cache
+from app.schemas import EmailBroadcast, EmailBroadcastCreate, Message
+from app.services.email_broadcast import (
+    EmailBroadcastService,
+    email_broadcasts,
+    run_email_broadcast,
+)
+from app.services.email_outbox import EmailOutboxService
+from app.utils import generate_broadcast_email, generate_test_email
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
@@ -13,12 +37,14 @@ router = APIRouter(prefix="/utils", tags=["utils"])
     dependencies=[Depends(get_current_active_superuser)],
     status_code=201,
 )
-def test_email(email_to: EmailStr) -> Message:
+def test_email(email_to: EmailStr, session: SessionDep) -> Message:
     """
     Test emails.
     """
+    if not settings.emails_enabled:
+        raise HTTPException(status_code=503, detail="Email delivery is not configured")
     email_data = generate_test_email(email_to=email_to)
-    send_email(
+    EmailOutboxService(session).enqueue(
         email_to=email_to,
         subject=email_data.subject,
         html_content=email_data.html_content,
@@ -26,6 +52,69 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
+@router.post(
+    "/email-broadcasts/",
+    dependencies=[Depends(get_current_active_superuser_async)],
+    response_model=EmailBroadcast,
+    status_code=202,
+)
+async def start_email_broadcast(
+    session: AsyncSessionDep,
+    background_tasks: BackgroundTasks,
+    broadcast_in: EmailBroadcastCreate,
+) -> Any:
+    """
+    Email all active users in the background.
+
+    Recipients are sent in batches of `EMAIL_BROADCAST_BATCH_SIZE` at most
+    `EMAIL_BROADCAST_RATE_PER_SECOND` emails per second. Poll
+    `GET /utils/email-broadcasts/{broadcast_id}` for progress.
+    """
+    if not settings.emails_enabled:
+        raise HTTPException(status_code=503, detail="Email delivery is not configured")
+    email_data = generate_broadcast_email(broadcast_in.subject, broadcast_in.message)
+    try:
+        job = await EmailBroadcastService(session).start(broadcast_in)
+    except ValueError:
+        raise HTTPException(status_code=409, detail="Email broadcast already running")
+    background_tasks.add_task(run_email_broadcast, job, email_data)
+    return job
+
+
+@router.get(
+    "/email-broadcasts/{broadcast_id}",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=EmailBroadcast,
+)
+def read_email_broadcast(broadcast_id: uuid.UUID) -> Any:
+    """
+    Get the progress of an email broadcast.
+    """
+    job = email_broadcasts.get(broadcast_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Email broadcast not found")
+    return job
+
+
+@router.get("/metrics/", dependencies=[Depends(get_current_active_superuser)])
+def read_metrics(session: SessionDep) -> dict[str, Any]:
+    """
+    Process-local runtime metrics.
+    """
+    return {
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "db_pool": pool_metrics.stats(engine),
+        "async_db_pool": async_pool_metrics.stats(async_engine.sync_engine),
+        "db_replicas": replica_router.stats(),
+        "slow_queries": slow_query_log.stats(),
+        "email_outbox": EmailOutboxService(session).stats(),
+        "smtp_pool": smtp_pool.stats(),
+        "email": email_metrics.stats(),
+    }
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
@@ -0,0 +1,88 @@
+"""
+認證依賴鏈的微基準測試
+
+比較 `get_current_user` 在 JWT 快取停用與啟用時的每次呼叫成本：
+
+    python -m app.benchmarks.auth_dependency --iterations 20000
+    python -m app.benchmarks.auth_dependency --with-db
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from datetime import timedelta
+
+from sqlmodel import Session
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.db import engine
+from app.core.security import create_access_token, decode_access_token
+from app.core.token_cache import token_cache
+from app.core.user_cache import user_cache
+from app.services.user import UserService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def measure(func: Callable[[], object], iterations: int) -> float:
+    """回傳每次呼叫的平均微秒數"""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def bench_token(iterations: int) -> None:
+    token = create_access_token(
+        "00000000-0000-0000-0000-000000000000", timedelta(days=8)
+    )
+
+    def cold() -> None:
+        token_cache.clear()
+        decode_access_token(token)
+
+    def warm() -> None:
+        decode_access_token(token)
+
+    logger.info(f"decode_access_token uncached: {measure(cold, iterations):8.2f} µs/op")
+    logger.info(f"decode_access_token cached:   {measure(warm, iterations):8.2f} µs/op")
+
+
+def bench_dependency(iterations: int) -> None:
+    with Session(engine) as session:
+        user = UserService(session).get_by_email(settings.FIRST_SUPERUSER)
+        assert user, "run app/initial_data.py first"
+        token = create_access_token(user.id, timedelta(days=8))
+
+    def run() -> None:
+        with Session(engine) as session:
+            get_current_user(session, token)
+
+    def cold() -> None:
+        token_cache.clear()
+        user_cache.clear()
+        run()
+
+    logger.info(f"get_current_user uncached:    {measure(cold, iterations):8.2f} µs/op")
+    logger.info(f"get_current_user cached:      {measure(run, iterations):8.2f} µs/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument(
+        "--with-db", action="store_true", help="also run the full chain against the DB"
+    )
+    args = parser.parse_args()
+
+    bench_token(args.iterations)
+    if args.with_db:
+        bench_dependency(max(args.iterations // 10, 1))
+
+
+if __name__ == "__main__":
+    main()
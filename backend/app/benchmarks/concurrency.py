@@ -0,0 +1,95 @@
+"""
+同步 (執行緒池) 與非同步 (asyncio) 資料庫堆疊在高並行下的吞吐量比較
+
+同步路徑模擬 FastAPI 以 anyio 執行緒池 (預設 40 個執行緒) 執行 `def` 路由，
+非同步路徑模擬 `async def` 路由，每個請求都開啟一個 session 並讀取一頁物品。
+兩者最終都受連線池大小限制，可用 DB_POOL_SIZE / DB_MAX_OVERFLOW 調整。
+
+    python -m app.benchmarks.concurrency --concurrency 200 --requests 5000 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine, engine
+from app.services.item import AsyncItemService, ItemService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_sync(requests: int, threads: int, limit: int, latency: float) -> float:
+    def handle() -> None:
+        with Session(engine) as session:
+            if latency:
+                session.execute(text("SELECT pg_sleep(:s)"), {"s": latency})
+            ItemService(session).get_page(limit=limit)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(handle) for _ in range(requests)]:
+            future.result()
+    return time.perf_counter() - start
+
+
+async def run_async(
+    requests: int, concurrency: int, limit: int, latency: float
+) -> float:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def handle() -> None:
+        async with slots:
+            async with AsyncSession(async_engine) as session:
+                if latency:
+                    await session.execute(text("SELECT pg_sleep(:s)"), {"s": latency})
+                await AsyncItemService(session).get_page(limit=limit)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handle() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await async_engine.dispose()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument(
+        "--threads", type=int, default=40, help="sync worker threads (anyio default)"
+    )
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0, help="extra server-side pg_sleep"
+    )
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    # 預熱兩個連線池
+    run_sync(args.threads, args.threads, args.limit, 0)
+    asyncio.run(run_async(args.threads, args.threads, args.limit, 0))
+
+    threads = min(args.threads, args.concurrency)
+    elapsed = run_sync(args.requests, threads, args.limit, latency)
+    logger.info(
+        f"sync   ({threads} threads): {args.requests / elapsed:8.1f} req/s "
+        f"({elapsed:.2f}s)"
+    )
+    elapsed = asyncio.run(
+        run_async(args.requests, args.concurrency, args.limit, latency)
+    )
+    logger.info(
+        f"async  ({args.concurrency} tasks):  {args.requests / elapsed:8.1f} req/s "
+        f"({elapsed:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
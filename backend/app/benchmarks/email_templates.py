@@ -0,0 +1,97 @@
+"""
+郵件範本渲染的微基準測試
+
+比較每次讀檔並編譯 jinja2.Template（原本的 render_email_template）、使用快取的
+Environment，以及新行程以磁碟 bytecode 快取載入範本的成本：
+
+    python -m app.benchmarks.email_templates --iterations 2000
+    python -m app.benchmarks.email_templates --template new_account.html
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from collections.abc import Callable
+
+from jinja2 import Template
+
+from app.core import email_templates
+from app.utils import render_email_template
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CONTEXT = {
+    "project_name": "Benchmark",
+    "username": "user@example.com",
+    "email": "user@example.com",
+    "password": "password",
+    "valid_hours": 48,
+    "link": "http://localhost/reset-password?token=token",
+}
+
+
+def measure(func: Callable[[], object], iterations: int) -> float:
+    """回傳每次呼叫的平均微秒數"""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1_000)
+    parser.add_argument("--template", default="reset_password.html")
+    args = parser.parse_args()
+    name = args.template
+
+    def uncached() -> None:
+        source = (email_templates.TEMPLATES_DIR / name).read_text()
+        Template(source).render(CONTEXT)
+
+    def cached() -> None:
+        render_email_template(template_name=name, context=CONTEXT)
+
+    def auto_reload() -> None:
+        environment.get_template(name).render(CONTEXT)
+
+    environment = email_templates.create_environment(auto_reload=True)
+    logger.info(f"{name}, {args.iterations} iterations")
+    logger.info(
+        f"read + compile per render:  {measure(uncached, args.iterations):10.2f} µs/op"
+    )
+    logger.info(
+        f"cached environment:         {measure(cached, args.iterations):10.2f} µs/op"
+    )
+    logger.info(
+        f"cached, auto_reload on:     {measure(auto_reload, args.iterations):10.2f} µs/op"
+    )
+
+    # 冷啟動：每次建立新的 Environment，比較完整編譯與從 bytecode 快取載入
+    iterations = max(args.iterations // 10, 1)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        email_templates.precompile(
+            email_templates.create_environment(bytecode_cache_dir=cache_dir)
+        )
+
+        def cold_compile() -> None:
+            email_templates.create_environment().get_template(name)
+
+        def cold_bytecode() -> None:
+            email_templates.create_environment(
+                bytecode_cache_dir=cache_dir
+            ).get_template(name)
+
+        logger.info(
+            f"cold start, compile:        {measure(cold_compile, iterations):10.2f} µs/op"
+        )
+        logger.info(
+            f"cold start, bytecode cache: {measure(cold_bytecode, iterations):10.2f} µs/op"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+物品寫入吞吐量比較：逐筆呼叫 POST/PUT/DELETE /items vs POST /items/batch
+
+以 TestClient 在行程內呼叫完整的路由（含認證、驗證與序列化），
+逐筆路由每個物品各自一個交易，批次路由每批一個交易。
+
+    python -m app.benchmarks.item_batch --items 2000 --batch-size 200
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ITEMS = f"{settings.API_V1_STR}/items"
+
+
+def timed(label: str, count: int, func: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    logger.info(f"{label:<20} {count / elapsed:9.1f} items/s ({elapsed:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    n, size = args.items, args.batch_size
+
+    with TestClient(app) as client:
+        response = client.post(
+            f"{settings.API_V1_STR}/login/access-token",
+            data={
+                "username": settings.FIRST_SUPERUSER,
+                "password": settings.FIRST_SUPERUSER_PASSWORD,
+            },
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        ids: list[str] = []
+
+        def batch(operations: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            results = []
+            for start in range(0, len(operations), size):
+                response = client.post(
+                    f"{ITEMS}/batch",
+                    headers=headers,
+                    json={"operations": operations[start : start + size]},
+                )
+                results += response.json()["results"]
+            return results
+
+        def single_create() -> None:
+            ids[:] = [
+                client.post(
+                    f"{ITEMS}/", headers=headers, json={"title": "bench"}
+                ).json()["id"]
+                for _ in range(n)
+            ]
+
+        def single_update() -> None:
+            for id in ids:
+                client.put(f"{ITEMS}/{id}", headers=headers, json={"title": "single"})
+
+        def single_delete() -> None:
+            for id in ids:
+                client.delete(f"{ITEMS}/{id}", headers=headers)
+
+        def batch_create() -> None:
+            operations = [{"op": "create", "item": {"title": "bench"}}] * n
+            ids[:] = [result["item"]["id"] for result in batch(operations)]
+
+        def batch_update() -> None:
+            batch(
+                [{"op": "update", "id": id, "item": {"title": "batch"}} for id in ids]
+            )
+
+        def batch_delete() -> None:
+            batch([{"op": "delete", "id": id} for id in ids])
+
+        timed("create (single)", n, single_create)
+        timed("update (single)", n, single_update)
+        timed("delete (single)", n, single_delete)
+        timed(f"create (batch {size})", n, batch_create)
+        timed(f"update (batch {size})", n, batch_update)
+        timed(f"delete (batch {size})", n, batch_delete)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+匯出大量物品的記憶體用量：串流的 GET /items/export vs 一次載入所有資料列
+
+串流模式直接以 ASGI 介面呼叫路由並丟棄回應內容（TestClient 會把整個回應緩衝在
+記憶體中，無法反映真實用量）；--buffered 改為一次讀出所有資料列再編碼，作為對照。
+峰值 RSS 在行程內只增不減，因此兩種模式需分開執行。--seed 先以 generate_series
+在資料庫端建立指定筆數的物品。
+
+    python -m app.benchmarks.item_export --seed 5000000
+    python -m app.benchmarks.item_export --format csv
+    python -m app.benchmarks.item_export --buffered
+"""
+
+import argparse
+import asyncio
+import logging
+import resource
+import time
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.types import Message, Scope
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.core.export import ExportFormat, encode_export
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Item
+from app.services.item import EXPORT_COLUMNS
+from app.services.user import AsyncUserService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEED = text(
+    "INSERT INTO item (id, title, description, owner_id) "
+    "SELECT gen_random_uuid(), 'export ' || n, md5(n::text), :owner_id "
+    "FROM generate_series(1, :count) AS n"
+)
+
+
+def peak_rss_mb() -> float:
+    # Linux 的 ru_maxrss 單位為 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def export_streaming(token: str, format: ExportFormat) -> tuple[int, int]:
+    scope: Scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 0),
+        "root_path": "",
+        "path": f"{settings.API_V1_STR}/items/export",
+        "raw_path": f"{settings.API_V1_STR}/items/export".encode(),
+        "query_string": f"format={format}".encode(),
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    }
+    received = {"bytes": 0, "lines": 0}
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive() -> Message:
+        # 與伺服器相同：先送出請求，之後直到回應結束才回報斷線
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            received["bytes"] += len(body)
+            received["lines"] += body.count(b"\n")
+            if not message.get("more_body", False):
+                finished.set()
+
+    await app(scope, receive, send)
+    return received["lines"], received["bytes"]
+
+
+async def export_buffered(format: ExportFormat) -> tuple[int, int]:
+    async with AsyncSession(async_engine) as session:
+        columns = [getattr(Item, name) for name in EXPORT_COLUMNS]
+        rows = (await session.execute(select(*columns).order_by(Item.id))).all()
+
+    async def one_partition() -> Any:
+        yield rows
+
+    body = b"".join(
+        [
+            chunk
+            async for chunk in encode_export(format, EXPORT_COLUMNS, one_partition())
+        ]
+    )
+    return body.count(b"\n"), len(body)
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with AsyncSession(async_engine) as session:
+        owner = await AsyncUserService(session).get_by_email(settings.FIRST_SUPERUSER)
+        assert owner, "run app/initial_data.py first"
+        owner_id = owner.id
+        if args.seed:
+            start = time.perf_counter()
+            # 大量資料可能超過預設的 statement_timeout
+            await session.execute(text("SET LOCAL statement_timeout = 0"))
+            await session.execute(SEED, {"owner_id": owner_id, "count": args.seed})
+            await session.commit()
+            await session.execute(text("ANALYZE item"))
+            logger.info(
+                f"seeded {args.seed} items in {time.perf_counter() - start:.1f}s"
+            )
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if args.buffered:
+        rows, size = await export_buffered(args.format)
+    else:
+        token = create_access_token(owner_id, timedelta(minutes=30))
+        rows, size = await export_streaming(token, args.format)
+    elapsed = time.perf_counter() - start
+    mode = "buffered" if args.buffered else "streaming"
+    logger.info(
+        f"{mode} {args.format}: {rows} lines, {size / 1e6:.1f} MB in {elapsed:.1f}s "
+        f"({rows / elapsed:,.0f} rows/s)"
+    )
+    logger.info(f"peak RSS {peak_rss_mb():.1f} MB (before export {baseline:.1f} MB)")
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0, help="items to insert first")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument(
+        "--buffered", action="store_true", help="load every row before encoding"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
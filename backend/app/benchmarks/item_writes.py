@@ -0,0 +1,94 @@
+"""
+物品更新與刪除的延遲比較：先讀取再檢查擁有權 vs 單一 UPDATE/DELETE ... RETURNING
+
+    python -m app.benchmarks.item_writes --repeat 500
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.models import Item
+from app.repositories.item import AsyncItemRepository
+from app.services.user import AsyncUserService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def timed(
+    label: str, repeat: int, func: Callable[[int], Awaitable[object]]
+) -> None:
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        await func(i)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    logger.info(
+        f"{label:<16} median {samples[len(samples) // 2] * 1000:7.2f} ms, "
+        f"p95 {samples[int(len(samples) * 0.95)] * 1000:7.2f} ms"
+    )
+
+
+async def run(repeat: int) -> None:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        owner = await AsyncUserService(session).get_by_email(settings.FIRST_SUPERUSER)
+        assert owner, "run app/initial_data.py first"
+        owner_id = owner.id
+        repository = AsyncItemRepository(session)
+        items = [
+            await repository.create_with_owner({"title": "bench"}, owner_id)
+            for _ in range(repeat * 2)
+        ]
+        ids = [item.id for item in items]
+        session.expunge_all()
+
+        async def fetch_then_update(i: int) -> None:
+            # 舊流程：讀取、在 Python 中檢查擁有權、更新、commit、refresh
+            item = await session.get(Item, ids[i])
+            assert item and item.owner_id == owner_id
+            item.title = f"before {i}"
+            session.add(item)
+            await session.commit()
+            await session.refresh(item)
+
+        async def update_returning(i: int) -> None:
+            item, _ = await repository.update_owned(
+                ids[i], {"title": f"after {i}"}, owner_id
+            )
+            assert item
+
+        async def fetch_then_delete(i: int) -> None:
+            item = await session.get(Item, ids[i])
+            assert item and item.owner_id == owner_id
+            await session.delete(item)
+            await session.commit()
+
+        async def delete_returning(i: int) -> None:
+            item, _ = await repository.delete_owned(ids[repeat + i], owner_id)
+            assert item
+
+        await timed("update (before)", repeat, fetch_then_update)
+        session.expunge_all()
+        await timed("update (after)", repeat, update_returning)
+        await timed("delete (before)", repeat, fetch_then_delete)
+        await timed("delete (after)", repeat, delete_returning)
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
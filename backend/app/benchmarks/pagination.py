@@ -0,0 +1,95 @@
+"""
+OFFSET 與 keyset (游標) 分頁在深層頁面的查詢延遲比較
+
+    python -m app.benchmarks.pagination --seed 1000000 --page 10000 --limit 100
+"""
+
+import argparse
+import logging
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import text
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.pagination import encode_cursor
+from app.models import Item
+from app.services.item import ItemService
+from app.services.user import UserService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def seed_items(session: Session, owner_id: uuid.UUID, rows: int) -> None:
+    """以單一 INSERT ... SELECT 產生測試資料"""
+    # 大量資料可能超過預設的 statement_timeout
+    session.execute(text("SET LOCAL statement_timeout = 0"))
+    session.execute(
+        text(
+            "INSERT INTO item (id, title, description, owner_id) "
+            "SELECT gen_random_uuid(), 'bench ' || n, NULL, :owner_id "
+            "FROM generate_series(1, :rows) AS n"
+        ),
+        {"owner_id": owner_id, "rows": rows},
+    )
+    session.commit()
+    session.execute(text("ANALYZE item"))
+
+
+def timed(label: str, repeat: int, func: Callable[[], object]) -> None:
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    logger.info(
+        f"{label:<8} median {samples[len(samples) // 2] * 1000:8.2f} ms, "
+        f"min {samples[0] * 1000:8.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0, help="rows to insert first")
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        owner = UserService(session).get_by_email(settings.FIRST_SUPERUSER)
+        assert owner, "run app/initial_data.py first"
+        if args.seed:
+            seed_items(session, owner.id, args.seed)
+
+        skip = args.page * args.limit
+        # 僅用於準備游標，不計入量測
+        last_id = session.exec(
+            select(Item.id).order_by(col(Item.id)).offset(skip - 1).limit(1)
+        ).first()
+        assert last_id, f"need at least {skip + args.limit} items, use --seed"
+        cursor = encode_cursor([last_id])
+        item_service = ItemService(session)
+
+        def offset_page() -> None:
+            statement = (
+                select(Item).order_by(col(Item.id)).offset(skip).limit(args.limit)
+            )
+            session.exec(statement).all()
+
+        def cursor_page() -> None:
+            item_service.get_page_after(cursor=cursor, limit=args.limit)
+
+        logger.info(f"page {args.page} with limit {args.limit} (skip={skip})")
+        timed("offset", args.repeat, offset_page)
+        timed("cursor", args.repeat, cursor_page)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+SMTP 寄送方式的基準測試，以本機的 aiosmtpd 作為郵件伺服器
+
+比較每封郵件各自建立連線（原本的 emails.Message.send）、經由連線池逐封寄送，
+以及 send_emails 以單一連線大量寄送的吞吐量：
+
+    python -m app.benchmarks.smtp_delivery --messages 500
+    python -m app.benchmarks.smtp_delivery --latency-ms 20
+
+--latency-ms 讓伺服器在每個 SMTP 指令回應前等待，模擬與遠端伺服器之間的往返時間；
+本機伺服器沒有 TLS，實際環境中每條新連線還要加上 STARTTLS 與 AUTH 的往返。
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import time
+from collections.abc import Callable
+from typing import Any, AnyStr
+from unittest.mock import patch
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP as SMTPProtocol
+from emails.message import Message
+
+from app.core.smtp import SMTPPool
+from app.utils import EmailData, send_email, send_emails
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+logging.getLogger("mail.log").setLevel(logging.WARNING)
+logging.getLogger("app.utils").setLevel(logging.WARNING)
+
+
+class CountingHandler:
+    def __init__(self) -> None:
+        self.received = 0
+
+    async def handle_DATA(self, _server: Any, _session: Any, _envelope: Any) -> str:
+        self.received += 1
+        return "250 OK"
+
+
+class SlowSMTP(SMTPProtocol):
+    latency = 0.0
+
+    async def push(self, status: AnyStr) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        await super().push(status)
+
+
+class SlowController(Controller):
+    def factory(self) -> SMTPProtocol:
+        return SlowSMTP(self.handler, **self.SMTP_kwargs)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def measure(name: str, messages: int, func: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    logger.info(
+        f"{name:<28} {seconds:8.3f}s {messages / seconds:10.1f} msg/s "
+        f"{seconds / messages * 1000:8.2f} ms/msg"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    SlowSMTP.latency = args.latency_ms / 1000
+    port = free_port()
+    handler = CountingHandler()
+    controller = SlowController(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    data = EmailData(html_content="<p>benchmark</p>", subject="benchmark")
+    recipients = [f"user{i}@example.com" for i in range(args.messages)]
+    smtp_options = {"host": "127.0.0.1", "port": port}
+
+    def connection_per_message() -> None:
+        for email_to in recipients:
+            message = Message(
+                subject=data.subject,
+                html=data.html_content,
+                mail_from=("Benchmark", "from@example.com"),
+            )
+            response = message.send(to=email_to, smtp=smtp_options)
+            assert response.success, response.error
+
+    def pooled() -> None:
+        for email_to in recipients:
+            send_email(
+                email_to=email_to,
+                subject=data.subject,
+                html_content=data.html_content,
+            )
+
+    def bulk() -> None:
+        errors = send_emails([(email_to, data) for email_to in recipients])
+        assert not any(errors), errors
+
+    try:
+        with (
+            patch("app.core.config.settings.SMTP_HOST", "127.0.0.1"),
+            patch("app.core.config.settings.SMTP_PORT", port),
+            patch("app.core.config.settings.SMTP_TLS", False),
+            patch("app.core.config.settings.SMTP_SSL", False),
+            patch("app.core.config.settings.SMTP_USER", None),
+            patch("app.core.config.settings.SMTP_PASSWORD", None),
+            patch("app.core.config.settings.EMAILS_FROM_EMAIL", "from@example.com"),
+        ):
+            logger.info(
+                f"{args.messages} messages, {args.latency_ms:.0f} ms per SMTP reply"
+            )
+            measure("connection per message", args.messages, connection_per_message)
+            for name, func in (
+                ("pooled send_email", pooled),
+                ("bulk send_emails", bulk),
+            ):
+                pool = SMTPPool(max_idle=1)
+                with patch("app.utils.smtp_pool", pool):
+                    measure(name, args.messages, func)
+                pool.close()
+        assert handler.received == args.messages * 3
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
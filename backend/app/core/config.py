@@ -69,6 +69,78 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # SQLAlchemy 連線池設定，每個 worker 行程各自擁有一個連線池；
+    # 總連線數上限為 workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)，需低於 max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    # 連線存活超過此秒數即在下次取出時重建，-1 表示不限制
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    # lifo 讓閒置連線自然老化，可搭配伺服器端的閒置逾時縮小連線池
+    DB_POOL_ORDER: Literal["fifo", "lifo"] = "fifo"
+    # 每個語句的預設執行上限（毫秒），於建立連線時設定，0 表示不限制
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
+
+    # X-Request-Timeout 標頭（毫秒）可要求的最長期限
+    REQUEST_MAX_TIMEOUT_MS: int = 60_000
+    # GET /items/ 的路由期限（毫秒）
+    ITEM_LIST_TIMEOUT_MS: int = 10_000
+
+    # 唯讀副本的連線字串（逗號分隔），未設定時所有讀取都走主庫
+    DB_REPLICA_URIS: Annotated[
+        list[PostgresDsn] | str, BeforeValidator(parse_cors)
+    ] = []
+    # 用戶寫入後，其讀取固定走主庫的秒數（read-your-writes），應大於副本延遲
+    DB_REPLICA_STICKY_SECONDS: float = 5
+    # 副本連線失敗後暫停使用的秒數
+    DB_REPLICA_RETRY_SECONDS: float = 30
+
+    # bcrypt 專用執行器：worker 數量、排隊上限與執行器類型
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+
+    # 已驗證 JWT 內容的快取容量，0 表示停用
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+
+    # 用戶快取：USER_CACHE_MAX_SIZE 或 USER_CACHE_TTL_SECONDS 設為 0 即停用
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 60
+    # 跨 worker 失效通知使用的 PostgreSQL LISTEN/NOTIFY 頻道
+    USER_CACHE_INVALIDATION_CHANNEL: str | None = None
+
+    # 允許估計總數時，pg_class.reltuples 需達到此筆數才會取代精確的 COUNT(*)
+    APPROXIMATE_COUNT_MIN_ROWS: int = 100_000
+
+    # /items/batch 單一請求可包含的操作數量上限
+    ITEM_BATCH_MAX_SIZE: int = 1000
+    # /items/export 每次從伺服器端游標取回的筆數
+    ITEM_EXPORT_BATCH_SIZE: int = 1000
+    # 大量匯入時每批驗證的筆數，以及匯入結果中最多列出的錯誤筆數
+    ITEM_IMPORT_CHUNK_SIZE: int = 10_000
+    ITEM_IMPORT_MAX_REPORTED_ERRORS: int = 100
+
+    # 同一請求中相同語句（僅參數不同）執行達此次數即視為 N+1 查詢並記錄警告
+    QUERY_STATS_REPEATED_THRESHOLD: int = 5
+
+    # 慢查詢記錄：執行超過此毫秒數的語句會記錄警告，0 表示停用
+    SLOW_QUERY_THRESHOLD_MS: float = 500
+    # 慢查詢中以 EXPLAIN (ANALYZE, BUFFERS) 擷取執行計畫的比例（0 到 1），
+    # 會再執行一次該語句，只對 SELECT 生效；需同時設定 SLOW_QUERY_EXPLAIN_FILE
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    SLOW_QUERY_EXPLAIN_FILE: str | None = None
+    SLOW_QUERY_EXPLAIN_ROTATION: str = "50 MB"
+    SLOW_QUERY_EXPLAIN_RETENTION: str = "7 days"
+
+    # 分批刪除用戶時，每個交易刪除的物品筆數
+    USER_DELETION_CHUNK_SIZE: int = 10_000
+    # 行程內最多保留的刪除工作進度筆數
+    USER_DELETION_MAX_JOBS: int = 100
+
+    # 分析報表每次從伺服器端游標讀入 polars 的筆數
+    ANALYTICS_BATCH_SIZE: int = 50_000
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -77,6 +149,13 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str | None = None
     EMAILS_FROM_EMAIL: EmailStr | None = None
     EMAILS_FROM_NAME: EmailStr | None = None
+    SMTP_TIMEOUT_SECONDS: float = 10
+    # SMTP 連線池：每組 SMTP_* 設定最多保留的閒置連線數；閒置超過
+    # SMTP_POOL_NOOP_AFTER_SECONDS 的連線重用前先送 NOOP 確認，
+    # 超過 SMTP_POOL_MAX_IDLE_SECONDS 則直接關閉（多數伺服器約 5 分鐘斷開閒置連線）
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_NOOP_AFTER_SECONDS: float = 30
+    SMTP_POOL_MAX_IDLE_SECONDS: float = 240
 
     @model_validator(mode="after")
     def _set_default_emails_from(self) -> Self:
@@ -85,6 +164,29 @@ class Settings(BaseSettings):
         return self
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # 開發時修改郵件範本後不必重新啟動；正式環境關閉以省去每次渲染的檔案檢查
+    EMAIL_TEMPLATES_AUTO_RELOAD: bool = False
+    # 郵件範本編譯結果的磁碟快取目錄，None 表示停用
+    EMAIL_TEMPLATES_BYTECODE_CACHE_DIR: str | None = None
+
+    # 郵件寄件匣：請求只寫入 email_outbox，由背景 worker 寄出；
+    # 關閉 EMAIL_OUTBOX_WORKER 時改由 `python -m app.email_worker` 另外執行
+    EMAIL_OUTBOX_WORKER: bool = True
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 2.0
+    # 寄送失敗時以指數退避重試，達到次數上限後移入 dead 狀態
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 30
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: float = 3600
+    # 領取後超過此秒數仍未完成，視為 worker 已中止，其他 worker 可重新領取
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 300
+
+    # 群發郵件：每批以 keyset 分頁讀取並以同一條 SMTP 連線寄出的收件者數量，
+    # 以及每秒最多寄出的郵件數（配合 SMTP 服務商的速率限制，0 表示不限制）
+    EMAIL_BROADCAST_BATCH_SIZE: int = 100
+    EMAIL_BROADCAST_RATE_PER_SECOND: float = 10
+    # 行程內最多保留的群發進度筆數
+    EMAIL_BROADCAST_MAX_JOBS: int = 20
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -1,10 +1,50 @@
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine
 
 from app.services.user import UserService
 from app.core.config import settings
+from app.core.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    async_pool_metrics,
+    pool_metrics,
+)
+from app.core.deadlines import connect_args
+from app.core.query_stats import query_recorder
+from app.core.slow_queries import slow_query_log
 from app.schemas import UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_use_lifo=settings.DB_POOL_ORDER == "lifo",
+    connect_args=connect_args(),
+)
+pool_metrics.attach(engine)
+query_recorder.attach(engine)
+slow_query_log.attach(engine)
+
+# 非同步路由使用的引擎：psycopg 3 同時支援同步與 asyncio，沿用相同的 URI 與連線池設定。
+# 兩個引擎各自擁有連線池，資料庫端的連線上限需要兩者合計。
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_use_lifo=settings.DB_POOL_ORDER == "lifo",
+    connect_args=connect_args(),
+)
+async_pool_metrics.attach(async_engine.sync_engine)
+query_recorder.attach(async_engine.sync_engine)
+slow_query_log.attach(async_engine.sync_engine)
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
 # otherwise, SQLModel might fail to initialize relationships properly
@@ -0,0 +1,164 @@
+import functools
+import inspect
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, ParamSpec, TypeVar, cast
+
+from sqlalchemy import Connection, event
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import settings
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class DeadlineExceeded(Exception):
+    """請求的期限已過，不再送出新的交易"""
+
+
+class Deadline:
+    """
+    單一請求的期限，以 time.monotonic() 的絕對時間表示
+
+    請求標頭與路由設定都只能縮短期限，不能延長。
+    """
+
+    def __init__(self, timeout_ms: float | None = None) -> None:
+        self.expires_at: float | None = None
+        if timeout_ms is not None:
+            self.tighten(timeout_ms)
+
+    def tighten(self, timeout_ms: float) -> None:
+        """
+        將期限縮短為從現在起 timeout_ms 毫秒，已較短時不變
+
+        Args:
+            timeout_ms: 毫秒數
+        """
+        expires_at = time.monotonic() + timeout_ms / 1000
+        if self.expires_at is None or expires_at < self.expires_at:
+            self.expires_at = expires_at
+
+    def remaining_ms(self) -> float | None:
+        """剩餘毫秒數，未設定期限時為 None"""
+        if self.expires_at is None:
+            return None
+        return (self.expires_at - time.monotonic()) * 1000
+
+
+_current: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+def remaining_ms() -> float | None:
+    """目前請求的剩餘毫秒數，沒有期限時為 None"""
+    current = _current.get()
+    return current.remaining_ms() if current else None
+
+
+@contextmanager
+def request_deadline(timeout_ms: float | None = None) -> Iterator[Deadline]:
+    """
+    為區塊內的資料庫交易設定期限
+
+    區塊內每個 Session 交易開始時，會以 `SET LOCAL statement_timeout` 把剩餘時間
+    交給 PostgreSQL，逾時的語句由伺服器取消；期限已過時直接拋出 DeadlineExceeded。
+
+    Args:
+        timeout_ms: 期限毫秒數，None 表示先不設定，可再由路由以 deadline() 設定
+
+    Yields:
+        期限
+    """
+    deadline = Deadline(timeout_ms)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def without_deadline(func: Callable[P, R]) -> Callable[P, R]:
+    """
+    讓函式在沒有請求期限的 context 中執行，用於背景工作
+
+    BackgroundTasks 沿用請求的 context，未清除時背景工作的每個交易都會以請求的
+    剩餘時間設定 statement_timeout，請求期限一過即拋出 DeadlineExceeded。
+
+    Args:
+        func: 同步或非同步函式
+
+    Returns:
+        包裝後的函式
+    """
+    if inspect.iscoroutinefunction(func):
+        coroutine_function = cast(Callable[P, Awaitable[Any]], func)
+
+        @functools.wraps(func)
+        async def run_async(*args: P.args, **kwargs: P.kwargs) -> Any:
+            with request_deadline():
+                return await coroutine_function(*args, **kwargs)
+
+        return cast(Callable[P, R], run_async)
+
+    @functools.wraps(func)
+    def run(*args: P.args, **kwargs: P.kwargs) -> R:
+        with request_deadline():
+            return func(*args, **kwargs)
+
+    return run
+
+
+def deadline(timeout_ms: float) -> Callable[[], None]:
+    """
+    建立路由層級期限的依賴，例如
+    `@router.get("/", dependencies=[Depends(deadline(5000))])`
+
+    路由的 dependencies 在其他依賴之前解析，因此認證等查詢也受此期限限制。
+
+    Args:
+        timeout_ms: 期限毫秒數
+
+    Returns:
+        FastAPI 依賴函式
+    """
+
+    def tighten_deadline() -> None:
+        current = _current.get()
+        if current is not None:
+            current.tighten(timeout_ms)
+
+    return tighten_deadline
+
+
+@event.listens_for(Session, "after_begin")
+def _set_statement_timeout(
+    _session: Session, _transaction: SessionTransaction, connection: Connection
+) -> None:
+    remaining = remaining_ms()
+    if remaining is None:
+        return
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    # statement_timeout 的單位為毫秒，0 表示不限制，因此至少為 1
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {max(int(remaining), 1)}"
+    )
+
+
+def connect_args() -> dict[str, Any]:
+    """
+    建立引擎時的連線參數，以 DB_STATEMENT_TIMEOUT_MS 作為所有連線的預設上限
+
+    預設值在連線建立時設定一次，不需要在每個交易額外送出 SET。
+
+    Returns:
+        傳給 create_engine 的 connect_args
+    """
+    if settings.DB_STATEMENT_TIMEOUT_MS <= 0:
+        return {}
+    return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
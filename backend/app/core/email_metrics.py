@@ -0,0 +1,111 @@
+import threading
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any
+
+# 直方圖各區間的上界（毫秒），最後一個區間為 +Inf
+RENDER_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100)
+SEND_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUEUE_BUCKETS_MS = (100, 500, 1000, 5000, 30_000, 60_000, 300_000, 3_600_000)
+
+
+class Histogram:
+    """
+    固定區間的延遲直方圖，以累計次數表示（與 Prometheus histogram 相同）
+    """
+
+    def __init__(self, buckets_ms: Sequence[float]) -> None:
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip(
+            (*(f"le_{bound:g}" for bound in self.buckets_ms), "le_inf"),
+            self.counts,
+            strict=True,
+        ):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
+
+
+class EmailMetrics:
+    """
+    郵件寄送的行程內統計：範本渲染與 SMTP 寄送的延遲、寄件匣的排隊時間，
+    以及寄送成功、失敗、重試與放棄的次數
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空統計數據"""
+        with self._lock:
+            self.render: dict[str, Histogram] = {}
+            self.send = Histogram(SEND_BUCKETS_MS)
+            self.queue = Histogram(QUEUE_BUCKETS_MS)
+            self.counters: Counter[str] = Counter()
+
+    def record_render(self, template_name: str, seconds: float) -> None:
+        """記錄一次範本渲染的耗時"""
+        with self._lock:
+            histogram = self.render.get(template_name)
+            if histogram is None:
+                histogram = self.render[template_name] = Histogram(RENDER_BUCKETS_MS)
+            histogram.observe(seconds)
+
+    def record_send(self, seconds: float, success: bool) -> None:
+        """記錄一封郵件的 SMTP 寄送耗時（含取得連線）與結果"""
+        with self._lock:
+            self.send.observe(seconds)
+            self.counters["sent" if success else "failed"] += 1
+
+    def record_queued(self, seconds: float) -> None:
+        """記錄寄件匣中的郵件從排入到寄出所經過的時間"""
+        with self._lock:
+            self.queue.observe(seconds)
+
+    def record_retry(self, dead: bool) -> None:
+        """記錄寄件匣中的郵件寄送失敗後排定重試，或重試次數用盡而放棄"""
+        with self._lock:
+            self.counters["dead" if dead else "retried"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            sent = self.counters["sent"]
+            failed = self.counters["failed"]
+            return {
+                "sent": sent,
+                "failed": failed,
+                "failure_rate": failed / (sent + failed) if sent + failed else 0.0,
+                "retried": self.counters["retried"],
+                "dead": self.counters["dead"],
+                "send_latency": self.send.snapshot(),
+                "queue_time": self.queue.snapshot(),
+                "render_latency": {
+                    name: histogram.snapshot()
+                    for name, histogram in sorted(self.render.items())
+                },
+            }
+
+
+email_metrics = EmailMetrics()
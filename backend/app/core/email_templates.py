@@ -0,0 +1,86 @@
+from pathlib import Path
+
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+)
+
+from app.core.config import settings
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "email-templates" / "build"
+
+
+def create_environment(
+    auto_reload: bool = False,
+    bytecode_cache_dir: str | None = None,
+    templates_dir: Path = TEMPLATES_DIR,
+) -> Environment:
+    """
+    建立郵件範本的 Jinja Environment
+
+    編譯後的範本保留在 Environment 的快取中，每次寄信只需執行已編譯的範本，
+    不再讀取檔案或重新編譯。
+
+    Args:
+        auto_reload: 每次取得範本時檢查檔案是否變更，供開發時修改範本使用
+        bytecode_cache_dir: 編譯結果的磁碟快取目錄，新行程可直接載入而不必重新編譯；
+            None 表示停用
+        templates_dir: 範本目錄
+
+    Returns:
+        Jinja Environment
+    """
+    bytecode_cache: BytecodeCache | None = None
+    if bytecode_cache_dir:
+        Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    return Environment(
+        loader=FileSystemLoader(templates_dir),
+        # 與原本的 jinja2.Template 相同不自動跳脫，避免改變連結等既有輸出
+        autoescape=False,
+        # -1 表示不淘汰，所有範本編譯後都保留在記憶體中
+        cache_size=-1,
+        auto_reload=auto_reload,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+email_templates = create_environment(
+    auto_reload=settings.EMAIL_TEMPLATES_AUTO_RELOAD,
+    bytecode_cache_dir=settings.EMAIL_TEMPLATES_BYTECODE_CACHE_DIR,
+)
+
+
+def get_template(name: str) -> Template:
+    """
+    取得已編譯的郵件範本
+
+    Args:
+        name: email-templates/build 中的檔名，例如 reset_password.html
+
+    Returns:
+        編譯後的範本
+    """
+    return email_templates.get_template(name)
+
+
+def precompile(environment: Environment | None = None) -> int:
+    """
+    預先編譯所有郵件範本，在啟動時執行，第一封郵件不必等待編譯
+
+    範本有語法錯誤時在啟動時就會失敗，而不是在寄信時。
+
+    Args:
+        environment: 要編譯的 Environment，預設為 email_templates
+
+    Returns:
+        編譯的範本數量
+    """
+    environment = environment or email_templates
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from typing import Any, Literal
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value: Any) -> str:
+    # UUID、datetime 等以字串輸出
+    return str(value)
+
+
+def encode_ndjson(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """
+    將一批資料列編碼為 NDJSON，每列一個 JSON 物件
+
+    Args:
+        columns: 欄位名稱
+        rows: 資料列，值的順序與 columns 相同
+
+    Returns:
+        以換行結尾的 UTF-8 位元組
+    """
+    lines = [
+        json.dumps(
+            dict(zip(columns, row, strict=True)),
+            default=_json_default,
+            ensure_ascii=False,
+        )
+        for row in rows
+    ]
+    lines.append("")
+    return "\n".join(lines).encode()
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    """
+    將一批資料列編碼為 CSV，None 輸出為空欄位
+
+    Args:
+        rows: 資料列
+
+    Returns:
+        UTF-8 位元組
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def encode_export(
+    format: ExportFormat,
+    columns: Sequence[str],
+    partitions: AsyncIterable[Sequence[Sequence[Any]]],
+) -> AsyncIterator[bytes]:
+    """
+    將分批讀取的資料列轉為串流回應的內容，每批產生一個區塊
+
+    記憶體用量只與單批大小有關，與總筆數無關。
+
+    Args:
+        format: 輸出格式
+        columns: 欄位名稱，CSV 會輸出為標題列
+        partitions: 分批的資料列
+
+    Yields:
+        編碼後的區塊
+    """
+    if format == "csv":
+        yield encode_csv([columns])
+    async for rows in partitions:
+        if format == "csv":
+            yield encode_csv(rows)
+        else:
+            yield encode_ndjson(columns, rows)
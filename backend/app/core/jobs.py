@@ -0,0 +1,54 @@
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from app.schemas.common import BackgroundJob
+
+J = TypeVar("J", bound=BackgroundJob)
+
+
+class JobRegistry(Generic[J]):
+    """
+    行程內的背景工作登錄，保留最近的工作進度供查詢
+
+    進度只存在於執行該工作的 worker 中，與 user_cache 相同不跨行程共用。
+    """
+
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[uuid.UUID, J] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, job: J, conflicts: Callable[[J], bool] | None = None) -> J:
+        """
+        登錄新的工作，超過上限時移除最舊的已結束工作
+
+        Args:
+            job: 新的工作
+            conflicts: 判斷尚未結束的工作是否與新工作衝突，None 表示任何尚未結束
+                的工作都衝突
+
+        Returns:
+            登錄的工作
+
+        Raises:
+            ValueError: 已有衝突且尚未結束的工作
+        """
+        with self._lock:
+            for existing in self._jobs.values():
+                if existing.active and (conflicts is None or conflicts(existing)):
+                    raise ValueError(f"工作 {existing.id} 尚未結束")
+            self._jobs[job.id] = job
+            finished = [
+                id for id, existing in self._jobs.items() if not existing.active
+            ]
+            for id in finished[: max(len(self._jobs) - self.max_jobs, 0)]:
+                del self._jobs[id]
+            return job
+
+    def get(self, job_id: uuid.UUID) -> J | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
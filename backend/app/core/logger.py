@@ -58,12 +58,15 @@ class Logger:
         Returns:
             handler_id: 處理器ID，可用於後續移除
         """
+        # rotation 與 retention 只適用於檔案輸出，傳給函式等其他目標會被 loguru 拒絕
+        if rotation is not None:
+            kwargs["rotation"] = rotation
+        if retention is not None:
+            kwargs["retention"] = retention
         return self._logger.add(
             sink=sink,
             level=level,
             format=format,
-            rotation=rotation,
-            retention=retention,
             filter=filter,
             **kwargs,
         )
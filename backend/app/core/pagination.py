@@ -0,0 +1,41 @@
+import base64
+import json
+from collections.abc import Sequence
+from typing import Any
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    將 keyset 分頁的排序鍵值編碼為不透明的游標字串
+
+    Args:
+        values: 最後一筆資料的排序鍵值，依排序欄位順序
+
+    Returns:
+        URL 安全的游標字串
+    """
+    raw = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[str]:
+    """
+    解碼游標字串
+
+    Args:
+        cursor: encode_cursor 產生的游標
+
+    Returns:
+        排序鍵值列表（字串形式）
+
+    Raises:
+        ValueError: 游標格式不正確
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal, TypeVar
+
+R = TypeVar("R")
+
+
+class PasswordHasherBusyError(Exception):
+    """雜湊執行器的佇列已滿"""
+
+
+def _timed(fn: Callable[..., R], *args: Any) -> tuple[R, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class PasswordHasher:
+    """
+    專用於密碼雜湊與驗證的有界執行器
+
+    bcrypt 屬於 CPU 密集運算，放在獨立的執行緒或行程池中執行，
+    避免大量登入或註冊請求佔用 FastAPI 共用的 anyio 執行緒池。
+    同時在執行中與排隊中的工作超過上限時立即拒絕，而非無限排隊。
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        kind: Literal["thread", "process"] = "thread",
+    ):
+        """
+        初始化雜湊執行器
+
+        Args:
+            workers: 執行緒或行程數量
+            queue_size: 所有 worker 都忙碌時，最多可排隊的工作數量
+            kind: 使用執行緒池 ("thread") 或行程池 ("process")
+        """
+        self.workers = workers
+        self.queue_size = queue_size
+        self.kind = kind
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self.outstanding = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_run_seconds = 0.0
+        self.max_run_seconds = 0.0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        # 延遲建立，避免在行程池的子行程匯入本模組時又建立一個池
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+            return self._executor
+
+    def _acquire(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusyError("Password hashing queue is full")
+        with self._lock:
+            self.outstanding += 1
+
+    def _release(self) -> None:
+        self._slots.release()
+        with self._lock:
+            self.outstanding -= 1
+
+    def _record(self, start: float, run_seconds: float) -> None:
+        wait_seconds = max(time.perf_counter() - start - run_seconds, 0.0)
+        with self._lock:
+            self.completed += 1
+            self.total_run_seconds += run_seconds
+            self.max_run_seconds = max(self.max_run_seconds, run_seconds)
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def run(self, fn: Callable[..., R], *args: Any) -> R:
+        """
+        在雜湊執行器中執行函式並等待結果
+
+        等待期間呼叫端的執行緒會被佔用；路由應改用 run_async，
+        否則等待雜湊的請求仍會佔滿 anyio 執行緒池。
+
+        Args:
+            fn: 要執行的函式；使用行程池時必須是可 pickle 的模組層級函式
+            *args: 傳給函式的參數
+
+        Returns:
+            函式的回傳值
+
+        Raises:
+            PasswordHasherBusyError: 執行中與排隊中的工作已達上限
+        """
+        self._acquire()
+        start = time.perf_counter()
+        try:
+            result, run_seconds = (
+                self._get_executor().submit(_timed, fn, *args).result()
+            )
+        finally:
+            self._release()
+        self._record(start, run_seconds)
+        return result
+
+    async def run_async(self, fn: Callable[..., R], *args: Any) -> R:
+        """
+        run 的非同步版本，等待結果期間不佔用事件迴圈或 anyio 執行緒
+
+        Args:
+            fn: 要執行的函式；使用行程池時必須是可 pickle 的模組層級函式
+            *args: 傳給函式的參數
+
+        Returns:
+            函式的回傳值
+
+        Raises:
+            PasswordHasherBusyError: 執行中與排隊中的工作已達上限
+        """
+        self._acquire()
+        start = time.perf_counter()
+        try:
+            result, run_seconds = await asyncio.wrap_future(
+                self._get_executor().submit(_timed, fn, *args)
+            )
+        finally:
+            self._release()
+        self._record(start, run_seconds)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """
+        取得佇列深度與雜湊延遲統計
+
+        Returns:
+            統計數據字典，時間單位為毫秒
+        """
+        with self._lock:
+            completed = self.completed
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": min(self.outstanding, self.workers),
+                "queue_depth": max(self.outstanding - self.workers, 0),
+                "completed": completed,
+                "rejected": self.rejected,
+                "hash_latency_ms": {
+                    "avg": self.total_run_seconds / completed * 1000
+                    if completed
+                    else 0.0,
+                    "max": self.max_run_seconds * 1000,
+                },
+                "queue_wait_ms": {
+                    "avg": self.total_wait_seconds / completed * 1000
+                    if completed
+                    else 0.0,
+                    "max": self.max_wait_seconds * 1000,
+                },
+            }
+
+    def shutdown(self) -> None:
+        """關閉執行器，下一次呼叫 run 時會重新建立"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,164 @@
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+    QueuePool,
+)
+
+
+class PoolMetrics:
+    """
+    SQLAlchemy 連線池的統計數據，由連線池事件收集
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空統計數據"""
+        with self._lock:
+            self.checkouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.total_wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+            self.total_held_seconds = 0.0
+            self.max_held_seconds = 0.0
+            self.checkins = 0
+
+    def record_wait(self, seconds: float) -> None:
+        """記錄取得連線所花的時間（包含排隊、建立連線與 pre-ping）"""
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def record_timeout(self) -> None:
+        """記錄等待連線逾時"""
+        with self._lock:
+            self.timeouts += 1
+
+    def attach(self, engine: Engine) -> None:
+        """
+        在引擎的連線池上註冊事件
+
+        Args:
+            engine: SQLAlchemy 引擎
+        """
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, _dbapi_connection: Any, _record: ConnectionPoolEntry) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(
+        self,
+        _dbapi_connection: Any,
+        record: ConnectionPoolEntry,
+        _proxy: PoolProxiedConnection,
+    ) -> None:
+        record.info["checked_out_at"] = time.perf_counter()
+
+    def _on_checkin(self, _dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is None:
+            return
+        held = time.perf_counter() - checked_out_at
+        with self._lock:
+            self.checkins += 1
+            self.total_held_seconds += held
+            self.max_held_seconds = max(self.max_held_seconds, held)
+
+    def _on_invalidate(
+        self, _dbapi_connection: Any, _record: ConnectionPoolEntry, _exc: Any
+    ) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self, engine: Engine) -> dict[str, Any]:
+        """
+        取得連線池目前狀態與累計統計
+
+        Args:
+            engine: SQLAlchemy 引擎
+
+        Returns:
+            統計數據字典，時間單位為毫秒
+        """
+        pool = engine.pool
+        current: dict[str, Any] = {"status": pool.status()}
+        if isinstance(pool, QueuePool):
+            current.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+        with self._lock:
+            return {
+                **current,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "avg": self.total_wait_seconds / self.checkouts * 1000
+                    if self.checkouts
+                    else 0.0,
+                    "max": self.max_wait_seconds * 1000,
+                },
+                "held_ms": {
+                    "avg": self.total_held_seconds / self.checkins * 1000
+                    if self.checkins
+                    else 0.0,
+                    "max": self.max_held_seconds * 1000,
+                },
+            }
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class _TimedCheckout(QueuePool):
+    """
+    記錄每次取得連線等待時間的 QueuePool
+
+    連線池事件只在取得連線之後觸發，無法得知呼叫端等待了多久，
+    因此在 connect() 外圍計時。
+    """
+
+    metrics: PoolMetrics
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckout):
+    """同步引擎使用的連線池，統計寫入 pool_metrics"""
+
+    metrics = pool_metrics
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """非同步引擎使用的連線池，統計寫入 async_pool_metrics"""
+
+    metrics = async_pool_metrics
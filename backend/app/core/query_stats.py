@@ -0,0 +1,176 @@
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.types import Scope
+
+# 參數佔位符（psycopg 的 %(name)s、%s 與字面值）與 IN 清單都視為同一種語句
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_CAST = re.compile(r"\?::\w+(?:\[\])?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    將 SQL 語句正規化為指紋，參數與字面值一律以 ? 取代
+
+    只有參數不同的語句會得到相同的指紋，用於找出重複執行的查詢（N+1）。
+
+    Args:
+        statement: 送往資料庫的 SQL 語句
+
+    Returns:
+        正規化後的語句
+    """
+    normalized = _PLACEHOLDER.sub("?", statement)
+    normalized = _CAST.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryStats:
+    """
+    單一請求（或一段程式碼）執行的 SQL 統計
+    """
+
+    def __init__(self, scope: Scope | None = None) -> None:
+        # 請求的 ASGI scope，路由比對後才會有 route，因此在需要時才讀取
+        self.scope = scope
+        self._lock = threading.Lock()
+        self.statements = 0
+        self.total_seconds = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+    @property
+    def route(self) -> str | None:
+        """
+        執行中的路由，例如 `GET /api/v1/items/{id}`
+
+        路徑參數在路由比對後才寫入 scope，以參數名稱取代其值，
+        同一路由的所有請求因此得到相同的標籤。
+        """
+        if self.scope is None:
+            return None
+        path = self.scope.get("path", "")
+        for name, value in (self.scope.get("path_params") or {}).items():
+            path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+        return f"{self.scope.get('method')} {path}"
+
+    def record(self, statement: str, seconds: float) -> None:
+        """記錄一個已執行的語句，executemany 計為一次"""
+        key = fingerprint(statement)
+        with self._lock:
+            self.statements += 1
+            self.total_seconds += seconds
+            self.fingerprints[key] += 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """
+        取得執行次數達到門檻的語句，通常代表 N+1 查詢
+
+        Args:
+            threshold: 同一指紋的最少執行次數
+
+        Returns:
+            指紋與執行次數，依次數由多到少排列
+        """
+        with self._lock:
+            return {
+                key: count
+                for key, count in self.fingerprints.most_common()
+                if count >= threshold
+            }
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    """取得目前請求的 SQL 統計，不在 record() 區塊內時為 None"""
+    return _current.get()
+
+
+class QueryRecorder:
+    """
+    以 SQLAlchemy 游標事件收集目前請求的 SQL 統計
+
+    統計對象存放在 ContextVar 中：同步路由執行於 threadpool、非同步引擎的語句
+    執行於 greenlet，兩者都會沿用請求的 context，因此各請求的統計互不干擾。
+    """
+
+    def __init__(self) -> None:
+        self._listeners: list[Callable[[QueryStats], None]] = []
+
+    def attach(self, engine: Engine) -> None:
+        """
+        在引擎上註冊游標事件；非同步引擎請傳入 `AsyncEngine.sync_engine`
+
+        Args:
+            engine: SQLAlchemy 引擎
+        """
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def _before_execute(
+        self,
+        _conn: Any,
+        _cursor: Any,
+        _statement: str,
+        _parameters: Any,
+        context: Any,
+        _executemany: bool,
+    ) -> None:
+        if _current.get() is not None:
+            context._query_started_at = time.perf_counter()
+
+    def _after_execute(
+        self,
+        _conn: Any,
+        _cursor: Any,
+        statement: str,
+        _parameters: Any,
+        context: Any,
+        _executemany: bool,
+    ) -> None:
+        stats = _current.get()
+        started_at = getattr(context, "_query_started_at", None)
+        if stats is None or started_at is None:
+            return
+        stats.record(statement, time.perf_counter() - started_at)
+
+    @contextmanager
+    def record(self, scope: Scope | None = None) -> Iterator[QueryStats]:
+        """
+        收集區塊內執行的 SQL，結束時通知已註冊的監聽者
+
+        Args:
+            scope: 請求的 ASGI scope，用於在記錄中標示路由
+
+        Yields:
+            區塊內的 SQL 統計
+        """
+        stats = QueryStats(scope)
+        token = _current.set(stats)
+        try:
+            yield stats
+        finally:
+            _current.reset(token)
+            for listener in list(self._listeners):
+                listener(stats)
+
+    def add_listener(self, listener: Callable[[QueryStats], None]) -> None:
+        """註冊在每次 record() 結束時呼叫的函式，例如測試中的查詢預算檢查"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[QueryStats], None]) -> None:
+        self._listeners.remove(listener)
+
+
+query_recorder = QueryRecorder()
@@ -0,0 +1,250 @@
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from sqlalchemy import Connection, Engine, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlmodel import create_engine
+
+from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.core.deadlines import connect_args
+from app.core.logger import logger
+from app.core.query_stats import query_recorder
+from app.core.slow_queries import slow_query_log
+
+
+class Replica:
+    """單一唯讀副本的同步與非同步引擎，以及健康狀態"""
+
+    def __init__(self, uri: str):
+        """
+        建立副本引擎，連線池大小沿用主庫設定
+
+        Args:
+            uri: 副本的 SQLAlchemy 連線字串
+        """
+        self.name = make_url(uri).render_as_string(hide_password=True)
+        options: dict[str, Any] = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            # 取出連線時先確認副本仍可用，失敗才能及時切換
+            "pool_pre_ping": True,
+            "pool_use_lifo": settings.DB_POOL_ORDER == "lifo",
+            "connect_args": connect_args(),
+        }
+        self.engine = create_engine(uri, **options)
+        self.async_engine = create_async_engine(uri, **options)
+        query_recorder.attach(self.engine)
+        query_recorder.attach(self.async_engine.sync_engine)
+        slow_query_log.attach(self.engine)
+        slow_query_log.attach(self.async_engine.sync_engine)
+        self.down_until = 0.0
+        self.served = 0
+        self.failures = 0
+
+
+class ReplicaRouter:
+    """
+    將唯讀請求分派到副本的路由器
+
+    - 以輪詢方式選擇健康的副本；連線失敗的副本在 retry_seconds 內不再使用
+    - 沒有可用副本時退回主庫
+    - 用戶寫入後 sticky_seconds 內的讀取固定走主庫，確保讀得到自己剛寫入的資料
+
+    寫入紀錄保存在行程內，多個 worker 之間不共享；sticky_seconds 應大於副本延遲。
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        async_primary: AsyncEngine,
+        replica_uris: Sequence[str],
+        sticky_seconds: float,
+        retry_seconds: float,
+        max_sticky_users: int = 10_000,
+    ):
+        """
+        初始化副本路由器
+
+        Args:
+            primary: 主庫的同步引擎
+            async_primary: 主庫的非同步引擎
+            replica_uris: 副本連線字串，空序列表示停用
+            sticky_seconds: 寫入後固定讀主庫的秒數
+            retry_seconds: 副本連線失敗後暫停使用的秒數
+            max_sticky_users: 最多記錄的寫入用戶數量，超過時淘汰最舊的項目
+        """
+        self.primary = primary
+        self.async_primary = async_primary
+        self.replicas = [Replica(uri) for uri in replica_uris]
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self.max_sticky_users = max_sticky_users
+        self._writes: OrderedDict[uuid.UUID, float] = OrderedDict()
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+        self.primary_reads = 0
+        self.sticky_reads = 0
+
+    def record_write(self, user_id: uuid.UUID) -> None:
+        """
+        記錄用戶剛完成寫入，之後一段時間內的讀取會走主庫
+
+        Args:
+            user_id: 用戶 ID
+        """
+        if not self.replicas or self.sticky_seconds <= 0:
+            return
+        with self._lock:
+            self._writes[user_id] = time.monotonic() + self.sticky_seconds
+            self._writes.move_to_end(user_id)
+            while len(self._writes) > self.max_sticky_users:
+                self._writes.popitem(last=False)
+
+    def is_sticky(self, user_id: uuid.UUID) -> bool:
+        """
+        檢查用戶是否仍在寫入後的主庫讀取時間窗內
+
+        Args:
+            user_id: 用戶 ID
+
+        Returns:
+            是否應該讀主庫
+        """
+        with self._lock:
+            until = self._writes.get(user_id)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._writes[user_id]
+                return False
+            return True
+
+    def _candidates(self, user_id: uuid.UUID | None) -> list[Replica]:
+        if not self.replicas:
+            return []
+        if user_id is not None and self.is_sticky(user_id):
+            with self._lock:
+                self.sticky_reads += 1
+            return []
+        now = time.monotonic()
+        start = next(self._rotation) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.down_until <= now]
+
+    def _served(self, replica: Replica | None) -> None:
+        with self._lock:
+            if replica is None:
+                self.primary_reads += 1
+            else:
+                replica.served += 1
+
+    def _mark_down(self, replica: Replica, exc: Exception) -> None:
+        with self._lock:
+            replica.failures += 1
+            replica.down_until = time.monotonic() + self.retry_seconds
+        logger.warning(f"read replica {replica.name} unavailable: {exc}")
+
+    @contextmanager
+    def connect(self, user_id: uuid.UUID | None = None) -> Iterator[Connection]:
+        """
+        取得唯讀查詢使用的連線
+
+        Args:
+            user_id: 發出請求的用戶，用於判斷是否需要讀主庫
+
+        Yields:
+            副本或主庫的連線
+        """
+        connection = None
+        for replica in self._candidates(user_id):
+            try:
+                connection = replica.engine.connect()
+            except OperationalError as e:
+                self._mark_down(replica, e)
+                continue
+            self._served(replica)
+            break
+        if connection is None:
+            connection = self.primary.connect()
+            self._served(None)
+        with connection:
+            yield connection
+
+    @asynccontextmanager
+    async def connect_async(
+        self, user_id: uuid.UUID | None = None
+    ) -> AsyncIterator[AsyncConnection]:
+        """
+        connect 的非同步版本
+
+        Args:
+            user_id: 發出請求的用戶，用於判斷是否需要讀主庫
+
+        Yields:
+            副本或主庫的非同步連線
+        """
+        connection = None
+        for replica in self._candidates(user_id):
+            try:
+                connection = await replica.async_engine.connect()
+            except OperationalError as e:
+                self._mark_down(replica, e)
+                continue
+            self._served(replica)
+            break
+        if connection is None:
+            connection = await self.async_primary.connect()
+            self._served(None)
+        try:
+            yield connection
+        finally:
+            await connection.close()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        取得各副本的健康狀態與讀取分派統計
+
+        Returns:
+            統計數據字典
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "primary_reads": self.primary_reads,
+                "sticky_reads": self.sticky_reads,
+                "sticky_users": len(self._writes),
+                "replicas": [
+                    {
+                        "name": replica.name,
+                        "healthy": replica.down_until <= now,
+                        "served": replica.served,
+                        "failures": replica.failures,
+                    }
+                    for replica in self.replicas
+                ],
+            }
+
+    async def dispose(self) -> None:
+        """關閉所有副本的連線池"""
+        for replica in self.replicas:
+            replica.engine.dispose()
+            await replica.async_engine.dispose()
+
+
+replica_router = ReplicaRouter(
+    engine,
+    async_engine,
+    [str(uri) for uri in settings.DB_REPLICA_URIS],
+    sticky_seconds=settings.DB_REPLICA_STICKY_SECONDS,
+    retry_seconds=settings.DB_REPLICA_RETRY_SECONDS,
+)
@@ -0,0 +1,178 @@
+import random
+import re
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.query_stats import current_query_stats, fingerprint
+
+# 只對 SELECT 擷取執行計畫：EXPLAIN ANALYZE 會真的再執行一次語句。以 WITH 開頭
+# 的語句可能是修改資料的 CTE（例如寄件匣的領取），鎖定資料列的 SELECT 也不重跑
+_EXPLAINABLE = re.compile(r"\s*SELECT\b", re.IGNORECASE)
+_ROW_LOCKING = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE
+)
+_EXPLAIN_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {extra[route]} | {message}"
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """
+    將語句參數替換為型別名稱，避免密碼雜湊、email 等資料寫入日誌
+
+    Args:
+        parameters: DBAPI 參數（dict 或序列）
+        executemany: 是否為 executemany，只保留第一組參數與總組數
+
+    Returns:
+        只含型別名稱的參數
+    """
+    if executemany and isinstance(parameters, Sequence) and parameters:
+        return {"rows": len(parameters), "first": redact_parameters(parameters[0])}
+    if isinstance(parameters, Mapping):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, Sequence) and not isinstance(parameters, str):
+        return [type(value).__name__ for value in parameters]
+    return parameters
+
+
+class SlowQueryLog:
+    """
+    記錄執行時間超過 SLOW_QUERY_THRESHOLD_MS 的語句
+
+    每筆記錄包含正規化後的 SQL、遮蔽後的參數、耗時與發出語句的路由。
+    依 SLOW_QUERY_EXPLAIN_SAMPLE_RATE 抽樣的 SELECT 會在同一個連線上以
+    EXPLAIN (ANALYZE, BUFFERS) 重新執行一次，執行計畫寫入 SLOW_QUERY_EXPLAIN_FILE。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._explain_handler: int | None = None
+        self.slow_queries = 0
+        self.explained = 0
+
+    def attach(self, engine: Engine) -> None:
+        """
+        在引擎上註冊游標事件；非同步引擎請傳入 `AsyncEngine.sync_engine`
+
+        Args:
+            engine: SQLAlchemy 引擎
+        """
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+                "slow_queries": self.slow_queries,
+                "explained": self.explained,
+            }
+
+    def _before_execute(
+        self,
+        _conn: Any,
+        _cursor: Any,
+        _statement: str,
+        _parameters: Any,
+        context: Any,
+        _executemany: bool,
+    ) -> None:
+        if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+            context._slow_query_started_at = time.perf_counter()
+
+    def _after_execute(
+        self,
+        conn: Any,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        started_at = getattr(context, "_slow_query_started_at", None)
+        if started_at is None:
+            return
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+        stats = current_query_stats()
+        route = (stats.route if stats else None) or "-"
+        sql = fingerprint(statement)
+        with self._lock:
+            self.slow_queries += 1
+        logger.bind(
+            slow_query=True,
+            route=route,
+            sql=sql,
+            parameters=redact_parameters(parameters, executemany),
+            duration_ms=round(duration_ms, 2),
+        ).warning(f"slow query ({duration_ms:.1f} ms) in {route}: {sql}")
+        if (
+            not executemany
+            and settings.SLOW_QUERY_EXPLAIN_FILE
+            and _EXPLAINABLE.match(statement)
+            and not _ROW_LOCKING.search(statement)
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        ):
+            self._explain(conn, statement, parameters, route, duration_ms)
+
+    def _explain(
+        self,
+        conn: Any,
+        statement: str,
+        parameters: Any,
+        route: str,
+        duration_ms: float,
+    ) -> None:
+        # 直接使用 DBAPI 游標，不觸發引擎事件；以 savepoint 包住，
+        # EXPLAIN 失敗時不會讓呼叫端的交易進入 aborted 狀態
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters or None
+                )
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            finally:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        except Exception as e:
+            logger.warning(f"EXPLAIN of slow query failed: {e}")
+            return
+        finally:
+            cursor.close()
+        self._ensure_explain_output()
+        with self._lock:
+            self.explained += 1
+        logger.bind(slow_query_explain=True, route=route).info(
+            f"{duration_ms:.1f} ms\n{fingerprint(statement)}\n{plan}"
+        )
+
+    def _ensure_explain_output(self) -> None:
+        with self._lock:
+            if self._explain_handler is not None:
+                return
+            self._explain_handler = logger.configure_output(
+                settings.SLOW_QUERY_EXPLAIN_FILE,
+                format=_EXPLAIN_FORMAT,
+                rotation=settings.SLOW_QUERY_EXPLAIN_ROTATION,
+                retention=settings.SLOW_QUERY_EXPLAIN_RETENTION,
+                filter=lambda record: record["extra"].get("slow_query_explain", False),
+                enqueue=True,
+            )
+
+    def close(self) -> None:
+        """移除執行計畫的檔案輸出"""
+        with self._lock:
+            if self._explain_handler is not None:
+                logger.remove_output(self._explain_handler)
+                self._explain_handler = None
+
+
+slow_query_log = SlowQueryLog()
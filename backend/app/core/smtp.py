@@ -0,0 +1,237 @@
+import smtplib
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+@dataclass(frozen=True)
+class SMTPServer:
+    """一組 SMTP 連線設定，設定相同的連線才能共用"""
+
+    host: str
+    port: int
+    tls: bool
+    ssl: bool
+    user: str | None
+    password: str | None
+    timeout: float
+
+    @classmethod
+    def from_settings(cls) -> "SMTPServer":
+        assert settings.SMTP_HOST, "no provided configuration for SMTP_HOST"
+        return cls(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            tls=settings.SMTP_TLS,
+            ssl=settings.SMTP_SSL and not settings.SMTP_TLS,
+            user=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+
+    def connect(self) -> smtplib.SMTP:
+        """建立連線並完成 STARTTLS 與 AUTH"""
+        smtp_class = smtplib.SMTP_SSL if self.ssl else smtplib.SMTP
+        smtp = smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.tls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password or "")
+            smtp.ehlo_or_helo_if_needed()
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+
+@dataclass(frozen=True)
+class Envelope:
+    """一封待寄送的郵件：寄件者、收件者與完整的 MIME 內容"""
+
+    mail_from: str
+    recipients: Sequence[str]
+    message: str | bytes
+
+
+class _Connection:
+    def __init__(self, server: SMTPServer) -> None:
+        self.server = server
+        self.smtp = server.connect()
+        self.last_used = time.monotonic()
+        self.reused = False
+
+
+class SMTPPool:
+    """
+    SMTP 連線池，以 SMTP_* 設定為鍵保留已完成 STARTTLS 與 AUTH 的連線
+
+    閒置超過 SMTP_POOL_NOOP_AFTER_SECONDS 的連線在取出時先送出 NOOP 確認仍可使用，
+    閒置超過 SMTP_POOL_MAX_IDLE_SECONDS 的連線直接關閉，避免使用已被伺服器斷開的連線；
+    重用的連線寄送時斷線，會換一條新連線重送一次。
+    """
+
+    def __init__(self, max_idle: int) -> None:
+        self.max_idle = max_idle
+        self._idle: dict[SMTPServer, deque[_Connection]] = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+        self.messages = 0
+
+    def _pop_idle(self, server: SMTPServer) -> _Connection | None:
+        with self._lock:
+            idle = self._idle.get(server)
+            # 後進先出：最近使用的連線最可能仍然有效
+            return idle.pop() if idle else None
+
+    def _acquire(self, server: SMTPServer) -> _Connection:
+        while (conn := self._pop_idle(server)) is not None:
+            idle_seconds = time.monotonic() - conn.last_used
+            if idle_seconds > settings.SMTP_POOL_MAX_IDLE_SECONDS:
+                self._discard(conn)
+                continue
+            if idle_seconds > settings.SMTP_POOL_NOOP_AFTER_SECONDS:
+                try:
+                    code, _ = conn.smtp.noop()
+                except (smtplib.SMTPException, OSError):
+                    code = None
+                if code != 250:
+                    self._discard(conn)
+                    continue
+            conn.reused = True
+            with self._lock:
+                self.reused += 1
+            return conn
+        conn = _Connection(server)
+        with self._lock:
+            self.opened += 1
+        return conn
+
+    def _release(self, conn: _Connection) -> None:
+        conn.last_used = time.monotonic()
+        with self._lock:
+            idle = self._idle.setdefault(conn.server, deque())
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        self._discard(conn)
+
+    def _discard(self, conn: _Connection) -> None:
+        with self._lock:
+            self.discarded += 1
+        try:
+            conn.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.smtp.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """
+        取出一條目前 SMTP_* 設定的連線，區塊結束後放回連線池
+
+        區塊內發生例外時無法確定連線狀態，連線會被關閉而不放回。
+
+        Yields:
+            已完成認證的 smtplib.SMTP
+        """
+        conn = self._acquire(SMTPServer.from_settings())
+        try:
+            yield conn.smtp
+        except BaseException:
+            self._discard(conn)
+            raise
+        self._release(conn)
+
+    def send(self, envelope: Envelope) -> None:
+        """
+        寄送一封郵件
+
+        Args:
+            envelope: 郵件
+
+        Raises:
+            smtplib.SMTPException: 伺服器拒絕寄件者、收件者或內容
+            OSError: 無法連線到伺服器
+        """
+        errors = self.send_many([envelope])
+        if errors[0] is not None:
+            raise errors[0]
+
+    def send_many(self, envelopes: Sequence[Envelope]) -> list[Exception | None]:
+        """
+        以同一條連線依序寄送多封郵件，省去每封郵件的連線、TLS 交握與認證
+
+        單封郵件被拒不影響其他郵件；連線中斷時換一條新連線，從中斷的郵件繼續寄送。
+
+        Args:
+            envelopes: 郵件
+
+        Returns:
+            與 envelopes 對應的錯誤，寄送成功為 None
+
+        Raises:
+            OSError: 無法建立新連線
+        """
+        errors: list[Exception | None] = []
+        server = SMTPServer.from_settings()
+        while len(errors) < len(envelopes):
+            conn = self._acquire(server)
+            try:
+                for envelope in envelopes[len(errors) :]:
+                    errors.append(self._sendmail(conn.smtp, envelope))
+            except OSError as e:
+                # 斷線或逾時（SMTPServerDisconnected 亦為 OSError）；
+                # 收件者被拒等其他 SMTPException 已由 _sendmail 轉為回傳值
+                self._discard(conn)
+                if not conn.reused:
+                    # 新建立的連線也無法寄送，記錄錯誤後換下一封
+                    errors.append(e)
+                continue
+            self._release(conn)
+        with self._lock:
+            self.messages += len(envelopes)
+        return errors
+
+    def _sendmail(self, smtp: smtplib.SMTP, envelope: Envelope) -> Exception | None:
+        try:
+            refused = smtp.sendmail(
+                envelope.mail_from, list(envelope.recipients), envelope.message
+            )
+        except smtplib.SMTPServerDisconnected:
+            raise
+        except smtplib.SMTPException as e:
+            # sendmail 在拒絕時已送出 RSET，連線可繼續使用
+            return e
+        if refused:
+            logger.warning(f"SMTP server refused some recipients: {refused}")
+        return None
+
+    def close(self) -> None:
+        """關閉所有閒置連線"""
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "idle": sum(len(conns) for conns in self._idle.values()),
+                "opened": self.opened,
+                "reused": self.reused,
+                "discarded": self.discarded,
+                "messages": self.messages,
+            }
+
+
+smtp_pool = SMTPPool(max_idle=settings.SMTP_POOL_SIZE)
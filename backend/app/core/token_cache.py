@@ -0,0 +1,105 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import settings
+from app.schemas import TokenPayload
+
+
+class TokenPayloadCache:
+    """
+    已驗證 JWT 內容的快取，以令牌的 SHA-256 摘要為鍵，於令牌的 `exp` 時間過期
+
+    命中時可略過簽章驗證與 Pydantic 驗證；快取中不保存令牌原文。
+    """
+
+    def __init__(self, max_size: int):
+        """
+        初始化令牌快取
+
+        Args:
+            max_size: 最多快取的令牌數量，0 表示停用
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[float, TokenPayload]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> TokenPayload | None:
+        """
+        取得已驗證的令牌內容
+
+        Args:
+            token: JWT 原文
+
+        Returns:
+            令牌內容，未命中或已過期則為 None
+        """
+        if self.max_size <= 0:
+            return None
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, token: str, token_data: TokenPayload, expires_at: float) -> None:
+        """
+        寫入已驗證的令牌內容
+
+        Args:
+            token: JWT 原文
+            token_data: 驗證後的令牌內容
+            expires_at: 令牌的 `exp`（Unix 時間戳）
+        """
+        if self.max_size <= 0 or expires_at <= time.time():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, token_data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """清空快取與統計數據"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        取得快取統計數據
+
+        Returns:
+            包含命中、未命中與淘汰次數的字典
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+token_cache = TokenPayloadCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
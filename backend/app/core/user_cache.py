@@ -0,0 +1,263 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import event, text
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models import User
+
+# session.info 中等待交易 commit 後失效的 (快取, 用戶 ID)
+_PENDING_KEY = "user_cache_pending_invalidations"
+
+
+class UserCache:
+    """
+    行程內的用戶快取，以用戶 ID 為鍵，支援 TTL 過期與 LRU 淘汰
+
+    快取內容為欄位快照而非 ORM 物件本身，取出時會以 `Session.merge(load=False)`
+    掛回呼叫端的 session，因此不會產生額外的查詢，也不會在多個 session 之間共用同一個實例。
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        channel: str | None = None,
+    ):
+        """
+        初始化用戶快取
+
+        Args:
+            max_size: 最多快取的用戶數量，超過時淘汰最久未使用的項目
+            ttl_seconds: 每個項目的存活秒數
+            channel: 跨 worker 失效通知使用的 PostgreSQL NOTIFY 頻道，None 表示停用
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.channel = channel
+        self._entries: OrderedDict[uuid.UUID, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+        self._stop_listener = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def _lookup(self, user_id: uuid.UUID) -> User | None:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            data = entry[1]
+
+        user = User(**data)
+        make_transient_to_detached(user)
+        return user
+
+    def get(self, session: Session, user_id: uuid.UUID) -> User | None:
+        """
+        取得快取中的用戶，並掛回指定的 session
+
+        Args:
+            session: 目前請求的資料庫會話
+            user_id: 用戶 ID
+
+        Returns:
+            已附加到 session 的用戶，快取未命中或已過期則為 None
+        """
+        user = self._lookup(user_id)
+        if user is None:
+            return None
+        return session.merge(user, load=False)
+
+    async def get_async(self, session: AsyncSession, user_id: uuid.UUID) -> User | None:
+        """
+        get 的非同步版本，供使用 AsyncSession 的請求使用
+
+        Args:
+            session: 目前請求的非同步資料庫會話
+            user_id: 用戶 ID
+
+        Returns:
+            已附加到 session 的用戶，快取未命中或已過期則為 None
+        """
+        user = self._lookup(user_id)
+        if user is None:
+            return None
+        return await session.merge(user, load=False)
+
+    def set(self, user: User) -> None:
+        """
+        寫入用戶快照
+
+        Args:
+            user: 從資料庫載入的用戶
+        """
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[user.id] = (expires_at, user.model_dump())
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        """
+        使本行程中指定用戶的快取失效
+
+        Args:
+            user_id: 用戶 ID
+        """
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_on_commit(
+        self, session: Session | AsyncSession, user_id: uuid.UUID
+    ) -> None:
+        """
+        登記在 session 的交易 commit 後使指定用戶的快取失效
+
+        須在修改用戶的交易 commit 前呼叫。NOTIFY 於 commit 前在同一個交易中送出，
+        由 PostgreSQL 在 commit 時才傳給其他 worker；本行程的快取則在 commit 後失效，
+        因此其他請求不會在 commit 前重新載入並快取舊資料。交易 rollback 時取消登記。
+
+        Args:
+            session: 修改用戶的同步或非同步資料庫會話
+            user_id: 用戶 ID
+        """
+        session.info.setdefault(_PENDING_KEY, set()).add((self, user_id))
+
+    def clear(self) -> None:
+        """清空快取與統計數據"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        取得快取統計數據
+
+        Returns:
+            包含命中、未命中、淘汰與失效次數的字典
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def start_listener(self, conninfo: str) -> None:
+        """
+        啟動背景執行緒，接收其他 worker 發出的失效通知
+
+        Args:
+            conninfo: psycopg 連線字串
+        """
+        if not self.channel or self._listener is not None:
+            return
+        self._stop_listener.clear()
+        self._listener = threading.Thread(
+            target=self._listen,
+            args=(conninfo,),
+            name="user-cache-listener",
+            daemon=True,
+        )
+        self._listener.start()
+
+    def stop_listener(self) -> None:
+        """停止失效通知的背景執行緒"""
+        if self._listener is None:
+            return
+        self._stop_listener.set()
+        self._listener.join(timeout=5)
+        self._listener = None
+
+    def _listen(self, conninfo: str) -> None:
+        assert self.channel
+        while not self._stop_listener.is_set():
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as conn:
+                    conn.execute(
+                        sql.SQL("LISTEN {}").format(sql.Identifier(self.channel))
+                    )
+                    # 重新連線期間可能漏掉通知，保守起見清空快取
+                    with self._lock:
+                        self._entries.clear()
+                    while not self._stop_listener.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            try:
+                                user_id = uuid.UUID(notify.payload)
+                            except ValueError:
+                                continue
+                            self.invalidate(user_id)
+            except Exception as e:
+                logger.warning(f"user cache listener disconnected: {e}")
+                self._stop_listener.wait(1.0)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_invalidations(session: Session) -> None:
+    pending: set[tuple[UserCache, uuid.UUID]] = session.info.get(_PENDING_KEY, set())
+    for channel in {cache.channel for cache, _ in pending if cache.channel}:
+        payloads = [
+            str(user_id) for cache, user_id in pending if cache.channel == channel
+        ]
+        session.execute(
+            text(
+                "SELECT pg_notify(:channel, payload) "
+                "FROM unnest(CAST(:payloads AS text[])) AS payload"
+            ),
+            {"channel": channel, "payloads": payloads},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for cache, user_id in session.info.pop(_PENDING_KEY, set()):
+        cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    channel=settings.USER_CACHE_INVALIDATION_CHANNEL,
+)
@@ -0,0 +1,51 @@
+"""
+在獨立的行程中寄出郵件寄件匣的郵件，可同時執行多個
+
+    python -m app.email_worker
+    python -m app.email_worker --once
+
+以此方式執行時，可將 API 行程的 EMAIL_OUTBOX_WORKER 設為 false。
+"""
+
+import argparse
+import logging
+import signal
+from types import FrameType
+
+from app.core.config import settings
+from app.services.email_outbox import email_outbox_worker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--once", action="store_true", help="send one batch of due emails and exit"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE
+    )
+    args = parser.parse_args()
+    if not settings.emails_enabled:
+        parser.error("SMTP_HOST and EMAILS_FROM_EMAIL must be set")
+
+    if args.once:
+        sent = email_outbox_worker.run_once(args.batch_size)
+        logger.info(f"Processed {sent} emails")
+        return
+
+    def stop(_signum: int, _frame: FrameType | None) -> None:
+        logger.info("Stopping email worker")
+        email_outbox_worker.stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    logger.info("Email worker started")
+    email_outbox_worker.start(args.batch_size)
+    signal.pause()
+
+
+if __name__ == "__main__":
+    main()
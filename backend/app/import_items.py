@@ -0,0 +1,68 @@
+"""
+從 CSV 或 NDJSON 檔案大量匯入物品
+
+    python -m app.import_items items.csv --owner admin@example.com
+    python -m app.import_items items.ndjson --errors items.errors.ndjson
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.schemas import ItemImportError
+from app.services.item_import import ImportFormat, ItemImportService
+from app.services.user import UserService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("file", type=Path)
+    parser.add_argument(
+        "--owner", default=settings.FIRST_SUPERUSER, help="owner's email address"
+    )
+    parser.add_argument("--format", choices=["ndjson", "csv"])
+    parser.add_argument(
+        "--errors",
+        type=Path,
+        help="where to write every rejected row as NDJSON "
+        "(default: <file>.errors.ndjson)",
+    )
+    args = parser.parse_args()
+    format: ImportFormat = args.format or (
+        "csv" if args.file.suffix.lower() == ".csv" else "ndjson"
+    )
+    errors_path = args.errors or args.file.with_name(f"{args.file.name}.errors.ndjson")
+
+    with Session(engine) as session:
+        owner = UserService(session).get_by_email(args.owner)
+        if not owner:
+            parser.error(f"user {args.owner} not found")
+        with args.file.open("rb") as file, errors_path.open("w") as errors_file:
+
+            def write_error(error: ItemImportError) -> None:
+                errors_file.write(error.model_dump_json() + "\n")
+
+            logger.info(f"Importing {args.file} ({format}) for {args.owner}")
+            report = ItemImportService(session).import_file(
+                file, format, owner.id, on_error=write_error
+            )
+
+    logger.info(
+        f"{report.imported} imported, {report.failed} rejected of {report.rows} rows "
+        f"in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s)"
+    )
+    if report.failed:
+        logger.info(f"Rejected rows written to {errors_path}")
+    else:
+        errors_path.unlink()
+
+
+if __name__ == "__main__":
+    main()
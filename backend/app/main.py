@@ -1,10 +1,35 @@
+import time
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
+from psycopg.errors import QueryCanceled
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.core import email_templates
 from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.core.deadlines import (
+    REQUEST_TIMEOUT_HEADER,
+    DeadlineExceeded,
+    request_deadline,
+)
+from app.core.logger import logger
+from app.core.password_hasher import PasswordHasherBusyError
+from app.core.query_stats import query_recorder
+from app.core.replicas import replica_router
+from app.core.security import decode_access_token, password_hasher
+from app.core.slow_queries import slow_query_log
+from app.core.smtp import smtp_pool
+from app.core.user_cache import user_cache
+from app.services.email_outbox import email_outbox_worker
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,12 +39,163 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    email_templates.precompile()
+    if settings.USER_CACHE_INVALIDATION_CHANNEL:
+        user_cache.start_listener(
+            engine.url.set(drivername="postgresql").render_as_string(
+                hide_password=False
+            )
+        )
+    if settings.EMAIL_OUTBOX_WORKER and settings.emails_enabled:
+        email_outbox_worker.start()
+    yield
+    email_outbox_worker.stop()
+    smtp_pool.close()
+    user_cache.stop_listener()
+    password_hasher.shutdown()
+    # 非同步連線綁定於目前的事件迴圈，關閉前先釋放
+    await async_engine.dispose()
+    await replica_router.dispose()
+    slow_query_log.close()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
+
+@app.exception_handler(PasswordHasherBusyError)
+def password_hasher_busy_handler(
+    _request: Request, _exc: PasswordHasherBusyError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+
+def _deadline_exceeded() -> JSONResponse:
+    return JSONResponse(
+        status_code=504, content={"detail": "Request deadline exceeded"}
+    )
+
+
+@app.exception_handler(DeadlineExceeded)
+def deadline_exceeded_handler(
+    _request: Request, _exc: DeadlineExceeded
+) -> JSONResponse:
+    return _deadline_exceeded()
+
+
+@app.exception_handler(OperationalError)
+def operational_error_handler(_request: Request, exc: OperationalError) -> JSONResponse:
+    # statement_timeout 到期時 PostgreSQL 取消語句；交易隨 session 結束回滾，連線歸還連線池
+    if isinstance(exc.orig, QueryCanceled):
+        return _deadline_exceeded()
+    # 其他 OperationalError 多為連線中斷或資料庫無法使用，不在處理器中重新拋出
+    logger.error(f"Database operational error: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is unavailable, please retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(PoolTimeoutError)
+def pool_timeout_handler(_request: Request, _exc: PoolTimeoutError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy, please retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.middleware("http")
+async def apply_request_deadline(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # X-Request-Timeout（毫秒）設定整個請求的期限，再由路由的 deadline() 依賴縮短
+    timeout_ms: float | None = None
+    header = request.headers.get(REQUEST_TIMEOUT_HEADER)
+    if header is not None:
+        try:
+            timeout_ms = float(header)
+        except ValueError:
+            timeout_ms = 0
+        if not 0 < timeout_ms < float("inf"):
+            return JSONResponse(
+                status_code=400,
+                content={"detail": f"Invalid {REQUEST_TIMEOUT_HEADER} header"},
+            )
+        timeout_ms = min(timeout_ms, settings.REQUEST_MAX_TIMEOUT_MS)
+    with request_deadline(timeout_ms):
+        return await call_next(request)
+
+
+@app.middleware("http")
+async def record_replica_writes(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # 成功的寫入請求之後，該用戶的讀取在一段時間內改走主庫
+    response = await call_next(request)
+    if (
+        replica_router.replicas
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                user_id = uuid.UUID(decode_access_token(token).sub)
+            except Exception:
+                return response
+            replica_router.record_write(user_id)
+    return response
+
+
+@app.middleware("http")
+async def record_queries(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # 統計請求執行的 SQL；串流回應在此之後才執行的查詢不計入
+    start = time.perf_counter()
+    with query_recorder.record(request.scope) as stats:
+        response = await call_next(request)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    db_ms = stats.total_seconds * 1000
+    repeated = stats.repeated(settings.QUERY_STATS_REPEATED_THRESHOLD)
+    request_logger = logger.bind(
+        method=request.method,
+        path=request.url.path,
+        status=response.status_code,
+        duration_ms=round(elapsed_ms, 2),
+        queries=stats.statements,
+        db_ms=round(db_ms, 2),
+        repeated_queries=repeated,
+    )
+    summary = (
+        f"{request.method} {request.url.path} {response.status_code}: "
+        f"{stats.statements} queries, {db_ms:.1f} ms in DB, {elapsed_ms:.1f} ms total"
+    )
+    if repeated:
+        request_logger.warning(f"{summary}; repeated queries (N+1?): {repeated}")
+    else:
+        request_logger.info(summary)
+    if settings.ENVIRONMENT != "production":
+        response.headers["X-DB-Queries"] = str(stats.statements)
+        response.headers["X-DB-Time-Ms"] = f"{db_ms:.2f}"
+        if repeated:
+            response.headers["X-DB-Repeated-Queries"] = str(sum(repeated.values()))
+    return response
+
+
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
@@ -1,5 +1,8 @@
 import uuid
+from datetime import datetime, timezone
 
+from pydantic import EmailStr
+from sqlalchemy import Column, DateTime, Index, Text, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.schemas import UserBase, ItemBase
@@ -7,11 +10,18 @@ from app.schemas import UserBase, ItemBase
 
 class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    email: EmailStr = Field(unique=True, index=True, max_length=255)
     hashed_password: str
-    items: list["Item"] = Relationship(back_populates="owner", cascade_delete=True)
+    # 刪除用戶時由資料庫的 ON DELETE CASCADE 刪除物品，不先把物品載入 session
+    items: list["Item"] = Relationship(
+        back_populates="owner", cascade_delete=True, passive_deletes=True
+    )
 
 
 class Item(ItemBase, table=True):
+    # (owner_id, id) 同時支援依擁有者篩選與 keyset 分頁
+    __table_args__ = (Index("ix_item_owner_id_id", "owner_id", "id"),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
@@ -19,4 +29,46 @@ class Item(ItemBase, table=True):
     owner: User | None = Relationship(back_populates="items")
 
 
-__all__ = ["User", "Item"]
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _timestamp(nullable: bool = False) -> "Column[datetime]":
+    return Column(DateTime(timezone=True), nullable=nullable)
+
+
+class EmailOutbox(SQLModel, table=True):
+    """
+    待寄送的郵件；請求只寫入此表，由背景 worker 寄出
+
+    status 依序為 pending → sending → sent，重試次數用盡時為 dead。
+    sending 的列在 locked_until 之前屬於領取它的 worker，逾期視為該 worker 已中止，
+    可再被其他 worker 領取。
+    """
+
+    __tablename__ = "email_outbox"
+    # 只索引尚待處理的列，worker 的領取查詢不需掃描已寄出的歷史資料
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_due",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('pending', 'sending')"),
+        ),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    email_to: str = Field(max_length=255)
+    subject: str = Field(max_length=998)
+    html_content: str = Field(sa_column=Column(Text, nullable=False))
+    status: str = Field(default="pending", max_length=16)
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=_utcnow, sa_column=_timestamp())
+    locked_until: datetime | None = Field(
+        default=None, sa_column=_timestamp(nullable=True)
+    )
+    created_at: datetime = Field(default_factory=_utcnow, sa_column=_timestamp())
+    sent_at: datetime | None = Field(default=None, sa_column=_timestamp(nullable=True))
+    last_error: str | None = Field(default=None, sa_column=Column(Text))
+
+
+__all__ = ["User", "Item", "EmailOutbox"]
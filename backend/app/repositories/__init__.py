@@ -1,5 +1,21 @@
-from app.repositories.base import BaseRepository
-from app.repositories.user import UserRepository
-from app.repositories.item import ItemRepository
+from app.repositories.base import AsyncBaseRepository, BaseRepository
+from app.repositories.user import AsyncUserRepository, UserRepository
+from app.repositories.item import AsyncItemRepository, ItemRepository
+from app.repositories.email_outbox import (
+    AsyncEmailOutboxRepository,
+    EmailOutboxRepository,
+)
+from app.repositories.unit_of_work import async_unit_of_work, unit_of_work
 
-__all__ = ["BaseRepository", "UserRepository", "ItemRepository"]
+__all__ = [
+    "BaseRepository",
+    "UserRepository",
+    "ItemRepository",
+    "EmailOutboxRepository",
+    "AsyncBaseRepository",
+    "AsyncUserRepository",
+    "AsyncItemRepository",
+    "AsyncEmailOutboxRepository",
+    "unit_of_work",
+    "async_unit_of_work",
+]
@@ -1,17 +1,179 @@
 import uuid
-from typing import Any, Generic, TypeVar, Type, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generic,
+    Iterator,
+    TypeVar,
+    Type,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
-from sqlmodel import Session, select, SQLModel
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    Table,
+    any_,
+    bindparam,
+    delete,
+    insert,
+    literal,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.orm import class_mapper
+from sqlmodel import Session, func, select, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.repositories.unit_of_work import in_unit_of_work
 
 # 定義通用類型變數
 T = TypeVar("T", bound=SQLModel)
 
+_ESTIMATE_COUNT = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+)
+
+
+def _id_column(model: Type[T]) -> Column[Any]:
+    # 所有資料表模型都以 id 為主鍵，但 SQLModel 的型別中沒有宣告 id
+    return class_mapper(model).columns["id"]
+
+
+def _page_after_statement(
+    model: Type[T],
+    keyset_columns: Sequence[str],
+    after: Optional[Sequence[Any]],
+    limit: int,
+    where: Sequence[Any],
+) -> Any:
+    columns = [getattr(model, name) for name in keyset_columns]
+    statement = select(model).where(*where)
+    if after is not None:
+        values = [
+            value
+            if isinstance(value, column.type.python_type)
+            else column.type.python_type(value)
+            for column, value in zip(columns, after, strict=True)
+        ]
+        statement = statement.where(tuple_(*columns) > tuple_(*values))
+    return statement.order_by(*columns).limit(limit)
+
+
+def insert_returning(obj: SQLModel) -> Any:
+    """
+    建立 INSERT ... RETURNING 語句，資料庫產生的欄位值隨同一個語句取回
+
+    Args:
+        obj: 已驗證的資料表模型實例
+
+    Returns:
+        回傳 ORM 物件的 INSERT 語句
+    """
+    model = type(obj)
+    return insert(model).values(**obj.model_dump()).returning(model)
+
+
+def update_returning(
+    model: Type[T], where: Sequence[Any], values: Dict[str, Any]
+) -> Any:
+    """
+    建立 UPDATE ... RETURNING 語句，只保留模型欄位，並以回傳值覆寫 session 中的實例
+
+    Args:
+        model: SQLModel 模型類別
+        where: 篩選條件
+        values: 要更新的欄位
+
+    Returns:
+        回傳 ORM 物件的 UPDATE 語句
+    """
+    fields = {key: value for key, value in values.items() if key in model.model_fields}
+    return (
+        update(model)
+        .where(*where)
+        .values(**fields)
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+
+
+def id_in(model: Type[T], ids: Sequence[uuid.UUID]) -> Any:
+    """
+    建立 `id = ANY(:ids)` 條件，所有 id 以單一陣列參數傳入
+
+    與 IN (...) 不同，語句文字不隨 id 數量改變，可重複使用同一個預備語句。
+
+    Args:
+        model: SQLModel 模型類別
+        ids: 項目 ID 列表
+
+    Returns:
+        篩選條件
+    """
+    column = _id_column(model)
+    return column == any_(literal(list(ids), ARRAY(column.type)))
+
+
+def _bulk_insert_statement(model: Type[T]) -> Any:
+    # 多筆參數會由 SQLAlchemy 合併為多列 INSERT，RETURNING 依參數順序回傳
+    return insert(model).returning(model, sort_by_parameter_order=True)
+
+
+def _bulk_update_batches(
+    model: Type[T], objs_in: Sequence[Dict[str, Any]], where: Sequence[Any]
+) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+    # executemany 的每一列必須更新相同的欄位，因此依欄位組合分組
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for obj_in in objs_in:
+        fields = tuple(
+            sorted(key for key in obj_in if key in model.model_fields and key != "id")
+        )
+        if fields:
+            row = {key: obj_in[key] for key in fields}
+            row["_id"] = obj_in["id"]
+            groups.setdefault(fields, []).append(row)
+    table = cast(Table, class_mapper(model).local_table)
+    statement = update(table).where(table.c.id == bindparam("_id"), *where)
+    return [(statement, rows) for rows in groups.values()]
+
+
+def _bulk_select_statement(
+    model: Type[T], ids: Sequence[uuid.UUID], where: Sequence[Any]
+) -> Any:
+    statement = select(model).where(id_in(model, ids), *where)
+    return statement.execution_options(populate_existing=True)
+
+
+def _stream_statement(
+    model: Type[T], columns: Sequence[str], where: Sequence[Any], size: int
+) -> Any:
+    # 只選取欄位而非 ORM 物件，資料列不會累積在 session 的 identity map 中；
+    # yield_per 讓 psycopg 使用伺服器端 (named) cursor，每次只取回 size 筆
+    statement = select(*(getattr(model, name) for name in columns)).where(*where)
+    return statement.order_by(_id_column(model)).execution_options(yield_per=size)
+
+
+def _in_input_order(objs: Sequence[Any], ids: Sequence[uuid.UUID]) -> List[Any]:
+    by_id = {obj.id: obj for obj in objs}
+    return [by_id[id] for id in dict.fromkeys(ids) if id in by_id]
+
 
 class BaseRepository(Generic[T]):
     """
     所有 Repository 的基礎類別，提供通用的資料庫操作
     """
 
+    # keyset 分頁使用的排序欄位，最後一個欄位必須唯一
+    keyset_columns: Tuple[str, ...] = ("id",)
+
     def __init__(self, session: Session, model: Type[T]):
         """
         初始化 Repository
@@ -25,7 +187,7 @@ class BaseRepository(Generic[T]):
 
     def get_by_id(self, id: uuid.UUID) -> Optional[T]:
         """
-        透過 ID 取得單一項目
+        透過 ID 取得單一項目，已在 session 中的項目直接回傳而不查詢資料庫
 
         Args:
             id: 項目 ID
@@ -33,8 +195,7 @@ class BaseRepository(Generic[T]):
         Returns:
             找到的項目，或 None
         """
-        statement = select(self.model).where(self.model.id == id)
-        return self.session.exec(statement).first()
+        return self.session.get(self.model, id)
 
     def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         """
@@ -48,11 +209,49 @@ class BaseRepository(Generic[T]):
             項目列表
         """
         statement = select(self.model).offset(skip).limit(limit)
-        return self.session.exec(statement).all()
+        return list(self.session.exec(statement).all())
+
+    def get_page_after(
+        self, after: Optional[Sequence[Any]] = None, limit: int = 100, *where: Any
+    ) -> List[T]:
+        """
+        以 keyset (游標) 方式分頁，依 keyset_columns 排序並取得位於 after 之後的項目
+
+        與 OFFSET 不同，查詢成本不隨頁數增加，且並行寫入不會造成跳過或重複的資料列。
+
+        Args:
+            after: 上一頁最後一筆資料的排序鍵值，None 表示第一頁
+            limit: 取得的項目數
+            *where: 額外的篩選條件
+
+        Returns:
+            項目列表
+        """
+        statement = _page_after_statement(
+            self.model, self.keyset_columns, after, limit, where
+        )
+        return list(self.session.exec(statement).all())
+
+    def keyset_of(self, obj: T) -> List[Any]:
+        """
+        取得項目的排序鍵值，用於產生下一頁的游標
+
+        Args:
+            obj: 項目
+
+        Returns:
+            依 keyset_columns 順序排列的鍵值
+        """
+        return [getattr(obj, name) for name in self.keyset_columns]
+
+    def commit(self) -> None:
+        """commit 目前的交易；位於 unit_of_work 區塊內時交由區塊結束時 commit"""
+        if not in_unit_of_work(self.session):
+            self.session.commit()
 
     def create(self, obj_in: Any) -> T:
         """
-        建立新項目
+        建立新項目，以 INSERT ... RETURNING 取回寫入後的資料列，不需再 refresh
 
         Args:
             obj_in: 輸入的物件資料
@@ -61,41 +260,41 @@ class BaseRepository(Generic[T]):
             建立的項目
         """
         db_obj = self.model.model_validate(obj_in)
-        self.session.add(db_obj)
-        self.session.commit()
-        self.session.refresh(db_obj)
+        db_obj = self.session.execute(insert_returning(db_obj)).scalar_one()
+        self.commit()
         return db_obj
 
     def update(self, id: uuid.UUID, obj_in: Any) -> Optional[T]:
         """
-        更新項目
+        更新項目，以單一 UPDATE ... RETURNING 完成
 
         Args:
             id: 項目 ID
             obj_in: 更新的資料
 
         Returns:
-            更新後的項目
+            更新後的項目，項目不存在時為 None
         """
-        db_obj = self.get_by_id(id)
-        if not db_obj:
-            return None
-
-        update_data = obj_in
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
+        if not update_data:
+            return self.get_by_id(id)
 
-        db_obj.sqlmodel_update(update_data)
-        self.session.add(db_obj)
-        self.session.commit()
-        self.session.refresh(db_obj)
+        statement = update_returning(
+            self.model, [_id_column(self.model) == id], update_data
+        )
+        db_obj: Optional[T] = self.session.execute(statement).scalars().first()
+        if db_obj is not None:
+            self.commit()
         return db_obj
 
     def delete(self, id: uuid.UUID) -> Optional[T]:
         """
-        刪除項目
+        刪除項目，以單一 DELETE ... RETURNING 完成
+
+        關聯資料由資料庫的 ON DELETE CASCADE 處理。
 
         Args:
             id: 項目 ID
@@ -103,20 +302,488 @@ class BaseRepository(Generic[T]):
         Returns:
             被刪除的項目，或 None
         """
-        db_obj = self.get_by_id(id)
-        if not db_obj:
+        statement = (
+            delete(self.model).where(_id_column(self.model) == id).returning(self.model)
+        )
+        db_obj: Optional[T] = self.session.execute(statement).scalars().first()
+        if db_obj is None:
             return None
+        # 資料列已不存在，先脫離 session，避免 commit 後過期而無法讀取
+        self.session.expunge(db_obj)
+        self.commit()
+        return db_obj
+
+    def bulk_create(self, objs_in: Sequence[Any]) -> List[T]:
+        """
+        以多列 INSERT ... RETURNING 一次建立多個項目
+
+        Args:
+            objs_in: 輸入的物件資料列表
+
+        Returns:
+            建立的項目，順序與輸入相同
+        """
+        if not objs_in:
+            return []
+        rows = [self.model.model_validate(obj_in).model_dump() for obj_in in objs_in]
+        statement = _bulk_insert_statement(self.model)
+        db_objs = self.session.scalars(statement, rows).all()
+        self.commit()
+        return list(db_objs)
+
+    def bulk_update(self, objs_in: Sequence[Dict[str, Any]], *where: Any) -> List[T]:
+        """
+        依 ID 一次更新多個項目，更新欄位相同的資料列以 executemany 送出
+
+        Args:
+            objs_in: 更新資料列表，每筆需包含 id，其餘鍵為要更新的欄位
+            *where: 額外的 WHERE 條件，同時套用於 UPDATE 與之後的重新查詢
+
+        Returns:
+            更新後的項目，順序與輸入相同；不存在或不符合條件的 ID 不會出現在結果中
+        """
+        if not objs_in:
+            return []
+        for statement, rows in _bulk_update_batches(self.model, objs_in, where):
+            self.session.execute(statement, rows)
+        ids = [obj_in["id"] for obj_in in objs_in]
+        statement = _bulk_select_statement(self.model, ids, where)
+        db_objs = self.session.exec(statement).all()
+        self.commit()
+        return _in_input_order(db_objs, ids)
+
+    def bulk_delete(self, ids: Sequence[uuid.UUID], *where: Any) -> List[T]:
+        """
+        以單一 DELETE ... WHERE id = ANY(:ids) RETURNING 刪除多個項目
+
+        Args:
+            ids: 項目 ID 列表
+            *where: 額外的 WHERE 條件
+
+        Returns:
+            被刪除的項目，順序與輸入相同；不存在或不符合條件的 ID 不會出現在結果中
+        """
+        if not ids:
+            return []
+        statement = (
+            delete(self.model)
+            .where(id_in(self.model, ids), *where)
+            .returning(self.model)
+        )
+        db_objs = self.session.execute(statement).scalars().all()
+        for db_obj in db_objs:
+            self.session.expunge(db_obj)
+        self.commit()
+        return _in_input_order(db_objs, ids)
+
+    def stream_rows(
+        self, columns: Sequence[str], *where: Any, size: int = 1000
+    ) -> Iterator[Sequence[Any]]:
+        """
+        以伺服器端游標依 ID 順序分批讀取資料列，記憶體用量與總筆數無關
+
+        Args:
+            columns: 要讀取的欄位名稱
+            *where: 額外的篩選條件
+            size: 每批筆數
+
+        Yields:
+            一批資料列，值的順序與 columns 相同
+        """
+        statement = _stream_statement(self.model, columns, where, size)
+        yield from self.session.execute(statement).partitions()
+
+    def count(self, *where: Any) -> int:
+        """
+        計算總項目數，由資料庫端執行 COUNT(*)
+
+        Args:
+            *where: 額外的篩選條件
+
+        Returns:
+            項目總數
+        """
+        statement = select(func.count()).select_from(self.model).where(*where)
+        return self.session.exec(statement).one()
+
+    def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        *where: Any,
+        include_count: bool = True,
+        approximate: bool = False,
+    ) -> Tuple[List[T], Optional[int], bool]:
+        """
+        取得一頁項目與總數，只需一次資料庫往返
+
+        總數以 `COUNT(*) OVER ()` 視窗函式與分頁資料在同一個查詢中取得；
+        視窗函式在 OFFSET/LIMIT 之前計算，因此得到的是篩選後的完整筆數。
+
+        Args:
+            skip: 跳過的項目數
+            limit: 取得的項目數
+            *where: 額外的篩選條件
+            include_count: 是否計算總數
+            approximate: 沒有篩選條件時，是否允許在大型資料表上使用估計值
+
+        Returns:
+            (項目列表, 總數；include_count 為 False 時為 None, 總數是否為精確值)
+        """
+        statement = select(self.model).where(*where).offset(skip).limit(limit)
+        if not include_count:
+            return list(self.session.exec(statement).all()), None, True
+        if approximate and not where:
+            estimate = self.estimate_count()
+            if estimate is not None and estimate >= settings.APPROXIMATE_COUNT_MIN_ROWS:
+                return list(self.session.exec(statement).all()), estimate, False
+
+        total = func.count().over().label("total")
+        counted = select(self.model, total).where(*where).offset(skip).limit(limit)
+        rows = self.session.exec(counted).all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1], True
+        # 超出最後一頁時沒有資料列可以攜帶總數
+        return [], self.count(*where) if skip else 0, True
+
+    def estimate_count(self) -> Optional[int]:
+        """
+        從 PostgreSQL 規劃器統計資料 (pg_class.reltuples) 讀取估計的總項目數
+
+        Returns:
+            估計的項目總數；資料表尚未 ANALYZE 時為 None
+        """
+        table = f'"{self.model.__tablename__}"'
+        estimate = self.session.execute(_ESTIMATE_COUNT, {"table": table}).scalar()
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    def count_total(self, approximate: bool = False) -> Tuple[int, bool]:
+        """
+        計算總項目數，可選擇在大型資料表上改用估計值
+
+        只有當估計值達到 APPROXIMATE_COUNT_MIN_ROWS 時才會採用估計值，
+        小型資料表的精確計數本身就很便宜，而且估計值誤差較大。
+
+        Args:
+            approximate: 是否允許使用估計值
+
+        Returns:
+            (項目總數, 是否為精確值)
+        """
+        if approximate:
+            estimate = self.estimate_count()
+            if estimate is not None and estimate >= settings.APPROXIMATE_COUNT_MIN_ROWS:
+                return estimate, False
+        return self.count(), True
+
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    BaseRepository 的非同步版本，使用 AsyncSession
+
+    方法與 BaseRepository 一一對應，查詢語句相同，只是改為 await 資料庫往返，
+    讓 async 路由在等待資料庫時不佔用執行緒。
+    """
+
+    keyset_columns: Tuple[str, ...] = ("id",)
+
+    def __init__(self, session: AsyncSession, model: Type[T]):
+        """
+        初始化 Repository
+
+        Args:
+            session: 非同步資料庫會話
+            model: SQLModel 模型類別
+        """
+        self.session = session
+        self.model = model
+
+    async def get_by_id(self, id: uuid.UUID) -> Optional[T]:
+        """
+        透過 ID 取得單一項目，已在 session 中的項目直接回傳而不查詢資料庫
+
+        Args:
+            id: 項目 ID
 
-        self.session.delete(db_obj)
-        self.session.commit()
+        Returns:
+            找到的項目，或 None
+        """
+        return await self.session.get(self.model, id)
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
+        """
+        取得所有項目，支援分頁
+
+        Args:
+            skip: 跳過的項目數
+            limit: 取得的項目數
+
+        Returns:
+            項目列表
+        """
+        statement = select(self.model).offset(skip).limit(limit)
+        return list((await self.session.exec(statement)).all())
+
+    async def get_page_after(
+        self, after: Optional[Sequence[Any]] = None, limit: int = 100, *where: Any
+    ) -> List[T]:
+        """
+        以 keyset (游標) 方式分頁，參見 BaseRepository.get_page_after
+
+        Args:
+            after: 上一頁最後一筆資料的排序鍵值，None 表示第一頁
+            limit: 取得的項目數
+            *where: 額外的篩選條件
+
+        Returns:
+            項目列表
+        """
+        statement = _page_after_statement(
+            self.model, self.keyset_columns, after, limit, where
+        )
+        return list((await self.session.exec(statement)).all())
+
+    def keyset_of(self, obj: T) -> List[Any]:
+        """
+        取得項目的排序鍵值，用於產生下一頁的游標
+
+        Args:
+            obj: 項目
+
+        Returns:
+            依 keyset_columns 順序排列的鍵值
+        """
+        return [getattr(obj, name) for name in self.keyset_columns]
+
+    async def commit(self) -> None:
+        """commit 目前的交易；位於 async_unit_of_work 區塊內時交由區塊結束時 commit"""
+        if not in_unit_of_work(self.session):
+            await self.session.commit()
+
+    async def create(self, obj_in: Any) -> T:
+        """
+        建立新項目，以 INSERT ... RETURNING 取回寫入後的資料列
+
+        Args:
+            obj_in: 輸入的物件資料
+
+        Returns:
+            建立的項目
+        """
+        db_obj = self.model.model_validate(obj_in)
+        result = await self.session.execute(insert_returning(db_obj))
+        db_obj = result.scalar_one()
+        await self.commit()
         return db_obj
 
-    def count(self) -> int:
+    async def update(self, id: uuid.UUID, obj_in: Any) -> Optional[T]:
         """
-        計算總項目數
+        更新項目，以單一 UPDATE ... RETURNING 完成
+
+        Args:
+            id: 項目 ID
+            obj_in: 更新的資料
+
+        Returns:
+            更新後的項目，項目不存在時為 None
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.get_by_id(id)
+
+        statement = update_returning(
+            self.model, [_id_column(self.model) == id], update_data
+        )
+        db_obj: Optional[T] = (await self.session.execute(statement)).scalars().first()
+        if db_obj is not None:
+            await self.commit()
+        return db_obj
+
+    async def delete(self, id: uuid.UUID) -> Optional[T]:
+        """
+        刪除項目，以單一 DELETE ... RETURNING 完成
+
+        Args:
+            id: 項目 ID
+
+        Returns:
+            被刪除的項目，或 None
+        """
+        statement = (
+            delete(self.model).where(_id_column(self.model) == id).returning(self.model)
+        )
+        db_obj: Optional[T] = (await self.session.execute(statement)).scalars().first()
+        if db_obj is None:
+            return None
+        self.session.expunge(db_obj)
+        await self.commit()
+        return db_obj
+
+    async def bulk_create(self, objs_in: Sequence[Any]) -> List[T]:
+        """
+        以多列 INSERT ... RETURNING 一次建立多個項目
+
+        Args:
+            objs_in: 輸入的物件資料列表
+
+        Returns:
+            建立的項目，順序與輸入相同
+        """
+        if not objs_in:
+            return []
+        rows = [self.model.model_validate(obj_in).model_dump() for obj_in in objs_in]
+        statement = _bulk_insert_statement(self.model)
+        db_objs = (await self.session.scalars(statement, rows)).all()
+        await self.commit()
+        return list(db_objs)
+
+    async def bulk_update(
+        self, objs_in: Sequence[Dict[str, Any]], *where: Any
+    ) -> List[T]:
+        """
+        依 ID 一次更新多個項目，參見 BaseRepository.bulk_update
+
+        Args:
+            objs_in: 更新資料列表，每筆需包含 id，其餘鍵為要更新的欄位
+            *where: 額外的 WHERE 條件，同時套用於 UPDATE 與之後的重新查詢
+
+        Returns:
+            更新後的項目，順序與輸入相同；不存在或不符合條件的 ID 不會出現在結果中
+        """
+        if not objs_in:
+            return []
+        for statement, rows in _bulk_update_batches(self.model, objs_in, where):
+            await self.session.execute(statement, rows)
+        ids = [obj_in["id"] for obj_in in objs_in]
+        statement = _bulk_select_statement(self.model, ids, where)
+        db_objs = (await self.session.exec(statement)).all()
+        await self.commit()
+        return _in_input_order(db_objs, ids)
+
+    async def bulk_delete(self, ids: Sequence[uuid.UUID], *where: Any) -> List[T]:
+        """
+        以單一 DELETE ... WHERE id = ANY(:ids) RETURNING 刪除多個項目
+
+        Args:
+            ids: 項目 ID 列表
+            *where: 額外的 WHERE 條件
+
+        Returns:
+            被刪除的項目，順序與輸入相同；不存在或不符合條件的 ID 不會出現在結果中
+        """
+        if not ids:
+            return []
+        statement = (
+            delete(self.model)
+            .where(id_in(self.model, ids), *where)
+            .returning(self.model)
+        )
+        db_objs = (await self.session.execute(statement)).scalars().all()
+        for db_obj in db_objs:
+            self.session.expunge(db_obj)
+        await self.commit()
+        return _in_input_order(db_objs, ids)
+
+    async def stream_rows(
+        self, columns: Sequence[str], *where: Any, size: int = 1000
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        以伺服器端游標依 ID 順序分批讀取資料列，參見 BaseRepository.stream_rows
+
+        Args:
+            columns: 要讀取的欄位名稱
+            *where: 額外的篩選條件
+            size: 每批筆數
+
+        Yields:
+            一批資料列，值的順序與 columns 相同
+        """
+        statement = _stream_statement(self.model, columns, where, size)
+        result = await self.session.stream(statement)
+        async for rows in result.partitions():
+            yield rows
+
+    async def count(self, *where: Any) -> int:
+        """
+        計算總項目數，由資料庫端執行 COUNT(*)
+
+        Args:
+            *where: 額外的篩選條件
 
         Returns:
             項目總數
         """
-        statement = select(self.model)
-        return len(self.session.exec(statement).all())
+        statement = select(func.count()).select_from(self.model).where(*where)
+        return (await self.session.exec(statement)).one()
+
+    async def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        *where: Any,
+        include_count: bool = True,
+        approximate: bool = False,
+    ) -> Tuple[List[T], Optional[int], bool]:
+        """
+        取得一頁項目與總數，參見 BaseRepository.get_page
+
+        Args:
+            skip: 跳過的項目數
+            limit: 取得的項目數
+            *where: 額外的篩選條件
+            include_count: 是否計算總數
+            approximate: 沒有篩選條件時，是否允許在大型資料表上使用估計值
+
+        Returns:
+            (項目列表, 總數；include_count 為 False 時為 None, 總數是否為精確值)
+        """
+        statement = select(self.model).where(*where).offset(skip).limit(limit)
+        if not include_count:
+            return list((await self.session.exec(statement)).all()), None, True
+        if approximate and not where:
+            estimate = await self.estimate_count()
+            if estimate is not None and estimate >= settings.APPROXIMATE_COUNT_MIN_ROWS:
+                return list((await self.session.exec(statement)).all()), estimate, False
+
+        total = func.count().over().label("total")
+        counted = select(self.model, total).where(*where).offset(skip).limit(limit)
+        rows = (await self.session.exec(counted)).all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1], True
+        # 超出最後一頁時沒有資料列可以攜帶總數
+        return [], await self.count(*where) if skip else 0, True
+
+    async def estimate_count(self) -> Optional[int]:
+        """
+        從 PostgreSQL 規劃器統計資料 (pg_class.reltuples) 讀取估計的總項目數
+
+        Returns:
+            估計的項目總數；資料表尚未 ANALYZE 時為 None
+        """
+        table = f'"{self.model.__tablename__}"'
+        result = await self.session.execute(_ESTIMATE_COUNT, {"table": table})
+        estimate = result.scalar()
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    async def count_total(self, approximate: bool = False) -> Tuple[int, bool]:
+        """
+        計算總項目數，可選擇在大型資料表上改用估計值
+
+        Args:
+            approximate: 是否允許使用估計值
+
+        Returns:
+            (項目總數, 是否為精確值)
+        """
+        if approximate:
+            estimate = await self.estimate_count()
+            if estimate is not None and estimate >= settings.APPROXIMATE_COUNT_MIN_ROWS:
+                return estimate, False
+        return await self.count(), True
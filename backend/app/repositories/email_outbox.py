@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import and_, func, or_, update
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import EmailOutbox
+from app.repositories.base import (
+    AsyncBaseRepository,
+    BaseRepository,
+    update_returning,
+)
+
+
+class EmailOutboxRepository(BaseRepository[EmailOutbox]):
+    """
+    郵件寄件匣資料存取層，提供郵件的排入、領取與結果記錄
+    """
+
+    def __init__(self, session: Session):
+        """
+        初始化郵件寄件匣 Repository
+
+        Args:
+            session: 資料庫會話
+        """
+        super().__init__(session, EmailOutbox)
+
+    def enqueue(self, email_to: str, subject: str, html_content: str) -> EmailOutbox:
+        """
+        排入一封待寄送的郵件
+
+        Args:
+            email_to: 收件者
+            subject: 主旨
+            html_content: HTML 內容
+
+        Returns:
+            排入的郵件
+        """
+        return self.create(
+            EmailOutbox(email_to=email_to, subject=subject, html_content=html_content)
+        )
+
+    def claim(self, limit: int, lease_seconds: float) -> list[EmailOutbox]:
+        """
+        領取一批到期的郵件，並在 lease_seconds 秒內歸目前的 worker 所有
+
+        以 FOR UPDATE SKIP LOCKED 選取，其他 worker 同時領取時會略過已鎖定的列，
+        多個 worker 可平行處理而不會重複寄送。租約逾期的 sending 列視為前一個
+        worker 已中止，重新領取。領取後立即 commit，寄送期間不持有資料列鎖。
+
+        Args:
+            limit: 最多領取的筆數
+            lease_seconds: 租約秒數
+
+        Returns:
+            領取的郵件，attempts 已包含本次嘗試
+        """
+        now = func.now()
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                or_(
+                    and_(
+                        col(EmailOutbox.status) == "pending",
+                        col(EmailOutbox.next_attempt_at) <= now,
+                    ),
+                    and_(
+                        col(EmailOutbox.status) == "sending",
+                        col(EmailOutbox.locked_until) < now,
+                    ),
+                )
+            )
+            .order_by(col(EmailOutbox.next_attempt_at))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            # 子查詢可能被規劃器重複執行，每次 SKIP LOCKED 略過的列不同而領取超過
+            # limit 筆；MATERIALIZED 確保只選取一次
+            .cte("due")
+            .prefix_with("MATERIALIZED")
+        )
+        statement = (
+            update(EmailOutbox)
+            .where(col(EmailOutbox.id).in_(select(due.c.id)))
+            .values(
+                status="sending",
+                attempts=EmailOutbox.attempts + 1,
+                locked_until=now + timedelta(seconds=lease_seconds),
+            )
+            .returning(EmailOutbox)
+            .execution_options(populate_existing=True)
+        )
+        claimed = self.session.execute(statement).scalars().all()
+        self.commit()
+        # RETURNING 不保證順序，依到期時間寄送
+        return sorted(claimed, key=lambda email: email.next_attempt_at)
+
+    def _leased(self, email: EmailOutbox) -> list[Any]:
+        # 只有仍持有領取時租約的 worker 能更新郵件；租約逾期後被其他 worker
+        # 重新領取時 locked_until 已改變
+        return [
+            col(EmailOutbox.id) == email.id,
+            col(EmailOutbox.status) == "sending",
+            col(EmailOutbox.locked_until) == email.locked_until,
+        ]
+
+    def _update_leased(self, email: EmailOutbox, values: dict[str, Any]) -> bool:
+        updated = self.session.execute(
+            update_returning(EmailOutbox, self._leased(email), values)
+        ).first()
+        self.commit()
+        return updated is not None
+
+    def renew(self, email: EmailOutbox, lease_seconds: float) -> bool:
+        """
+        將租約延長為從現在起 lease_seconds 秒
+
+        一批郵件依序寄送，總時間可能超過租約；每封寄送前延長，
+        其他 worker 就不會重新領取仍在寄送中的郵件。
+
+        Args:
+            email: 領取的郵件，locked_until 會更新為新的租約
+            lease_seconds: 租約秒數
+
+        Returns:
+            租約已被其他 worker 接手時為 False
+        """
+        return self._update_leased(
+            email, {"locked_until": func.now() + timedelta(seconds=lease_seconds)}
+        )
+
+    def mark_sent(self, email: EmailOutbox) -> bool:
+        """
+        記錄郵件已寄出
+
+        Args:
+            email: 領取的郵件
+
+        Returns:
+            租約已被其他 worker 接手、未更新時為 False
+        """
+        return self._update_leased(
+            email,
+            {
+                "status": "sent",
+                "sent_at": datetime.now(timezone.utc),
+                "locked_until": None,
+                "last_error": None,
+            },
+        )
+
+    def mark_failed(
+        self, email: EmailOutbox, error: str, retry_at: datetime | None
+    ) -> bool:
+        """
+        記錄寄送失敗
+
+        Args:
+            email: 領取的郵件
+            error: 錯誤訊息
+            retry_at: 下次嘗試的時間，None 表示不再重試，郵件移入 dead 狀態
+
+        Returns:
+            租約已被其他 worker 接手、未更新時為 False
+        """
+        values: dict[str, Any] = {"locked_until": None, "last_error": error}
+        if retry_at is None:
+            values["status"] = "dead"
+        else:
+            values["status"] = "pending"
+            values["next_attempt_at"] = retry_at
+        return self._update_leased(email, values)
+
+    def count_by_status(self) -> dict[str, int]:
+        """
+        依狀態統計郵件數量
+
+        Returns:
+            狀態與數量
+        """
+        statement = select(EmailOutbox.status, func.count()).group_by(
+            EmailOutbox.status
+        )
+        return dict(self.session.exec(statement).all())
+
+
+class AsyncEmailOutboxRepository(AsyncBaseRepository[EmailOutbox]):
+    """
+    EmailOutboxRepository 的非同步版本，供 async 路由排入郵件
+
+    領取與記錄結果只由背景 worker 執行，因此只提供 enqueue。
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        初始化郵件寄件匣 Repository
+
+        Args:
+            session: 非同步資料庫會話
+        """
+        super().__init__(session, EmailOutbox)
+
+    async def enqueue(
+        self, email_to: str, subject: str, html_content: str
+    ) -> EmailOutbox:
+        """
+        排入一封待寄送的郵件
+
+        Args:
+            email_to: 收件者
+            subject: 主旨
+            html_content: HTML 內容
+
+        Returns:
+            排入的郵件
+        """
+        return await self.create(
+            EmailOutbox(email_to=email_to, subject=subject, html_content=html_content)
+        )
@@ -1,12 +1,46 @@
 import uuid
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 
-from sqlmodel import Session, select
+from sqlalchemy import CursorResult, delete
+from sqlmodel import Session, col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.repositories.base import BaseRepository
+from app.repositories.base import (
+    AsyncBaseRepository,
+    BaseRepository,
+    id_in,
+    update_returning,
+)
 from app.models import Item
 
 
+def _owned_by(id: uuid.UUID, owner_id: Optional[uuid.UUID]) -> List[Any]:
+    where = [Item.id == id]
+    if owner_id is not None:
+        where.append(Item.owner_id == owner_id)
+    return where
+
+
+def _update_owned_statement(
+    id: uuid.UUID, obj_in: Dict[str, Any], owner_id: Optional[uuid.UUID]
+) -> Any:
+    where = _owned_by(id, owner_id)
+    if not obj_in:
+        # 沒有要更新的欄位時，只需以相同條件讀取
+        return select(Item).where(*where)
+    return update_returning(Item, where, obj_in)
+
+
+def _delete_owned_statement(id: uuid.UUID, owner_id: Optional[uuid.UUID]) -> Any:
+    return delete(Item).where(*_owned_by(id, owner_id)).returning(Item)
+
+
+def _delete_by_owner_statement(owner_id: uuid.UUID, limit: int) -> Any:
+    # 依 (owner_id, id) 索引取出一批 id，讓每個交易只鎖定有限的資料列
+    ids = select(Item.id).where(Item.owner_id == owner_id).limit(limit)
+    return delete(Item).where(col(Item.id).in_(ids.scalar_subquery()))
+
+
 class ItemRepository(BaseRepository[Item]):
     """
     物品資料存取層，提供物品資料的存取操作
@@ -38,9 +72,28 @@ class ItemRepository(BaseRepository[Item]):
         statement = (
             select(Item).where(Item.owner_id == owner_id).offset(skip).limit(limit)
         )
-        return self.session.exec(statement).all()
+        return list(self.session.exec(statement).all())
+
+    def get_multi_by_owner_after(
+        self,
+        owner_id: uuid.UUID,
+        after: Optional[Sequence[Any]] = None,
+        limit: int = 100,
+    ) -> List[Item]:
+        """
+        以 keyset 方式取得特定用戶的物品，使用 (owner_id, id) 索引
+
+        Args:
+            owner_id: 擁有者 ID
+            after: 上一頁最後一筆資料的排序鍵值，None 表示第一頁
+            limit: 取得的項目數
 
-    def create_with_owner(self, obj_in: dict, owner_id: uuid.UUID) -> Item:
+        Returns:
+            該用戶擁有的物品列表
+        """
+        return self.get_page_after(after, limit, Item.owner_id == owner_id)
+
+    def create_with_owner(self, obj_in: Dict[str, Any], owner_id: uuid.UUID) -> Item:
         """
         建立新物品，指定擁有者
 
@@ -53,12 +106,7 @@ class ItemRepository(BaseRepository[Item]):
         """
         data = obj_in.copy()
         data["owner_id"] = owner_id
-
-        db_obj = Item(**data)
-        self.session.add(db_obj)
-        self.session.commit()
-        self.session.refresh(db_obj)
-        return db_obj
+        return self.create(data)
 
     def count_by_owner(self, owner_id: uuid.UUID) -> int:
         """
@@ -70,5 +118,274 @@ class ItemRepository(BaseRepository[Item]):
         Returns:
             該用戶擁有的物品數量
         """
-        statement = select(Item).where(Item.owner_id == owner_id)
-        return len(self.session.exec(statement).all())
+        statement = (
+            select(func.count()).select_from(Item).where(Item.owner_id == owner_id)
+        )
+        return self.session.exec(statement).one()
+
+    def delete_by_owner(self, owner_id: uuid.UUID, limit: int) -> int:
+        """
+        刪除特定用戶的一批物品，供分批刪除大量物品時使用
+
+        Args:
+            owner_id: 擁有者 ID
+            limit: 最多刪除的筆數
+
+        Returns:
+            實際刪除的筆數，小於 limit 表示已全部刪除
+        """
+        result = self.session.execute(_delete_by_owner_statement(owner_id, limit))
+        return cast(CursorResult[Any], result).rowcount
+
+    def exists(self, id: uuid.UUID) -> bool:
+        """
+        檢查物品是否存在
+
+        Args:
+            id: 物品 ID
+
+        Returns:
+            是否存在
+        """
+        statement = select(Item.id).where(Item.id == id)
+        return self.session.exec(statement).first() is not None
+
+    def get_owner_ids(self, ids: Sequence[uuid.UUID]) -> Dict[uuid.UUID, uuid.UUID]:
+        """
+        以單一查詢取得多個物品的擁有者
+
+        Args:
+            ids: 物品 ID 列表
+
+        Returns:
+            物品 ID 對應擁有者 ID 的字典，不存在的物品不會出現
+        """
+        if not ids:
+            return {}
+        statement = select(Item.id, Item.owner_id).where(id_in(Item, ids))
+        return dict(self.session.exec(statement).all())
+
+    def update_owned(
+        self,
+        id: uuid.UUID,
+        obj_in: Dict[str, Any],
+        owner_id: Optional[uuid.UUID] = None,
+    ) -> Tuple[Optional[Item], bool]:
+        """
+        以單一 UPDATE ... RETURNING 更新物品，擁有權檢查放在 WHERE 條件中
+
+        只有在沒有更新到任何資料列時，才會再查詢一次以區分物品不存在與無權限。
+
+        Args:
+            id: 物品 ID
+            obj_in: 要更新的欄位
+            owner_id: 只允許更新此用戶的物品，None 表示不限制（超級用戶）
+
+        Returns:
+            (更新後的物品；沒有更新時為 None, 物品是否存在)
+        """
+        statement = _update_owned_statement(id, obj_in, owner_id)
+        item = self.session.execute(statement).scalars().first()
+        if item is None:
+            return None, self.exists(id)
+        self.commit()
+        return item, True
+
+    def delete_owned(
+        self, id: uuid.UUID, owner_id: Optional[uuid.UUID] = None
+    ) -> Tuple[Optional[Item], bool]:
+        """
+        以單一 DELETE ... RETURNING 刪除物品，擁有權檢查放在 WHERE 條件中
+
+        Args:
+            id: 物品 ID
+            owner_id: 只允許刪除此用戶的物品，None 表示不限制（超級用戶）
+
+        Returns:
+            (被刪除的物品；沒有刪除時為 None, 物品是否存在)
+        """
+        item = (
+            self.session.execute(_delete_owned_statement(id, owner_id))
+            .scalars()
+            .first()
+        )
+        if item is None:
+            return None, self.exists(id)
+        # 資料列已不存在，先脫離 session，避免 commit 後過期而無法讀取
+        self.session.expunge(item)
+        self.commit()
+        return item, True
+
+
+class AsyncItemRepository(AsyncBaseRepository[Item]):
+    """
+    ItemRepository 的非同步版本
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        初始化物品 Repository
+
+        Args:
+            session: 非同步資料庫會話
+        """
+        super().__init__(session, Item)
+
+    async def get_multi_by_owner(
+        self, owner_id: uuid.UUID, skip: int = 0, limit: int = 100
+    ) -> List[Item]:
+        """
+        取得特定用戶的所有物品
+
+        Args:
+            owner_id: 擁有者 ID
+            skip: 跳過的項目數
+            limit: 取得的項目數
+
+        Returns:
+            該用戶擁有的物品列表
+        """
+        statement = (
+            select(Item).where(Item.owner_id == owner_id).offset(skip).limit(limit)
+        )
+        return list((await self.session.exec(statement)).all())
+
+    async def get_multi_by_owner_after(
+        self,
+        owner_id: uuid.UUID,
+        after: Optional[Sequence[Any]] = None,
+        limit: int = 100,
+    ) -> List[Item]:
+        """
+        以 keyset 方式取得特定用戶的物品，使用 (owner_id, id) 索引
+
+        Args:
+            owner_id: 擁有者 ID
+            after: 上一頁最後一筆資料的排序鍵值，None 表示第一頁
+            limit: 取得的項目數
+
+        Returns:
+            該用戶擁有的物品列表
+        """
+        return await self.get_page_after(after, limit, Item.owner_id == owner_id)
+
+    async def create_with_owner(
+        self, obj_in: Dict[str, Any], owner_id: uuid.UUID
+    ) -> Item:
+        """
+        建立新物品，指定擁有者
+
+        Args:
+            obj_in: 物品資料
+            owner_id: 擁有者 ID
+
+        Returns:
+            建立的物品
+        """
+        data = obj_in.copy()
+        data["owner_id"] = owner_id
+        return await self.create(data)
+
+    async def count_by_owner(self, owner_id: uuid.UUID) -> int:
+        """
+        計算特定用戶擁有的物品數量
+
+        Args:
+            owner_id: 擁有者 ID
+
+        Returns:
+            該用戶擁有的物品數量
+        """
+        statement = (
+            select(func.count()).select_from(Item).where(Item.owner_id == owner_id)
+        )
+        return (await self.session.exec(statement)).one()
+
+    async def delete_by_owner(self, owner_id: uuid.UUID, limit: int) -> int:
+        """
+        刪除特定用戶的一批物品，供分批刪除大量物品時使用
+
+        Args:
+            owner_id: 擁有者 ID
+            limit: 最多刪除的筆數
+
+        Returns:
+            實際刪除的筆數，小於 limit 表示已全部刪除
+        """
+        result = await self.session.execute(_delete_by_owner_statement(owner_id, limit))
+        return cast(CursorResult[Any], result).rowcount
+
+    async def exists(self, id: uuid.UUID) -> bool:
+        """
+        檢查物品是否存在
+
+        Args:
+            id: 物品 ID
+
+        Returns:
+            是否存在
+        """
+        statement = select(Item.id).where(Item.id == id)
+        return (await self.session.exec(statement)).first() is not None
+
+    async def get_owner_ids(
+        self, ids: Sequence[uuid.UUID]
+    ) -> Dict[uuid.UUID, uuid.UUID]:
+        """
+        以單一查詢取得多個物品的擁有者
+
+        Args:
+            ids: 物品 ID 列表
+
+        Returns:
+            物品 ID 對應擁有者 ID 的字典，不存在的物品不會出現
+        """
+        if not ids:
+            return {}
+        statement = select(Item.id, Item.owner_id).where(id_in(Item, ids))
+        return dict((await self.session.exec(statement)).all())
+
+    async def update_owned(
+        self,
+        id: uuid.UUID,
+        obj_in: Dict[str, Any],
+        owner_id: Optional[uuid.UUID] = None,
+    ) -> Tuple[Optional[Item], bool]:
+        """
+        以單一 UPDATE ... RETURNING 更新物品，參見 ItemRepository.update_owned
+
+        Args:
+            id: 物品 ID
+            obj_in: 要更新的欄位
+            owner_id: 只允許更新此用戶的物品，None 表示不限制（超級用戶）
+
+        Returns:
+            (更新後的物品；沒有更新時為 None, 物品是否存在)
+        """
+        statement = _update_owned_statement(id, obj_in, owner_id)
+        item = (await self.session.execute(statement)).scalars().first()
+        if item is None:
+            return None, await self.exists(id)
+        await self.commit()
+        return item, True
+
+    async def delete_owned(
+        self, id: uuid.UUID, owner_id: Optional[uuid.UUID] = None
+    ) -> Tuple[Optional[Item], bool]:
+        """
+        以單一 DELETE ... RETURNING 刪除物品，參見 ItemRepository.delete_owned
+
+        Args:
+            id: 物品 ID
+            owner_id: 只允許刪除此用戶的物品，None 表示不限制（超級用戶）
+
+        Returns:
+            (被刪除的物品；沒有刪除時為 None, 物品是否存在)
+        """
+        result = await self.session.execute(_delete_owned_statement(id, owner_id))
+        item = result.scalars().first()
+        if item is None:
+            return None, await self.exists(id)
+        self.session.expunge(item)
+        await self.commit()
+        return item, True
@@ -0,0 +1,74 @@
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work(session: Session | AsyncSession) -> bool:
+    """
+    檢查 session 是否位於 unit_of_work 區塊內
+
+    Args:
+        session: 同步或非同步資料庫會話
+
+    Returns:
+        是否由外層負責 commit
+    """
+    depth: int = session.info.get(_DEPTH_KEY, 0)
+    return depth > 0
+
+
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    """
+    將多個 repository 寫入合併為一個交易
+
+    區塊內的 repository 方法不會各自 commit，最外層區塊正常結束時 commit 一次，
+    發生例外則 rollback；巢狀使用時只有最外層會 commit。
+
+    Args:
+        session: 資料庫會話
+
+    Yields:
+        同一個 session
+    """
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            session.commit()
+    except BaseException:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+
+
+@asynccontextmanager
+async def async_unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    unit_of_work 的非同步版本
+
+    Args:
+        session: 非同步資料庫會話
+
+    Yields:
+        同一個 session
+    """
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            await session.commit()
+    except BaseException:
+        if depth == 0:
+            await session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
@@ -1,10 +1,21 @@
 import uuid
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from sqlmodel import Session, select
-from app.core.security import get_password_hash, verify_password
-
-from app.repositories.base import BaseRepository
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.security import (
+    get_password_hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
+
+from app.repositories.base import (
+    AsyncBaseRepository,
+    BaseRepository,
+    insert_returning,
+    update_returning,
+)
 from app.models import User
 
 
@@ -13,6 +24,8 @@ class UserRepository(BaseRepository[User]):
     用戶資料存取層，提供用戶資料的存取操作
     """
 
+    keyset_columns = ("email", "id")
+
     def __init__(self, session: Session):
         """
         初始化用戶 Repository
@@ -35,7 +48,7 @@ class UserRepository(BaseRepository[User]):
         statement = select(User).where(User.email == email)
         return self.session.exec(statement).first()
 
-    def create_with_password(self, obj_in: dict) -> User:
+    def create_with_password(self, obj_in: Dict[str, Any]) -> User:
         """
         建立新用戶，包含密碼雜湊處理
 
@@ -51,38 +64,35 @@ class UserRepository(BaseRepository[User]):
         else:
             hashed_password = ""
 
-        db_obj = User(**obj_in, hashed_password=hashed_password)
-        self.session.add(db_obj)
-        self.session.commit()
-        self.session.refresh(db_obj)
+        user = User(**obj_in, hashed_password=hashed_password)
+        db_obj: User = self.session.execute(insert_returning(user)).scalar_one()
+        self.commit()
         return db_obj
 
-    def update_with_password(self, id: uuid.UUID, obj_in: dict) -> Optional[User]:
+    def update_with_password(
+        self, id: uuid.UUID, obj_in: Dict[str, Any]
+    ) -> Optional[User]:
         """
-        更新用戶資料，包含密碼更新處理
+        更新用戶資料，包含密碼更新處理，以單一 UPDATE ... RETURNING 完成
 
         Args:
             id: 用戶 ID
             obj_in: 更新的用戶資料
 
         Returns:
-            更新後的用戶
+            更新後的用戶，用戶不存在時為 None
         """
-        db_obj = self.get_by_id(id)
-        if not db_obj:
-            return None
-
         update_data = obj_in.copy()
         if "password" in update_data:
             hashed_password = get_password_hash(update_data.pop("password"))
             update_data["hashed_password"] = hashed_password
+        if not update_data:
+            return self.get_by_id(id)
 
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-
-        self.session.add(db_obj)
-        self.session.commit()
-        self.session.refresh(db_obj)
+        statement = update_returning(User, [User.id == id], update_data)
+        db_obj = self.session.execute(statement).scalars().first()
+        if db_obj is not None:
+            self.commit()
         return db_obj
 
     def authenticate(self, email: str, password: str) -> Optional[User]:
@@ -126,3 +136,99 @@ class UserRepository(BaseRepository[User]):
             是否為超級用戶
         """
         return user.is_superuser
+
+
+class AsyncUserRepository(AsyncBaseRepository[User]):
+    """
+    UserRepository 的非同步版本，密碼雜湊在雜湊執行器中執行，不阻塞事件迴圈
+    """
+
+    keyset_columns = ("email", "id")
+
+    def __init__(self, session: AsyncSession):
+        """
+        初始化用戶 Repository
+
+        Args:
+            session: 非同步資料庫會話
+        """
+        super().__init__(session, User)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """
+        透過電子郵件取得用戶
+
+        Args:
+            email: 用戶電子郵件
+
+        Returns:
+            找到的用戶，或 None
+        """
+        statement = select(User).where(User.email == email)
+        return (await self.session.exec(statement)).first()
+
+    async def create_with_password(self, obj_in: Dict[str, Any]) -> User:
+        """
+        建立新用戶，包含密碼雜湊處理
+
+        Args:
+            obj_in: 用戶資料，包含明文密碼
+
+        Returns:
+            建立的用戶
+        """
+        password = obj_in.pop("password", None)
+        if password:
+            hashed_password = await get_password_hash_async(password)
+        else:
+            hashed_password = ""
+
+        user = User(**obj_in, hashed_password=hashed_password)
+        result = await self.session.execute(insert_returning(user))
+        db_obj: User = result.scalar_one()
+        await self.commit()
+        return db_obj
+
+    async def update_with_password(
+        self, id: uuid.UUID, obj_in: Dict[str, Any]
+    ) -> Optional[User]:
+        """
+        更新用戶資料，包含密碼更新處理，以單一 UPDATE ... RETURNING 完成
+
+        Args:
+            id: 用戶 ID
+            obj_in: 更新的用戶資料
+
+        Returns:
+            更新後的用戶，用戶不存在時為 None
+        """
+        update_data = obj_in.copy()
+        if "password" in update_data:
+            hashed_password = await get_password_hash_async(update_data.pop("password"))
+            update_data["hashed_password"] = hashed_password
+        if not update_data:
+            return await self.get_by_id(id)
+
+        statement = update_returning(User, [User.id == id], update_data)
+        db_obj = (await self.session.execute(statement)).scalars().first()
+        if db_obj is not None:
+            await self.commit()
+        return db_obj
+
+    async def authenticate(self, email: str, password: str) -> Optional[User]:
+        """
+        驗證用戶資料
+
+        Args:
+            email: 用戶電子郵件
+            password: 用戶密碼
+
+        Returns:
+            驗證成功的用戶，或 None
+        """
+        user = await self.get_by_email(email)
+        if not user:
+            return None
+        if not await verify_password_async(password, user.hashed_password):
+            return None
+        return user
@@ -1,4 +1,6 @@
+from app.schemas.analytics import AnalyticsPublic
 from app.schemas.common import (
+    BackgroundJob,
     IDModel,
     Message,
     NewPassword,
@@ -7,10 +9,12 @@ from app.schemas.common import (
     Token,
     TokenPayload,
 )
+from app.schemas.email import EmailBroadcast, EmailBroadcastCreate
 from app.schemas.user import (
     UpdatePassword,
     UserBase,
     UserCreate,
+    UserDeletionJob,
     UserPublic,
     UserRegister,
     UserUpdate,
@@ -19,15 +23,27 @@ from app.schemas.user import (
 )
 from app.schemas.item import (
     ItemBase,
+    ItemBatch,
+    ItemBatchCreate,
+    ItemBatchDelete,
+    ItemBatchOperation,
+    ItemBatchResult,
+    ItemBatchResults,
+    ItemBatchUpdate,
     ItemCreate,
     ItemDetail,
+    ItemImportError,
+    ItemImportReport,
     ItemPublic,
     ItemsPublic,
     ItemUpdate,
 )
 
 __all__ = [
+    # Analytics schemas
+    "AnalyticsPublic",
     # Common schemas
+    "BackgroundJob",
     "IDModel",
     "Message",
     "NewPassword",
@@ -35,10 +51,14 @@ __all__ = [
     "PaginationParams",
     "Token",
     "TokenPayload",
+    # Email schemas
+    "EmailBroadcast",
+    "EmailBroadcastCreate",
     # User schemas
     "UpdatePassword",
     "UserBase",
     "UserCreate",
+    "UserDeletionJob",
     "UserPublic",
     "UserRegister",
     "UserUpdate",
@@ -46,8 +66,17 @@ __all__ = [
     "UsersPublic",
     # Item schemas
     "ItemBase",
+    "ItemBatch",
+    "ItemBatchCreate",
+    "ItemBatchDelete",
+    "ItemBatchOperation",
+    "ItemBatchResult",
+    "ItemBatchResults",
+    "ItemBatchUpdate",
     "ItemCreate",
     "ItemDetail",
+    "ItemImportError",
+    "ItemImportReport",
     "ItemPublic",
     "ItemsPublic",
     "ItemUpdate",
@@ -0,0 +1,12 @@
+from typing import Any
+
+from sqlmodel import SQLModel
+
+
+# 管理用分析報表
+class AnalyticsPublic(SQLModel):
+    """分析報表回應模型"""
+
+    report: str
+    # 每列一個物件，欄位依報表而定
+    rows: list[dict[str, Any]]
@@ -1,5 +1,6 @@
 import uuid
-from typing import Generic, TypeVar
+from datetime import datetime
+from typing import Generic, Literal, TypeVar
 
 from sqlmodel import SQLModel, Field
 
@@ -30,9 +31,29 @@ class PaginatedResponse(SQLModel, Generic[T]):
     """分頁回應模型"""
 
     data: list[T]
-    count: int
+    # 請求 include_count=false 時不計算總數，此時為 None
+    count: int | None
     skip: int
     limit: int
+    # count 為 False 時代表取自資料庫統計資料的估計值
+    count_exact: bool = True
+    # 游標分頁時的下一頁游標，沒有下一頁時為 None
+    next_cursor: str | None = None
+
+
+class BackgroundJob(SQLModel):
+    """在請求結束後執行的背景工作進度，由 JobRegistry 保存"""
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    status: Literal["pending", "running", "completed", "failed"] = "pending"
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    @property
+    def active(self) -> bool:
+        """工作尚未結束"""
+        return self.status in ("pending", "running")
 
 
 class Token(SQLModel):
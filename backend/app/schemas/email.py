@@ -0,0 +1,20 @@
+from sqlmodel import Field, SQLModel
+
+from app.schemas.common import BackgroundJob
+
+
+# 群發郵件請求
+class EmailBroadcastCreate(SQLModel):
+    subject: str = Field(min_length=1, max_length=255)
+    # 純文字內容，以 HTML 跳脫後放入範本，換行會保留
+    message: str = Field(min_length=1, max_length=10_000)
+
+
+class EmailBroadcast(BackgroundJob):
+    """寄給所有啟用中用戶的群發郵件進度"""
+
+    subject: str
+    # 開始時啟用中的用戶數量
+    total_recipients: int = 0
+    sent: int = 0
+    failed: int = 0
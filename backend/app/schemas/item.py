@@ -1,4 +1,5 @@
 import uuid
+from typing import Annotated, Literal
 
 from sqlmodel import SQLModel, Field
 
@@ -47,3 +48,74 @@ class ItemsPublic(PaginatedResponse[ItemPublic]):
     """物品列表回應模型"""
 
     pass
+
+
+# 批次操作請求 - 以 op 欄位區分操作類型
+class ItemBatchCreate(SQLModel):
+    """批次建立物品操作"""
+
+    op: Literal["create"]
+    item: ItemCreate
+
+
+class ItemBatchUpdate(SQLModel):
+    """批次更新物品操作"""
+
+    op: Literal["update"]
+    id: uuid.UUID
+    item: ItemUpdate
+
+
+class ItemBatchDelete(SQLModel):
+    """批次刪除物品操作"""
+
+    op: Literal["delete"]
+    id: uuid.UUID
+
+
+ItemBatchOperation = Annotated[
+    ItemBatchCreate | ItemBatchUpdate | ItemBatchDelete, Field(discriminator="op")
+]
+
+
+class ItemBatch(SQLModel):
+    """物品批次操作請求模型"""
+
+    operations: list[ItemBatchOperation] = Field(min_length=1)
+
+
+# 批次操作回應 - 每個操作一筆結果，順序與請求相同
+class ItemBatchResult(SQLModel):
+    """單一批次操作結果模型"""
+
+    # 與對應的單筆路由相同的 HTTP 狀態碼
+    status: int
+    detail: str | None = None
+    item: ItemPublic | None = None
+
+
+class ItemBatchResults(SQLModel):
+    """物品批次操作回應模型"""
+
+    results: list[ItemBatchResult]
+
+
+# 大量匯入結果
+class ItemImportError(SQLModel):
+    """匯入失敗的資料列"""
+
+    # 在上傳檔案中的行號，從 1 開始
+    line: int
+    error: str
+
+
+class ItemImportReport(SQLModel):
+    """物品匯入結果模型"""
+
+    rows: int
+    imported: int
+    failed: int
+    seconds: float
+    rows_per_second: float
+    # 只保留前 ITEM_IMPORT_MAX_REPORTED_ERRORS 筆錯誤，總數見 failed
+    errors: list[ItemImportError] = Field(default_factory=list)
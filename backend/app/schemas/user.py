@@ -1,7 +1,9 @@
+import uuid
+
 from pydantic import EmailStr
 from sqlmodel import SQLModel, Field
 
-from app.schemas.common import IDModel, PaginatedResponse
+from app.schemas.common import BackgroundJob, IDModel, PaginatedResponse
 
 
 # 共用基礎用戶屬性
@@ -53,3 +55,13 @@ class UserPublic(UserBase, IDModel):
 # 用戶分頁回應
 class UsersPublic(PaginatedResponse[UserPublic]):
     pass
+
+
+# 分批刪除用戶的背景工作
+class UserDeletionJob(BackgroundJob):
+    """用戶分批刪除工作的進度"""
+
+    user_id: uuid.UUID
+    # 開始時該用戶擁有的物品數量
+    total_items: int = 0
+    deleted_items: int = 0
@@ -1,4 +1,13 @@
-from app.services.user import UserService
-from app.services.item import ItemService
+from app.services.user import AsyncUserService, UserService
+from app.services.item import AsyncItemService, ItemService
+from app.services.item_import import ItemImportService
+from app.services.analytics import AnalyticsService
 
-__all__ = ["UserService", "ItemService"]
+__all__ = [
+    "UserService",
+    "ItemService",
+    "AsyncUserService",
+    "AsyncItemService",
+    "ItemImportService",
+    "AnalyticsService",
+]
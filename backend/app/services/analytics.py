@@ -0,0 +1,218 @@
+from collections.abc import Callable, Iterator
+from typing import Any, Literal
+
+import polars as pl
+from sqlalchemy import String, cast, select
+from sqlmodel import Session, col
+
+from app.core.config import settings
+from app.models import Item, User
+
+AnalyticsReport = Literal["items-per-owner", "user-activity", "description-lengths"]
+
+# 描述長度分組的上界（不含），最後一組為其餘長度
+DESCRIPTION_BUCKETS = (32, 64, 128)
+
+# UUID 在資料庫端轉為文字，polars 才能以原生字串欄位保存，而不是 Python 物件
+_ITEM_OWNERS = select(cast(Item.owner_id, String).label("owner_id"))
+_ITEM_DESCRIPTIONS = select(col(Item.description))
+_USERS = select(
+    cast(User.id, String).label("id"),
+    col(User.email),
+    col(User.is_active),
+    col(User.is_superuser),
+)
+_USERS_SCHEMA = {
+    "id": pl.String,
+    "email": pl.String,
+    "is_active": pl.Boolean,
+    "is_superuser": pl.Boolean,
+}
+
+
+def _description_bucket() -> pl.Expr:
+    length = pl.col("description").str.len_chars()
+    # 由最長的一組往回包，得到與依序比較各上界相同的結果
+    bounds = (0, *DESCRIPTION_BUCKETS)
+    bucket: pl.Expr = pl.lit(f"{bounds[-1]}+")
+    for low, high in reversed(list(zip(bounds, bounds[1:], strict=False))):
+        bucket = (
+            pl.when(length < high).then(pl.lit(f"{low}-{high - 1}")).otherwise(bucket)
+        )
+    return (
+        pl.when(length.is_null()).then(pl.lit("none")).otherwise(bucket).alias("bucket")
+    )
+
+
+def _description_bucket_labels() -> list[str]:
+    bounds = (0, *DESCRIPTION_BUCKETS)
+    labels = [
+        f"{low}-{high - 1}" for low, high in zip(bounds, bounds[1:], strict=False)
+    ]
+    return ["none", *labels, f"{bounds[-1]}+"]
+
+
+def _ratio(numerator: str, denominator: str) -> pl.Expr:
+    return (
+        pl.when(pl.col(denominator) > 0)
+        .then(pl.col(numerator) / pl.col(denominator))
+        .otherwise(None)
+    )
+
+
+class AnalyticsService:
+    """
+    管理用分析服務，以 polars 計算彙總資料
+
+    資料以伺服器端游標分批讀入 polars 的欄式 (Arrow) 記憶體，每批先在 LazyFrame 中
+    化簡為部分彙總再合併，不需要建立 ORM 物件，也不必把整個資料表載入記憶體。
+    """
+
+    def __init__(self, session: Session, batch_size: int | None = None):
+        self.session = session
+        self.batch_size = batch_size or settings.ANALYTICS_BATCH_SIZE
+
+    def _batches(
+        self, statement: Any, schema: dict[str, Any]
+    ) -> Iterator[pl.DataFrame]:
+        statement = statement.execution_options(yield_per=self.batch_size)
+        yield from pl.read_database(
+            statement,
+            self.session.connection(),
+            iter_batches=True,
+            batch_size=self.batch_size,
+            # 指定型別，避免整批皆為 NULL 時推斷為 Null 型別
+            schema_overrides=schema,
+        )
+
+    def _reduce(
+        self,
+        statement: Any,
+        schema: dict[str, Any],
+        partial: Callable[[pl.LazyFrame], pl.LazyFrame],
+    ) -> pl.LazyFrame:
+        partials = [
+            partial(batch.lazy()).collect()
+            for batch in self._batches(statement, schema)
+        ]
+        if not partials:
+            return partial(pl.LazyFrame(schema=schema))
+        return pl.concat(partials).lazy()
+
+    def _users(self) -> pl.LazyFrame:
+        return self._reduce(_USERS, _USERS_SCHEMA, lambda batch: batch)
+
+    def _item_counts(self) -> pl.LazyFrame:
+        counts = self._reduce(
+            _ITEM_OWNERS,
+            {"owner_id": pl.String},
+            lambda batch: batch.group_by("owner_id").agg(
+                pl.len().cast(pl.Int64).alias("items")
+            ),
+        )
+        return counts.group_by("owner_id").agg(pl.col("items").sum())
+
+    def items_per_owner(self, limit: int = 100) -> pl.DataFrame:
+        """
+        計算每個用戶擁有的物品數量
+
+        Args:
+            limit: 回傳的用戶數量上限，依物品數量由多到少排列
+
+        Returns:
+            owner_id、email、is_active、items 欄位的資料表
+        """
+        return (
+            self._users()
+            .join(self._item_counts(), left_on="id", right_on="owner_id", how="left")
+            .select(
+                pl.col("id").alias("owner_id"),
+                "email",
+                "is_active",
+                pl.col("items").fill_null(0),
+            )
+            .sort(["items", "email"], descending=[True, False])
+            .head(limit)
+            .collect()
+        )
+
+    def user_activity(self) -> pl.DataFrame:
+        """
+        計算啟用中用戶與擁有物品用戶的比例
+
+        Returns:
+            單列資料表：users、active_users、active_ratio、superusers、
+            users_with_items、users_with_items_ratio
+        """
+        return (
+            self._users()
+            .join(self._item_counts(), left_on="id", right_on="owner_id", how="left")
+            .select(
+                pl.len().cast(pl.Int64).alias("users"),
+                pl.col("is_active").sum().cast(pl.Int64).alias("active_users"),
+                pl.col("is_superuser").sum().cast(pl.Int64).alias("superusers"),
+                pl.col("items")
+                .is_not_null()
+                .sum()
+                .cast(pl.Int64)
+                .alias("users_with_items"),
+            )
+            .with_columns(
+                _ratio("active_users", "users").alias("active_ratio"),
+                _ratio("users_with_items", "users").alias("users_with_items_ratio"),
+            )
+            .select(
+                "users",
+                "active_users",
+                "active_ratio",
+                "superusers",
+                "users_with_items",
+                "users_with_items_ratio",
+            )
+            .collect()
+        )
+
+    def description_lengths(self) -> pl.DataFrame:
+        """
+        計算物品描述長度的分布
+
+        Returns:
+            bucket、items、share 欄位的資料表，依長度分組排列；
+            沒有描述的物品歸於 none 組
+        """
+        counts = (
+            self._reduce(
+                _ITEM_DESCRIPTIONS,
+                {"description": pl.String},
+                lambda batch: batch.group_by(_description_bucket()).agg(
+                    pl.len().cast(pl.Int64).alias("items")
+                ),
+            )
+            .group_by("bucket")
+            .agg(pl.col("items").sum())
+        )
+        buckets = pl.LazyFrame({"bucket": _description_bucket_labels()})
+        return (
+            buckets.join(counts, on="bucket", how="left", maintain_order="left")
+            .with_columns(pl.col("items").fill_null(0))
+            .with_columns((pl.col("items") / pl.col("items").sum()).alias("share"))
+            .with_columns(pl.col("share").fill_nan(None))
+            .collect()
+        )
+
+    def report(self, name: AnalyticsReport, limit: int = 100) -> pl.DataFrame:
+        """
+        依名稱計算報表
+
+        Args:
+            name: 報表名稱
+            limit: items-per-owner 報表的用戶數量上限
+
+        Returns:
+            報表資料表
+        """
+        if name == "items-per-owner":
+            return self.items_per_owner(limit)
+        if name == "user-activity":
+            return self.user_activity()
+        return self.description_lengths()
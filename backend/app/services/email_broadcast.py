@@ -0,0 +1,148 @@
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import anyio
+from sqlmodel import col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import utils
+from app.core.config import settings
+from app.core.db import async_engine
+from app.core.deadlines import without_deadline
+from app.core.jobs import JobRegistry
+from app.core.logger import logger
+from app.models import User
+from app.repositories.user import AsyncUserRepository
+from app.schemas.email import EmailBroadcast, EmailBroadcastCreate
+
+_ACTIVE = col(User.is_active).is_(True)
+
+# 同一時間只允許一個群發，避免多個群發合計超過 SMTP 的速率限制
+email_broadcasts: JobRegistry[EmailBroadcast] = JobRegistry(
+    max_jobs=settings.EMAIL_BROADCAST_MAX_JOBS
+)
+
+
+class _Throttle:
+    """依固定速率分配寄送時間，整批寄送前等待到該批可寄出的時間"""
+
+    def __init__(self, rate_per_second: float):
+        self.rate_per_second = rate_per_second
+        self._next_at = time.monotonic()
+
+    async def wait(self, messages: int) -> None:
+        if self.rate_per_second <= 0:
+            return
+        delay = self._next_at - time.monotonic()
+        if delay > 0:
+            await anyio.sleep(delay)
+        self._next_at = (
+            max(self._next_at, time.monotonic()) + messages / self.rate_per_second
+        )
+
+
+class EmailBroadcastService:
+    """
+    寄送郵件給所有啟用中的用戶
+
+    收件者依 (email, id) 以 keyset 分頁讀取，每批各自一個短交易，讀完即結束交易並
+    歸還連線，群發期間不會長時間佔用連線或阻擋 vacuum。郵件內容只渲染一次，每批
+    交由 send_emails 以同一條 SMTP 連線寄出，並依 EMAIL_BROADCAST_RATE_PER_SECOND
+    限制寄送速率；等待期間不佔用執行緒。
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = AsyncUserRepository(session)
+
+    async def start(self, broadcast_in: EmailBroadcastCreate) -> EmailBroadcast:
+        """
+        登錄群發，實際寄送由 run_email_broadcast 在背景執行
+
+        Args:
+            broadcast_in: 主旨與內容
+
+        Returns:
+            新的群發
+
+        Raises:
+            ValueError: 已有進行中的群發
+        """
+        total = await self.repository.count(_ACTIVE)
+        return email_broadcasts.add(
+            EmailBroadcast(subject=broadcast_in.subject, total_recipients=total)
+        )
+
+    async def _next_recipients(
+        self, after: list[Any] | None, size: int
+    ) -> tuple[list[str], list[Any] | None]:
+        users = await self.repository.get_page_after(after, size, _ACTIVE)
+        emails = [user.email for user in users]
+        after = self.repository.keyset_of(users[-1]) if users else None
+        # 只讀取的交易立即結束，寄送與等待期間不持有連線
+        await self.session.rollback()
+        return emails, after
+
+    async def run(
+        self,
+        job: EmailBroadcast,
+        email_data: utils.EmailData,
+        batch_size: int | None = None,
+    ) -> None:
+        """
+        分批寄出群發郵件，進度即時更新在 job 上
+
+        單一收件者被拒只計入 failed；無法連線到 SMTP 伺服器時整個群發失敗，
+        已寄出的郵件不會重寄。
+
+        Args:
+            job: 群發
+            email_data: 已渲染的郵件
+            batch_size: 每批收件者數量，預設為 EMAIL_BROADCAST_BATCH_SIZE
+        """
+        size = batch_size or settings.EMAIL_BROADCAST_BATCH_SIZE
+        throttle = _Throttle(settings.EMAIL_BROADCAST_RATE_PER_SECOND)
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        after: list[Any] | None = None
+        try:
+            while True:
+                emails, after = await self._next_recipients(after, size)
+                if not emails:
+                    break
+                await throttle.wait(len(emails))
+                # SMTP 為阻塞式 I/O，只在寄送這一批的期間使用執行緒
+                errors = await anyio.to_thread.run_sync(
+                    utils.send_emails, [(email, email_data) for email in emails]
+                )
+                failed = sum(error is not None for error in errors)
+                job.sent += len(errors) - failed
+                job.failed += failed
+                if len(emails) < size:
+                    break
+        except Exception as e:
+            await self.session.rollback()
+            job.status = "failed"
+            job.error = repr(e)
+            logger.exception(f"Email broadcast {job.id} failed")
+        else:
+            job.status = "completed"
+            logger.info(
+                f"Email broadcast {job.id} sent to {job.sent} users, {job.failed} failed"
+            )
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+
+@without_deadline
+async def run_email_broadcast(job: EmailBroadcast, email_data: utils.EmailData) -> None:
+    """
+    以獨立的 session 執行群發，供請求結束後的背景工作使用，不受請求期限限制
+
+    Args:
+        job: 群發
+        email_data: 已渲染的郵件
+    """
+    async with AsyncSession(async_engine) as session:
+        await EmailBroadcastService(session).run(job, email_data)
@@ -0,0 +1,230 @@
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import utils
+from app.core.config import settings
+from app.core.db import engine
+from app.core.email_metrics import email_metrics
+from app.core.logger import logger
+from app.models import EmailOutbox
+from app.repositories.email_outbox import (
+    AsyncEmailOutboxRepository,
+    EmailOutboxRepository,
+)
+
+
+def backoff_seconds(attempts: int) -> float:
+    """
+    第 attempts 次嘗試失敗後，到下次嘗試前的等待秒數
+
+    以 EMAIL_OUTBOX_BACKOFF_SECONDS 起算每次加倍，上限為
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS，並隨機縮短至一半，避免同時失敗的郵件
+    在同一時間重試。
+
+    Args:
+        attempts: 已嘗試的次數，至少為 1
+
+    Returns:
+        等待秒數
+    """
+    delay = min(
+        settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2.0 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS,
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+class EmailOutboxWorker:
+    """
+    從 email_outbox 領取到期的郵件並寄出
+
+    每次以獨立的 session 領取一批郵件後立即 commit，寄送 SMTP 時不持有交易或資料列鎖；
+    多個行程的 worker 以 FOR UPDATE SKIP LOCKED 分別領取不同的郵件。每封寄送前延長
+    租約，結果只在仍持有租約時寫回，租約逾期被接手的郵件不會被覆寫狀態。
+    """
+
+    def __init__(self) -> None:
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def wake(self) -> None:
+        """通知背景執行緒立即檢查寄件匣，不必等到下次輪詢"""
+        self._wake.set()
+
+    def run_once(self, batch_size: int | None = None) -> int:
+        """
+        領取並寄送一批郵件
+
+        Args:
+            batch_size: 最多領取的筆數，預設為 EMAIL_OUTBOX_BATCH_SIZE
+
+        Returns:
+            本次處理的郵件數量
+        """
+        with Session(engine, expire_on_commit=False) as session:
+            repository = EmailOutboxRepository(session)
+            claimed = repository.claim(
+                batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE,
+                settings.EMAIL_OUTBOX_LEASE_SECONDS,
+            )
+            for email in claimed:
+                self._deliver(repository, email)
+            return len(claimed)
+
+    def _deliver(self, repository: EmailOutboxRepository, email: EmailOutbox) -> None:
+        if not repository.renew(email, settings.EMAIL_OUTBOX_LEASE_SECONDS):
+            logger.warning(
+                f"Email {email.id} was reclaimed by another worker, skipping"
+            )
+            return
+        try:
+            utils.send_email(
+                email_to=email.email_to,
+                subject=email.subject,
+                html_content=email.html_content,
+            )
+        except Exception as e:
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                self._check_lease(
+                    repository.mark_failed(email, str(e), retry_at=None), email
+                )
+                email_metrics.record_retry(dead=True)
+                logger.error(
+                    f"Email {email.id} to {email.email_to} failed "
+                    f"{email.attempts} times, giving up: {e}"
+                )
+                return
+            delay = backoff_seconds(email.attempts)
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+            self._check_lease(
+                repository.mark_failed(email, str(e), retry_at=retry_at), email
+            )
+            email_metrics.record_retry(dead=False)
+            logger.warning(
+                f"Email {email.id} to {email.email_to} failed, "
+                f"retrying in {delay:.0f}s: {e}"
+            )
+        else:
+            self._check_lease(repository.mark_sent(email), email)
+            email_metrics.record_queued(
+                (datetime.now(timezone.utc) - email.created_at).total_seconds()
+            )
+
+    def _check_lease(self, updated: bool, email: EmailOutbox) -> None:
+        if not updated:
+            logger.warning(
+                f"Email {email.id} was reclaimed by another worker while sending, "
+                "leaving its status to the new owner"
+            )
+
+    def start(self, batch_size: int | None = None) -> None:
+        """
+        啟動背景執行緒持續處理寄件匣
+
+        Args:
+            batch_size: 每批領取的筆數，預設為 EMAIL_OUTBOX_BATCH_SIZE
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE,),
+            name="email-outbox-worker",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止背景執行緒，正在寄送的郵件會先處理完"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=30)
+        self._thread = None
+
+    def _run(self, batch_size: int) -> None:
+        # 整批領滿代表可能還有到期的郵件，不等待直接處理下一批
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once(batch_size)
+            except Exception as e:
+                logger.warning(f"email outbox worker failed: {e}")
+                processed = 0
+            if processed < batch_size:
+                self._wake.wait(settings.EMAIL_OUTBOX_POLL_SECONDS)
+                self._wake.clear()
+
+
+email_outbox_worker = EmailOutboxWorker()
+
+
+class EmailOutboxService:
+    """
+    郵件寄件匣服務，請求處理中只排入郵件，由 EmailOutboxWorker 在背景寄出
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = EmailOutboxRepository(session)
+
+    def enqueue(self, email_to: str, subject: str, html_content: str) -> EmailOutbox:
+        """
+        排入一封郵件並喚醒本行程的 worker
+
+        郵件與呼叫端位於同一個交易時（unit_of_work 區塊內），會隨交易一起 commit 或還原。
+
+        Args:
+            email_to: 收件者
+            subject: 主旨
+            html_content: HTML 內容
+
+        Returns:
+            排入的郵件
+        """
+        email = self.repository.enqueue(email_to, subject, html_content)
+        email_outbox_worker.wake()
+        return email
+
+    def stats(self) -> dict[str, int]:
+        """
+        依狀態統計寄件匣中的郵件數量
+
+        Returns:
+            狀態與數量
+        """
+        return self.repository.count_by_status()
+
+
+class AsyncEmailOutboxService:
+    """
+    EmailOutboxService 的非同步版本，供 async 路由排入郵件
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = AsyncEmailOutboxRepository(session)
+
+    async def enqueue(
+        self, email_to: str, subject: str, html_content: str
+    ) -> EmailOutbox:
+        """
+        排入一封郵件並喚醒本行程的 worker
+
+        Args:
+            email_to: 收件者
+            subject: 主旨
+            html_content: HTML 內容
+
+        Returns:
+            排入的郵件
+        """
+        email = await self.repository.enqueue(email_to, subject, html_content)
+        email_outbox_worker.wake()
+        return email
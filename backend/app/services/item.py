@@ -1,13 +1,19 @@
 import uuid
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
 
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.repositories.item import ItemRepository
-from app.repositories.user import UserRepository
-from app.schemas.item import ItemCreate, ItemUpdate
+from app.core.pagination import decode_cursor, encode_cursor
+from app.repositories.item import AsyncItemRepository, ItemRepository
+from app.repositories.unit_of_work import async_unit_of_work
+from app.repositories.user import AsyncUserRepository, UserRepository
+from app.schemas.item import ItemBatchOperation, ItemCreate, ItemUpdate
 from app.models import Item, User
 
+# 匯出的欄位，順序即 NDJSON 的鍵順序與 CSV 的欄位順序
+EXPORT_COLUMNS = ("id", "title", "description", "owner_id")
+
 
 class ItemService:
     """
@@ -62,6 +68,67 @@ class ItemService:
             owner_id=owner_id, skip=skip, limit=limit
         )
 
+    def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        owner_id: Optional[uuid.UUID] = None,
+        include_count: bool = True,
+        approximate: bool = False,
+    ) -> Tuple[List[Item], Optional[int], bool]:
+        """
+        以單一查詢獲取一頁物品與總數
+
+        Args:
+            skip: 跳過的項目數
+            limit: 取得的項目數
+            owner_id: 僅取得此用戶的物品，None 表示全部
+            include_count: 是否計算總數
+            approximate: 取得全部物品時，是否允許使用估計的總數
+
+        Returns:
+            (物品列表, 總數；不計算時為 None, 總數是否為精確值)
+        """
+        where = [] if owner_id is None else [Item.owner_id == owner_id]
+        return self.repository.get_page(
+            skip,
+            limit,
+            *where,
+            include_count=include_count,
+            approximate=approximate,
+        )
+
+    def get_page_after(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        owner_id: Optional[uuid.UUID] = None,
+    ) -> Tuple[List[Item], Optional[str]]:
+        """
+        以游標 (keyset) 方式獲取物品
+
+        Args:
+            cursor: 上一頁回傳的游標，None 表示第一頁
+            limit: 取得的項目數
+            owner_id: 僅取得此用戶的物品，None 表示全部
+
+        Returns:
+            (物品列表, 下一頁游標；沒有下一頁時為 None)
+
+        Raises:
+            ValueError: 游標格式不正確
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # 多取一筆以判斷是否還有下一頁
+        if owner_id is None:
+            items = self.repository.get_page_after(after, limit + 1)
+        else:
+            items = self.repository.get_multi_by_owner_after(owner_id, after, limit + 1)
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor(self.repository.keyset_of(items[-1]))
+
     def create(self, item_in: ItemCreate, owner_id: uuid.UUID) -> Item:
         """
         創建新物品
@@ -85,7 +152,7 @@ class ItemService:
         self, id: uuid.UUID, item_in: ItemUpdate, current_user: User
     ) -> Optional[Item]:
         """
-        更新物品資料
+        更新物品資料，擁有權檢查與更新在同一個 UPDATE 語句中完成
 
         Args:
             id: 物品 ID
@@ -93,45 +160,39 @@ class ItemService:
             current_user: 當前用戶
 
         Returns:
-            更新後的物品
+            更新後的物品，物品不存在時為 None
 
         Raises:
-            ValueError: 如果物品不存在或當前用戶無權限更新
+            ValueError: 當前用戶無權限更新此物品
         """
-        item = self.repository.get_by_id(id)
-        if not item:
-            raise ValueError(f"物品 ID {id} 不存在")
-
-        # 檢查權限，只有物品擁有者或超級用戶可以更新
-        if not current_user.is_superuser and item.owner_id != current_user.id:
-            raise ValueError("沒有權限更新此物品")
-
+        # 只有物品擁有者或超級用戶可以更新
+        owner_id = None if current_user.is_superuser else current_user.id
         item_data = item_in.model_dump(exclude_unset=True)
-        return self.repository.update(id=id, obj_in=item_data)
+        item, found = self.repository.update_owned(id, item_data, owner_id)
+        if item is None and found:
+            raise ValueError("沒有權限更新此物品")
+        return item
 
     def delete(self, id: uuid.UUID, current_user: User) -> Optional[Item]:
         """
-        刪除物品
+        刪除物品，擁有權檢查與刪除在同一個 DELETE 語句中完成
 
         Args:
             id: 物品 ID
             current_user: 當前用戶
 
         Returns:
-            刪除的物品
+            刪除的物品，物品不存在時為 None
 
         Raises:
-            ValueError: 如果物品不存在或當前用戶無權限刪除
+            ValueError: 當前用戶無權限刪除此物品
         """
-        item = self.repository.get_by_id(id)
-        if not item:
-            raise ValueError(f"物品 ID {id} 不存在")
-
-        # 檢查權限，只有物品擁有者或超級用戶可以刪除
-        if not current_user.is_superuser and item.owner_id != current_user.id:
+        # 只有物品擁有者或超級用戶可以刪除
+        owner_id = None if current_user.is_superuser else current_user.id
+        item, found = self.repository.delete_owned(id, owner_id)
+        if item is None and found:
             raise ValueError("沒有權限刪除此物品")
-
-        return self.repository.delete(id=id)
+        return item
 
     def count(self) -> int:
         """
@@ -142,6 +203,18 @@ class ItemService:
         """
         return self.repository.count()
 
+    def count_total(self, approximate: bool = False) -> Tuple[int, bool]:
+        """
+        計算物品總數，可選擇在大型資料表上改用估計值
+
+        Args:
+            approximate: 是否允許使用 PostgreSQL 統計資料的估計值
+
+        Returns:
+            (物品總數, 是否為精確值)
+        """
+        return self.repository.count_total(approximate=approximate)
+
     def count_by_owner(self, owner_id: uuid.UUID) -> int:
         """
         計算特定用戶擁有的物品數量
@@ -153,3 +226,268 @@ class ItemService:
             該用戶擁有的物品數量
         """
         return self.repository.count_by_owner(owner_id)
+
+
+class AsyncItemService:
+    """
+    ItemService 的非同步版本，供 async 路由使用
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = AsyncItemRepository(session)
+        self.user_repository = AsyncUserRepository(session)
+
+    async def get(self, id: uuid.UUID) -> Optional[Item]:
+        """
+        獲取單一物品
+
+        Args:
+            id: 物品 ID
+
+        Returns:
+            物品對象，如不存在則為 None
+        """
+        return await self.repository.get_by_id(id)
+
+    async def get_multi_by_owner(
+        self, owner_id: uuid.UUID, skip: int = 0, limit: int = 100
+    ) -> List[Item]:
+        """
+        獲取特定用戶的所有物品
+
+        Args:
+            owner_id: 擁有者 ID
+            skip: 跳過的項目數
+            limit: 取得的項目數
+
+        Returns:
+            該用戶的物品列表
+        """
+        return await self.repository.get_multi_by_owner(
+            owner_id=owner_id, skip=skip, limit=limit
+        )
+
+    async def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        owner_id: Optional[uuid.UUID] = None,
+        include_count: bool = True,
+        approximate: bool = False,
+    ) -> Tuple[List[Item], Optional[int], bool]:
+        """
+        以單一查詢獲取一頁物品與總數
+
+        Args:
+            skip: 跳過的項目數
+            limit: 取得的項目數
+            owner_id: 僅取得此用戶的物品，None 表示全部
+            include_count: 是否計算總數
+            approximate: 取得全部物品時，是否允許使用估計的總數
+
+        Returns:
+            (物品列表, 總數；不計算時為 None, 總數是否為精確值)
+        """
+        where = [] if owner_id is None else [Item.owner_id == owner_id]
+        return await self.repository.get_page(
+            skip,
+            limit,
+            *where,
+            include_count=include_count,
+            approximate=approximate,
+        )
+
+    async def get_page_after(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        owner_id: Optional[uuid.UUID] = None,
+    ) -> Tuple[List[Item], Optional[str]]:
+        """
+        以游標 (keyset) 方式獲取物品
+
+        Args:
+            cursor: 上一頁回傳的游標，None 表示第一頁
+            limit: 取得的項目數
+            owner_id: 僅取得此用戶的物品，None 表示全部
+
+        Returns:
+            (物品列表, 下一頁游標；沒有下一頁時為 None)
+
+        Raises:
+            ValueError: 游標格式不正確
+        """
+        after = decode_cursor(cursor) if cursor else None
+        if owner_id is None:
+            items = await self.repository.get_page_after(after, limit + 1)
+        else:
+            items = await self.repository.get_multi_by_owner_after(
+                owner_id, after, limit + 1
+            )
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor(self.repository.keyset_of(items[-1]))
+
+    async def create(self, item_in: ItemCreate, owner_id: uuid.UUID) -> Item:
+        """
+        創建新物品
+
+        Args:
+            item_in: 物品建立資料
+            owner_id: 擁有者 ID
+
+        Returns:
+            建立的物品
+        """
+        user = await self.user_repository.get_by_id(owner_id)
+        if not user:
+            raise ValueError(f"用戶 ID {owner_id} 不存在")
+
+        item_data = item_in.model_dump()
+        return await self.repository.create_with_owner(
+            obj_in=item_data, owner_id=owner_id
+        )
+
+    async def update(
+        self, id: uuid.UUID, item_in: ItemUpdate, current_user: User
+    ) -> Optional[Item]:
+        """
+        更新物品資料，擁有權檢查與更新在同一個 UPDATE 語句中完成
+
+        Args:
+            id: 物品 ID
+            item_in: 更新的物品資料
+            current_user: 當前用戶
+
+        Returns:
+            更新後的物品，物品不存在時為 None
+
+        Raises:
+            ValueError: 當前用戶無權限更新此物品
+        """
+        # 只有物品擁有者或超級用戶可以更新
+        owner_id = None if current_user.is_superuser else current_user.id
+        item_data = item_in.model_dump(exclude_unset=True)
+        item, found = await self.repository.update_owned(id, item_data, owner_id)
+        if item is None and found:
+            raise ValueError("沒有權限更新此物品")
+        return item
+
+    async def delete(self, id: uuid.UUID, current_user: User) -> Optional[Item]:
+        """
+        刪除物品，擁有權檢查與刪除在同一個 DELETE 語句中完成
+
+        Args:
+            id: 物品 ID
+            current_user: 當前用戶
+
+        Returns:
+            刪除的物品，物品不存在時為 None
+
+        Raises:
+            ValueError: 當前用戶無權限刪除此物品
+        """
+        # 只有物品擁有者或超級用戶可以刪除
+        owner_id = None if current_user.is_superuser else current_user.id
+        item, found = await self.repository.delete_owned(id, owner_id)
+        if item is None and found:
+            raise ValueError("沒有權限刪除此物品")
+        return item
+
+    def stream_export(
+        self, owner_id: Optional[uuid.UUID] = None, size: int = 1000
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        以伺服器端游標分批讀取要匯出的物品，欄位順序同 EXPORT_COLUMNS
+
+        Args:
+            owner_id: 僅匯出此用戶的物品，None 表示全部
+            size: 每批筆數
+
+        Returns:
+            逐批產生資料列的非同步迭代器
+        """
+        where = [] if owner_id is None else [Item.owner_id == owner_id]
+        return self.repository.stream_rows(EXPORT_COLUMNS, *where, size=size)
+
+    async def batch(
+        self, operations: Sequence[ItemBatchOperation], current_user: User
+    ) -> List[Tuple[Optional[Item], bool]]:
+        """
+        在單一交易中執行多個建立、更新與刪除操作
+
+        建立、更新、刪除各以一個批次語句完成，依此順序執行；非超級用戶的更新與刪除
+        語句帶有 owner_id 條件，擁有權檢查與寫入不會被並行的轉移擁有者操作隔開。
+        沒有寫入的目標才再查詢一次，以區分無權限與不存在，只影響該筆操作的結果。
+
+        Args:
+            operations: 批次操作列表
+            current_user: 當前用戶，建立的物品屬於此用戶
+
+        Returns:
+            每個操作的 (物品；失敗時為 None, 目標物品是否存在)，順序與輸入相同；
+            物品為 None 而存在時代表無權限
+        """
+        where = [] if current_user.is_superuser else [Item.owner_id == current_user.id]
+        creates = [op.item.model_dump() for op in operations if op.op == "create"]
+        for data in creates:
+            data["owner_id"] = current_user.id
+        updates = [
+            {**op.item.model_dump(exclude_unset=True), "id": op.id}
+            for op in operations
+            if op.op == "update"
+        ]
+        deletes = [op.id for op in operations if op.op == "delete"]
+
+        async with async_unit_of_work(self.session):
+            created = iter(await self.repository.bulk_create(creates))
+            updated = {
+                item.id: item
+                for item in await self.repository.bulk_update(updates, *where)
+            }
+            deleted = {
+                item.id: item
+                for item in await self.repository.bulk_delete(deletes, *where)
+            }
+            missed = [
+                op.id
+                for op in operations
+                if op.op != "create" and op.id not in updated and op.id not in deleted
+            ]
+            existing = await self.repository.get_owner_ids(missed)
+
+        results: List[Tuple[Optional[Item], bool]] = []
+        for op in operations:
+            if op.op == "create":
+                results.append((next(created), True))
+            else:
+                done = updated if op.op == "update" else deleted
+                item = done.get(op.id)
+                results.append((item, item is not None or op.id in existing))
+        return results
+
+    async def count_total(self, approximate: bool = False) -> Tuple[int, bool]:
+        """
+        計算物品總數，可選擇在大型資料表上改用估計值
+
+        Args:
+            approximate: 是否允許使用 PostgreSQL 統計資料的估計值
+
+        Returns:
+            (物品總數, 是否為精確值)
+        """
+        return await self.repository.count_total(approximate=approximate)
+
+    async def count_by_owner(self, owner_id: uuid.UUID) -> int:
+        """
+        計算特定用戶擁有的物品數量
+
+        Args:
+            owner_id: 擁有者 ID
+
+        Returns:
+            該用戶擁有的物品數量
+        """
+        return await self.repository.count_by_owner(owner_id)
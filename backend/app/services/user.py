@@ -1,10 +1,13 @@
 import uuid
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from sqlmodel import Session
-from app.core.security import verify_password
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import verify_password, verify_password_async
+from app.core.user_cache import user_cache
 
-from app.repositories.user import UserRepository
+from app.repositories.user import AsyncUserRepository, UserRepository
 from app.schemas.user import UserCreate, UserUpdate, UserRegister
 from app.models import User
 
@@ -55,6 +58,53 @@ class UserService:
         """
         return self.repository.get_all(skip, limit)
 
+    def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_count: bool = True,
+        approximate: bool = False,
+    ) -> Tuple[List[User], Optional[int], bool]:
+        """
+        以單一查詢獲取一頁用戶與總數
+
+        Args:
+            skip: 跳過的數量
+            limit: 限制的數量
+            include_count: 是否計算總數
+            approximate: 是否允許在大型資料表上使用估計的總數
+
+        Returns:
+            (用戶列表, 總數；不計算時為 None, 總數是否為精確值)
+        """
+        return self.repository.get_page(
+            skip, limit, include_count=include_count, approximate=approximate
+        )
+
+    def get_page_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[User], Optional[str]]:
+        """
+        以游標 (keyset) 方式獲取用戶，依 (email, id) 排序
+
+        Args:
+            cursor: 上一頁回傳的游標，None 表示第一頁
+            limit: 限制的數量
+
+        Returns:
+            (用戶列表, 下一頁游標；沒有下一頁時為 None)
+
+        Raises:
+            ValueError: 游標格式不正確
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # 多取一筆以判斷是否還有下一頁
+        users = self.repository.get_page_after(after, limit + 1)
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        return users, encode_cursor(self.repository.keyset_of(users[-1]))
+
     def create(self, user_create: UserCreate) -> User:
         """
         創建新用戶
@@ -112,7 +162,9 @@ class UserService:
                 raise ValueError(f"電子郵件 {user_update.email} 已經被註冊")
 
         user_data = user_update.model_dump(exclude_unset=True)
-        return self.repository.update_with_password(id, user_data)
+        user_cache.invalidate_on_commit(self.session, id)
+        user = self.repository.update_with_password(id, user_data)
+        return user
 
     def delete(self, id: uuid.UUID) -> Optional[User]:
         """
@@ -124,7 +176,9 @@ class UserService:
         Returns:
             被刪除的用戶
         """
-        return self.repository.delete(id)
+        user_cache.invalidate_on_commit(self.session, id)
+        user = self.repository.delete(id)
+        return user
 
     def authenticate(self, email: str, password: str) -> Optional[User]:
         """
@@ -162,7 +216,9 @@ class UserService:
             raise ValueError("當前密碼不正確")
 
         # 更新密碼
-        return self.repository.update_with_password(user_id, {"password": new_password})
+        user_cache.invalidate_on_commit(self.session, user_id)
+        user = self.repository.update_with_password(user_id, {"password": new_password})
+        return user
 
     def count(self) -> int:
         """
@@ -172,3 +228,221 @@ class UserService:
             用戶總數
         """
         return self.repository.count()
+
+    def count_total(self, approximate: bool = False) -> Tuple[int, bool]:
+        """
+        計算用戶總數，可選擇在大型資料表上改用估計值
+
+        Args:
+            approximate: 是否允許使用 PostgreSQL 統計資料的估計值
+
+        Returns:
+            (用戶總數, 是否為精確值)
+        """
+        return self.repository.count_total(approximate=approximate)
+
+
+class AsyncUserService:
+    """
+    UserService 的非同步版本，供 async 路由使用
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = AsyncUserRepository(session)
+
+    async def get(self, id: uuid.UUID) -> Optional[User]:
+        """
+        獲取單一用戶
+
+        Args:
+            id: 用戶 ID
+
+        Returns:
+            用戶對象
+        """
+        return await self.repository.get_by_id(id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """
+        透過電子郵件取得用戶
+
+        Args:
+            email: 用戶電子郵件
+
+        Returns:
+            用戶對象
+        """
+        return await self.repository.get_by_email(email)
+
+    async def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_count: bool = True,
+        approximate: bool = False,
+    ) -> Tuple[List[User], Optional[int], bool]:
+        """
+        以單一查詢獲取一頁用戶與總數
+
+        Args:
+            skip: 跳過的數量
+            limit: 限制的數量
+            include_count: 是否計算總數
+            approximate: 是否允許在大型資料表上使用估計的總數
+
+        Returns:
+            (用戶列表, 總數；不計算時為 None, 總數是否為精確值)
+        """
+        return await self.repository.get_page(
+            skip, limit, include_count=include_count, approximate=approximate
+        )
+
+    async def get_page_after(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[User], Optional[str]]:
+        """
+        以游標 (keyset) 方式獲取用戶，依 (email, id) 排序
+
+        Args:
+            cursor: 上一頁回傳的游標，None 表示第一頁
+            limit: 限制的數量
+
+        Returns:
+            (用戶列表, 下一頁游標；沒有下一頁時為 None)
+
+        Raises:
+            ValueError: 游標格式不正確
+        """
+        after = decode_cursor(cursor) if cursor else None
+        users = await self.repository.get_page_after(after, limit + 1)
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        return users, encode_cursor(self.repository.keyset_of(users[-1]))
+
+    async def create(self, user_create: UserCreate) -> User:
+        """
+        創建新用戶
+
+        Args:
+            user_create: 創建用戶的資料
+
+        Returns:
+            創建後的用戶
+        """
+        existing_user = await self.repository.get_by_email(user_create.email)
+        if existing_user:
+            raise ValueError(f"電子郵件 {user_create.email} 已經被註冊")
+
+        user_data = user_create.model_dump()
+        return await self.repository.create_with_password(user_data)
+
+    async def register(self, user_register: UserRegister) -> User:
+        """
+        用戶註冊
+
+        Args:
+            user_register: 用戶註冊資料
+
+        Returns:
+            創建後的用戶
+        """
+        existing_user = await self.repository.get_by_email(user_register.email)
+        if existing_user:
+            raise ValueError(f"電子郵件 {user_register.email} 已經被註冊")
+
+        user_data = user_register.model_dump()
+        user_data.update({"is_active": True, "is_superuser": False})
+        return await self.repository.create_with_password(user_data)
+
+    async def update(self, id: uuid.UUID, user_update: UserUpdate) -> Optional[User]:
+        """
+        更新用戶資料
+
+        Args:
+            id: 用戶 ID
+            user_update: 用戶更新資料
+
+        Returns:
+            更新後的用戶
+        """
+        user = await self.repository.get_by_id(id)
+        if not user:
+            return None
+
+        if user_update.email and user_update.email != user.email:
+            existing_user = await self.repository.get_by_email(user_update.email)
+            if existing_user:
+                raise ValueError(f"電子郵件 {user_update.email} 已經被註冊")
+
+        user_data = user_update.model_dump(exclude_unset=True)
+        user_cache.invalidate_on_commit(self.session, id)
+        user = await self.repository.update_with_password(id, user_data)
+        return user
+
+    async def delete(self, id: uuid.UUID) -> Optional[User]:
+        """
+        刪除用戶
+
+        Args:
+            id: 用戶 ID
+
+        Returns:
+            被刪除的用戶
+        """
+        user_cache.invalidate_on_commit(self.session, id)
+        user = await self.repository.delete(id)
+        return user
+
+    async def authenticate(self, email: str, password: str) -> Optional[User]:
+        """
+        用戶認證
+
+        Args:
+            email: 電子郵件
+            password: 密碼
+
+        Returns:
+            認證成功的用戶
+        """
+        return await self.repository.authenticate(email, password)
+
+    async def update_password(
+        self, user_id: uuid.UUID, current_password: str, new_password: str
+    ) -> Optional[User]:
+        """
+        更新用戶密碼
+
+        Args:
+            user_id: 用戶 ID
+            current_password: 當前密碼
+            new_password: 新密碼
+
+        Returns:
+            更新後的用戶
+        """
+        user = await self.repository.get_by_id(user_id)
+        if not user:
+            return None
+
+        if not await verify_password_async(current_password, user.hashed_password):
+            raise ValueError("當前密碼不正確")
+
+        user_cache.invalidate_on_commit(self.session, user_id)
+        user = await self.repository.update_with_password(
+            user_id, {"password": new_password}
+        )
+        return user
+
+    async def count_total(self, approximate: bool = False) -> Tuple[int, bool]:
+        """
+        計算用戶總數，可選擇在大型資料表上改用估計值
+
+        Args:
+            approximate: 是否允許使用 PostgreSQL 統計資料的估計值
+
+        Returns:
+            (用戶總數, 是否為精確值)
+        """
+        return await self.repository.count_total(approximate=approximate)
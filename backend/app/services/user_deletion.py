@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.core.deadlines import without_deadline
+from app.core.jobs import JobRegistry
+from app.core.logger import logger
+from app.repositories.item import AsyncItemRepository
+from app.schemas.user import UserDeletionJob, UserUpdate
+from app.services.user import AsyncUserService
+
+user_deletion_jobs: JobRegistry[UserDeletionJob] = JobRegistry(
+    max_jobs=settings.USER_DELETION_MAX_JOBS
+)
+
+
+class UserDeletionService:
+    """
+    大量物品用戶的分批刪除服務
+
+    單一 DELETE 經由 ON DELETE CASCADE 刪除數十萬筆物品時，會在一個長交易中鎖住
+    所有資料列並產生大量 WAL。分批刪除讓每個交易只處理 USER_DELETION_CHUNK_SIZE
+    筆物品，並可隨時查詢進度。
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.user_service = AsyncUserService(session)
+        self.item_repository = AsyncItemRepository(session)
+
+    async def start(self, user_id: uuid.UUID) -> UserDeletionJob:
+        """
+        停用用戶並登錄刪除工作，實際刪除由 run_user_deletion 在背景執行
+
+        停用後用戶無法再登入或新增物品，因此開始時的物品數量即為總數。
+
+        Args:
+            user_id: 要刪除的用戶 ID
+
+        Returns:
+            新的刪除工作
+
+        Raises:
+            ValueError: 用戶不存在，或已有進行中的刪除工作
+        """
+        user = await self.user_service.get(user_id)
+        if not user:
+            raise ValueError(f"用戶 ID {user_id} 不存在")
+        # 先登錄工作，已有進行中的刪除工作時不會再次停用用戶
+        job = user_deletion_jobs.add(
+            UserDeletionJob(user_id=user_id),
+            conflicts=lambda existing: existing.user_id == user_id,
+        )
+        try:
+            await self.user_service.update(user_id, UserUpdate(is_active=False))
+            job.total_items = await self.item_repository.count_by_owner(user_id)
+        except Exception as e:
+            job.status = "failed"
+            job.error = repr(e)
+            job.finished_at = datetime.now(timezone.utc)
+            raise
+        return job
+
+    async def run(self, job: UserDeletionJob, chunk_size: int | None = None) -> None:
+        """
+        分批刪除用戶的物品，最後刪除用戶本身
+
+        每批各自 commit，進度即時更新在 job 上；失敗時記錄錯誤，
+        已刪除的物品不會還原，可重新建立工作繼續刪除。
+
+        Args:
+            job: 刪除工作
+            chunk_size: 每批刪除的筆數，預設為 USER_DELETION_CHUNK_SIZE
+        """
+        size = chunk_size or settings.USER_DELETION_CHUNK_SIZE
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        try:
+            while True:
+                deleted = await self.item_repository.delete_by_owner(job.user_id, size)
+                await self.session.commit()
+                job.deleted_items += deleted
+                if deleted < size:
+                    break
+            await self.user_service.delete(job.user_id)
+        except Exception as e:
+            await self.session.rollback()
+            job.status = "failed"
+            job.error = repr(e)
+            logger.exception(f"Deleting user {job.user_id} failed")
+        else:
+            job.status = "completed"
+            logger.info(f"Deleted user {job.user_id} and {job.deleted_items} items")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+
+@without_deadline
+async def run_user_deletion(
+    job: UserDeletionJob, chunk_size: int | None = None
+) -> None:
+    """
+    以獨立的 session 執行刪除工作，供請求結束後的背景工作使用，不受請求期限限制
+
+    Args:
+        job: 刪除工作
+        chunk_size: 每批刪除的筆數
+    """
+    async with AsyncSession(async_engine) as session:
+        await UserDeletionService(session).run(job, chunk_size)
@@ -0,0 +1,96 @@
+import io
+
+import polars as pl
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import Item
+from app.tests.utils.user import create_random_user
+
+
+def test_read_items_per_owner(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    db.add_all(
+        [Item(title=f"Item {n}", owner_id=user.id) for n in range(3)],
+    )
+    db.commit()
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/items-per-owner",
+        headers=superuser_token_headers,
+        params={"limit": 1000},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["report"] == "items-per-owner"
+    rows = {row["email"]: row for row in content["rows"]}
+    assert rows[user.email]["items"] == 3
+    assert rows[user.email]["owner_id"] == str(user.id)
+    assert rows[settings.FIRST_SUPERUSER]["items"] >= 0
+    items = [row["items"] for row in content["rows"]]
+    assert items == sorted(items, reverse=True)
+
+
+def test_read_user_activity(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/user-activity",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    [row] = response.json()["rows"]
+    assert row["users"] >= 1
+    assert row["superusers"] >= 1
+    assert row["active_ratio"] == row["active_users"] / row["users"]
+    assert 0 <= row["users_with_items_ratio"] <= 1
+
+
+def test_read_description_lengths_parquet(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    db.add_all(
+        [
+            Item(title="No description", owner_id=user.id),
+            Item(title="Long description", description="x" * 200, owner_id=user.id),
+        ]
+    )
+    db.commit()
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/description-lengths",
+        headers=superuser_token_headers,
+        params={"format": "parquet"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    assert "description-lengths.parquet" in response.headers["content-disposition"]
+    frame = pl.read_parquet(io.BytesIO(response.content))
+    assert frame["bucket"].to_list() == ["none", "0-31", "32-63", "64-127", "128+"]
+    counts = dict(zip(frame["bucket"], frame["items"], strict=True))
+    assert counts["none"] >= 1
+    assert counts["128+"] >= 1
+    assert frame["share"].sum() == pytest.approx(1)
+
+
+def test_read_report_not_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/user-activity",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 403
+
+
+def test_read_unknown_report(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/unknown",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 422
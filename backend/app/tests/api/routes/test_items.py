@@ -1,10 +1,22 @@
+import csv
+import io
+import json
 import uuid
+from collections.abc import Callable, Sequence
+from typing import Any
 
+import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, col, select, update
 
 from app.core.config import settings
+from app.models import Item
+from app.repositories.item import AsyncItemRepository
+from app.schemas import ItemCreate
+from app.services.item import ItemService
+from app.services.user import UserService
 from app.tests.utils.item import create_random_item
+from app.tests.utils.user import create_random_user
 
 
 def test_create_item(
@@ -79,6 +91,71 @@ def test_read_items(
     assert len(content["data"]) >= 2
 
 
+def test_read_items_approximate_count(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"approximate_count": True},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    # 測試資料量遠低於 APPROXIMATE_COUNT_MIN_ROWS，仍應回傳精確計數
+    assert content["count_exact"] is True
+    assert content["count"] >= 1
+
+
+def test_read_items_without_count(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    client.post(
+        f"{settings.API_V1_STR}/items/",
+        headers=normal_user_token_headers,
+        json={"title": "Uncounted"},
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=normal_user_token_headers,
+        params={"include_count": False},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] is None
+    assert len(content["data"]) >= 1
+
+
+def test_read_items_cursor_pagination(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    for i in range(5):
+        response = client.post(
+            f"{settings.API_V1_STR}/items/",
+            headers=normal_user_token_headers,
+            json={"title": f"Item {i}"},
+        )
+        assert response.status_code == 200
+
+    ids: list[str] = []
+    params: dict[str, str | int] = {"pagination": "cursor", "limit": 2}
+    while True:
+        response = client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers=normal_user_token_headers,
+            params=params,
+        )
+        assert response.status_code == 200
+        content = response.json()
+        ids += [item["id"] for item in content["data"]]
+        if content["next_cursor"] is None:
+            break
+        params = {"cursor": content["next_cursor"], "limit": 2}
+
+    assert [uuid.UUID(i) for i in ids] == sorted(uuid.UUID(i) for i in ids)
+    assert len(ids) == len(set(ids)) == content["count"]
+
+
 def test_update_item(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -162,3 +239,294 @@ def test_delete_item_not_enough_permissions(
     assert response.status_code == 400
     content = response.json()
     assert content["detail"] == "Not enough permissions"
+
+
+def test_batch_items(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    updated_id = create_random_item(db).id
+    deleted_id = create_random_item(db).id
+    missing = uuid.uuid4()
+    operations = [
+        {"op": "create", "item": {"title": "First"}},
+        {"op": "update", "id": str(updated_id), "item": {"title": "Renamed"}},
+        {"op": "delete", "id": str(deleted_id)},
+        {"op": "create", "item": {"title": "Second", "description": "Two"}},
+        {"op": "update", "id": str(missing), "item": {"title": "Nope"}},
+        {"op": "delete", "id": str(missing)},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        headers=superuser_token_headers,
+        json={"operations": operations},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 200, 200, 200, 404, 404]
+    assert results[0]["item"]["title"] == "First"
+    assert results[1]["item"]["title"] == "Renamed"
+    assert results[2]["detail"] == "Item deleted successfully"
+    assert results[3]["item"]["description"] == "Two"
+    assert results[4]["detail"] == "Item not found"
+
+    db.expire_all()
+    updated = db.get(Item, updated_id)
+    assert updated is not None
+    assert updated.title == "Renamed"
+    assert db.get(Item, deleted_id) is None
+    assert db.get(Item, uuid.UUID(results[3]["item"]["id"]))
+
+
+def test_batch_items_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    item_id, title = item.id, item.title
+    operations = [
+        {"op": "update", "id": str(item_id), "item": {"title": "Stolen"}},
+        {"op": "delete", "id": str(item_id)},
+        {"op": "create", "item": {"title": "Mine"}},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        headers=normal_user_token_headers,
+        json={"operations": operations},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [400, 400, 200]
+    assert results[0]["detail"] == "Not enough permissions"
+
+    db.expire_all()
+    stored = db.get(Item, item_id)
+    assert stored is not None
+    assert stored.title == title
+
+
+def test_batch_items_owner_changed_before_write(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    user = UserService(db).get_by_email(settings.EMAIL_TEST_USER)
+    assert user is not None
+    item = ItemService(db).create(
+        item_in=ItemCreate(title="Mine", description=None), owner_id=user.id
+    )
+    item_id, title = item.id, item.title
+    other = create_random_user(db)
+    bulk_create = AsyncItemRepository.bulk_create
+
+    async def transfer_then_create(
+        self: AsyncItemRepository, objs_in: Sequence[Any]
+    ) -> list[Item]:
+        # 模擬批次處理期間，另一個交易在寫入前把物品轉給其他用戶
+        db.execute(
+            update(Item).where(col(Item.id) == item_id).values(owner_id=other.id)
+        )
+        db.commit()
+        return await bulk_create(self, objs_in)
+
+    monkeypatch.setattr(AsyncItemRepository, "bulk_create", transfer_then_create)
+    operations = [
+        {"op": "update", "id": str(item_id), "item": {"title": "Stolen"}},
+        {"op": "delete", "id": str(item_id)},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        headers=normal_user_token_headers,
+        json={"operations": operations},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [400, 400]
+
+    db.expire_all()
+    stored = db.get(Item, item_id)
+    assert stored is not None
+    assert stored.title == title
+    assert stored.owner_id == other.id
+
+
+def test_batch_items_too_many(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "ITEM_BATCH_MAX_SIZE", 1)
+    operations = [{"op": "create", "item": {"title": "Foo"}}] * 2
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        headers=superuser_token_headers,
+        json={"operations": operations},
+    )
+    assert response.status_code == 413
+
+
+def test_export_items_ndjson(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    other_id = create_random_item(db).id
+    response = client.post(
+        f"{settings.API_V1_STR}/items/",
+        headers=normal_user_token_headers,
+        json={"title": "Exported", "description": "Line\nbreak"},
+    )
+    created = response.json()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/items/export", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert {row["owner_id"] for row in rows} == {created["owner_id"]}
+    assert created in rows
+    assert str(other_id) not in {row["id"] for row in rows}
+
+
+def test_export_items_csv_by_owner(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/export",
+        headers=superuser_token_headers,
+        params={"format": "csv", "owner_id": str(item.owner_id)},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows == [
+        ["id", "title", "description", "owner_id"],
+        [str(item.id), item.title, item.description, str(item.owner_id)],
+    ]
+
+
+def test_export_items_other_owner_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/export",
+        headers=normal_user_token_headers,
+        params={"owner_id": str(item.owner_id)},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_import_items_csv(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    owner_id = create_random_user(db).id
+    content = "title,description\nFirst,One\n,Missing title\nSecond,\n"
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers=superuser_token_headers,
+        params={"owner_id": str(owner_id)},
+        files={"file": ("items.csv", content, "text/csv")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["rows"] == 3
+    assert report["imported"] == 2
+    assert report["failed"] == 1
+    assert report["errors"] == [{"line": 3, "error": "title: Field required"}]
+
+    items = db.exec(select(Item).where(Item.owner_id == owner_id)).all()
+    assert sorted((item.title, item.description) for item in items) == [
+        ("First", "One"),
+        ("Second", None),
+    ]
+
+
+def test_import_items_ndjson_rejects_bad_rows(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    owner_id = create_random_user(db).id
+    content = '{"title": "Good"}\nnot json\n{"title": ""}\n'
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers=superuser_token_headers,
+        params={"owner_id": str(owner_id)},
+        files={"file": ("items.ndjson", content, "application/x-ndjson")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (1, 2)
+    assert [error["line"] for error in report["errors"]] == [2, 3]
+
+
+def test_import_items_rejects_rows_copy_cannot_load(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    """NUL 字元與多出的欄位只拒絕該列，不中斷整個匯入"""
+    owner_id = create_random_user(db).id
+    content = 'title,description\n"x\0y",d\nok,fine\nextra,col,umn\n'
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers=superuser_token_headers,
+        params={"owner_id": str(owner_id)},
+        files={"file": ("items.csv", content, "text/csv")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (1, 2)
+    assert report["errors"] == [
+        {"line": 2, "error": "title: text cannot contain NUL characters"},
+        {"line": 4, "error": "row has 1 more column(s) than the header"},
+    ]
+
+    content = '{"title": "ok", "description": "a\\u0000b"}\n{"title": "ok"}\n'
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers=superuser_token_headers,
+        params={"owner_id": str(owner_id)},
+        files={"file": ("items.ndjson", content, "application/x-ndjson")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (1, 1)
+    assert report["errors"] == [
+        {"line": 1, "error": "description: text cannot contain NUL characters"}
+    ]
+    titles = db.exec(select(Item.title).where(Item.owner_id == owner_id)).all()
+    assert sorted(titles) == ["ok", "ok"]
+
+
+def test_import_items_not_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers=normal_user_token_headers,
+        files={"file": ("items.csv", "title\nFoo\n", "text/csv")},
+    )
+    assert response.status_code == 403
+
+
+def test_items_query_budget(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    query_budget: Callable[..., Any],
+) -> None:
+    item = create_random_item(db)
+    # 用戶查詢可能因快取未命中多一個語句
+    with query_budget(3):
+        client.get(f"{settings.API_V1_STR}/items/", headers=superuser_token_headers)
+        client.get(
+            f"{settings.API_V1_STR}/items/{item.id}", headers=superuser_token_headers
+        )
+        client.post(
+            f"{settings.API_V1_STR}/items/",
+            headers=superuser_token_headers,
+            json={"title": "Budget"},
+        )
+        client.put(
+            f"{settings.API_V1_STR}/items/{item.id}",
+            headers=superuser_token_headers,
+            json={"title": "Budget"},
+        )
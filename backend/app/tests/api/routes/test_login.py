@@ -1,10 +1,16 @@
+import time
 from unittest.mock import patch
 
+import anyio
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app.core import security
 from app.core.config import settings
 from app.core.security import verify_password
+from app.main import app
 from app.services.user import UserService
 from app.schemas import UserCreate
 from app.tests.utils.user import user_authentication_headers
@@ -45,6 +51,57 @@ def test_use_access_token(
     assert "email" in result
 
 
+@pytest.mark.anyio
+async def test_login_flood_does_not_starve_threadpool(
+    superuser_token_headers: dict[str, str],
+) -> None:
+    """
+    等待密碼雜湊的登入請求不佔用 anyio 執行緒，其他同步路由照常回應
+
+    執行緒池縮小為 4 條，同時送出 8 個登入請求；雜湊延長為 0.5 秒。
+    """
+    verify = security._verify
+
+    def slow_verify(plain_password: str, hashed_password: str) -> bool:
+        time.sleep(0.5)
+        return verify(plain_password, hashed_password)
+
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    total_tokens = limiter.total_tokens
+    limiter.total_tokens = 4
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+
+            async def login() -> None:
+                r = await client.post(
+                    f"{settings.API_V1_STR}/login/access-token", data=login_data
+                )
+                assert r.status_code == 200
+
+            with patch("app.core.security._verify", slow_verify):
+                async with anyio.create_task_group() as tg:
+                    for _ in range(8):
+                        tg.start_soon(login)
+                    await anyio.sleep(0.1)
+                    start = time.perf_counter()
+                    r = await client.get(
+                        f"{settings.API_V1_STR}/users/me",
+                        headers=superuser_token_headers,
+                    )
+                    elapsed = time.perf_counter() - start
+    finally:
+        limiter.total_tokens = total_tokens
+    assert r.status_code == 200
+    assert elapsed < 0.4
+
+
 def test_recovery_password(
     client: TestClient, normal_user_token_headers: dict[str, str]
 ) -> None:
@@ -61,6 +118,18 @@ def test_recovery_password(
         assert r.json() == {"message": "Password recovery email sent"}
 
 
+def test_recovery_password_requires_email_settings(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.SMTP_HOST", None):
+        r = client.post(
+            f"{settings.API_V1_STR}/password-recovery/{settings.EMAIL_TEST_USER}",
+            headers=normal_user_token_headers,
+        )
+    assert r.status_code == 503
+    assert r.json()["detail"] == "Email delivery is not configured"
+
+
 def test_recovery_password_user_not_exits(
     client: TestClient, normal_user_token_headers: dict[str, str]
 ) -> None:
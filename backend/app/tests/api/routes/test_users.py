@@ -1,4 +1,7 @@
+import asyncio
 import uuid
+from collections.abc import Callable
+from typing import Any
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
@@ -7,8 +10,10 @@ from sqlmodel import Session, select
 from app.services.user import UserService
 from app.core.config import settings
 from app.core.security import verify_password
-from app.models import User
-from app.schemas import UserCreate
+from app.models import Item, User
+from app.schemas import UserCreate, UserDeletionJob
+from app.services.user_deletion import UserDeletionService, user_deletion_jobs
+from app.tests.utils.user import create_random_user
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -174,6 +179,46 @@ def test_retrieve_users(
         assert "email" in item
 
 
+def test_retrieve_users_cursor_pagination(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user_service = UserService(db)
+    for _ in range(3):
+        user_service.create(
+            UserCreate(email=random_email(), password=random_lower_string())
+        )
+
+    emails: list[str] = []
+    params: dict[str, str | int] = {"pagination": "cursor", "limit": 2}
+    while True:
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            params=params,
+        )
+        assert r.status_code == 200
+        page = r.json()
+        assert len(page["data"]) <= 2
+        emails += [user["email"] for user in page["data"]]
+        if page["next_cursor"] is None:
+            break
+        params = {"cursor": page["next_cursor"], "limit": 2}
+
+    assert len(emails) == len(set(emails)) == page["count"]
+
+
+def test_retrieve_users_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+
 def test_update_user_me(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -495,3 +540,165 @@ def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_delete_user_with_items_cascades(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    user_id = user.id
+    db.add_all([Item(title=f"Item {n}", owner_id=user_id) for n in range(3)])
+    db.commit()
+    r = client.delete(
+        f"{settings.API_V1_STR}/users/{user_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    items = db.exec(select(Item).where(Item.owner_id == user_id)).all()
+    assert items == []
+
+
+def test_start_user_deletion(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    user_id = user.id
+    db.add_all([Item(title=f"Item {n}", owner_id=user_id) for n in range(5)])
+    db.commit()
+    with patch("app.core.config.settings.USER_DELETION_CHUNK_SIZE", 2):
+        r = client.post(
+            f"{settings.API_V1_STR}/users/{user_id}/deletion",
+            headers=superuser_token_headers,
+        )
+    assert r.status_code == 202
+    job = r.json()
+    assert job["user_id"] == str(user_id)
+    assert job["total_items"] == 5
+    # TestClient 在回傳前已執行完背景工作
+    r = client.get(
+        f"{settings.API_V1_STR}/users/deletions/{job['id']}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    progress = r.json()
+    assert progress["status"] == "completed"
+    assert progress["deleted_items"] == 5
+    assert progress["finished_at"] is not None
+    db.expire_all()
+    assert db.get(User, user_id) is None
+    assert db.exec(select(Item).where(Item.owner_id == user_id)).all() == []
+
+
+def test_user_deletion_outlives_request_deadline(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    """背景刪除在請求期限過後才開始，仍不受 X-Request-Timeout 限制"""
+    user = create_random_user(db)
+    user_id = user.id
+    db.add(Item(title="Item", owner_id=user_id))
+    db.commit()
+    run = UserDeletionService.run
+
+    async def run_later(
+        self: UserDeletionService, job: UserDeletionJob, chunk_size: int | None
+    ) -> None:
+        await asyncio.sleep(0.3)
+        await run(self, job, chunk_size)
+
+    with patch.object(UserDeletionService, "run", run_later):
+        r = client.post(
+            f"{settings.API_V1_STR}/users/{user_id}/deletion",
+            headers={**superuser_token_headers, "X-Request-Timeout": "200"},
+        )
+    assert r.status_code == 202
+    r = client.get(
+        f"{settings.API_V1_STR}/users/deletions/{r.json()['id']}",
+        headers=superuser_token_headers,
+    )
+    assert r.json()["status"] == "completed"
+    assert r.json()["deleted_items"] == 1
+    db.expire_all()
+    assert db.get(User, user_id) is None
+
+
+def test_running_user_deletion_keeps_user_active(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    """已有進行中的刪除工作時回傳 409，且不會停用用戶"""
+    user = create_random_user(db)
+    running = user_deletion_jobs.add(UserDeletionJob(user_id=user.id))
+    try:
+        r = client.post(
+            f"{settings.API_V1_STR}/users/{user.id}/deletion",
+            headers=superuser_token_headers,
+        )
+    finally:
+        running.status = "failed"
+    assert r.status_code == 409
+    db.refresh(user)
+    assert user.is_active
+
+
+def test_failed_user_deletion_records_exception(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    """沒有訊息的例外也會記錄在工作的 error 上"""
+    user = create_random_user(db)
+    with patch(
+        "app.services.user_deletion.AsyncItemRepository.delete_by_owner",
+        side_effect=TimeoutError(),
+    ):
+        r = client.post(
+            f"{settings.API_V1_STR}/users/{user.id}/deletion",
+            headers=superuser_token_headers,
+        )
+    assert r.status_code == 202
+    r = client.get(
+        f"{settings.API_V1_STR}/users/deletions/{r.json()['id']}",
+        headers=superuser_token_headers,
+    )
+    assert r.json()["status"] == "failed"
+    assert r.json()["error"] == "TimeoutError()"
+
+
+def test_start_user_deletion_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/users/{uuid.uuid4()}/deletion",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "User not found"
+
+
+def test_start_user_deletion_without_privileges(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    r = client.post(
+        f"{settings.API_V1_STR}/users/{user.id}/deletion",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_read_user_deletion_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/deletions/{uuid.uuid4()}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Deletion job not found"
+
+
+def test_users_query_budget(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    query_budget: Callable[..., Any],
+) -> None:
+    with query_budget(3):
+        client.get(f"{settings.API_V1_STR}/users/", headers=superuser_token_headers)
+        client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
@@ -0,0 +1,156 @@
+import uuid
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, func, select
+
+from app.core.config import settings
+from app.models import EmailOutbox, User
+from app.schemas import EmailBroadcast, UserUpdate
+from app.services.email_broadcast import _Throttle, email_broadcasts
+from app.services.user import UserService
+from app.tests.utils.user import create_random_user
+
+BROADCAST = {"subject": "Maintenance", "message": "Down at <b>22:00</b>\nBack soon"}
+
+
+@pytest.fixture
+def send_emails() -> Generator[MagicMock, None, None]:
+    def send(messages: list[tuple[str, Any]]) -> list[None]:
+        return [None] * len(messages)
+
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
+        patch("app.core.config.settings.EMAIL_BROADCAST_BATCH_SIZE", 2),
+        patch("app.core.config.settings.EMAIL_BROADCAST_RATE_PER_SECOND", 0),
+        patch("app.utils.send_emails", side_effect=send) as mock,
+    ):
+        yield mock
+
+
+def test_email_broadcast(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    send_emails: MagicMock,
+) -> None:
+    inactive = create_random_user(db)
+    UserService(db).update(inactive.id, UserUpdate(is_active=False))
+    active_users = db.exec(
+        select(func.count()).select_from(User).where(col(User.is_active).is_(True))
+    ).one()
+
+    r = client.post(
+        f"{settings.API_V1_STR}/utils/email-broadcasts/",
+        headers=superuser_token_headers,
+        json=BROADCAST,
+    )
+    assert r.status_code == 202
+    broadcast_id = r.json()["id"]
+    assert r.json()["total_recipients"] == active_users
+
+    # TestClient 在回應後即執行完背景工作
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/email-broadcasts/{broadcast_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    progress = r.json()
+    assert progress["status"] == "completed"
+    assert progress["sent"] == active_users
+    assert progress["failed"] == 0
+    assert progress["finished_at"] is not None
+
+    batches = [call.args[0] for call in send_emails.call_args_list]
+    assert all(len(batch) <= 2 for batch in batches)
+    recipients = [email for batch in batches for email, _ in batch]
+    assert len(recipients) == active_users
+    assert inactive.email not in recipients
+    assert settings.FIRST_SUPERUSER in recipients
+    # 內容只渲染一次，所有收件者共用
+    contents = {id(data) for batch in batches for _, data in batch}
+    assert len(contents) == 1
+    data = batches[0][0][1]
+    assert data.subject == "Maintenance"
+    assert "Down at &lt;b&gt;22:00&lt;/b&gt;\nBack soon" in data.html_content
+
+
+@pytest.mark.usefixtures("send_emails")
+def test_email_broadcast_already_running(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    running = email_broadcasts.add(EmailBroadcast(subject="Running"))
+    try:
+        r = client.post(
+            f"{settings.API_V1_STR}/utils/email-broadcasts/",
+            headers=superuser_token_headers,
+            json=BROADCAST,
+        )
+    finally:
+        running.status = "completed"
+    assert r.status_code == 409
+    assert r.json()["detail"] == "Email broadcast already running"
+
+
+def test_test_email_requires_email_settings(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    queued = db.exec(select(func.count()).select_from(EmailOutbox)).one()
+    with patch("app.core.config.settings.SMTP_HOST", None):
+        r = client.post(
+            f"{settings.API_V1_STR}/utils/test-email/",
+            headers=superuser_token_headers,
+            params={"email_to": "test@example.com"},
+        )
+    assert r.status_code == 503
+    assert db.exec(select(func.count()).select_from(EmailOutbox)).one() == queued
+
+
+def test_email_broadcast_requires_email_settings(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.SMTP_HOST", None):
+        r = client.post(
+            f"{settings.API_V1_STR}/utils/email-broadcasts/",
+            headers=superuser_token_headers,
+            json=BROADCAST,
+        )
+    assert r.status_code == 503
+
+
+def test_email_broadcast_normal_user_forbidden(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/utils/email-broadcasts/",
+        headers=normal_user_token_headers,
+        json=BROADCAST,
+    )
+    assert r.status_code == 403
+
+
+def test_read_email_broadcast_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/email-broadcasts/{uuid.uuid4()}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Email broadcast not found"
+
+
+@pytest.mark.anyio
+async def test_throttle_spaces_batches() -> None:
+    with (
+        patch("app.services.email_broadcast.time.monotonic", return_value=100.0),
+        patch("app.services.email_broadcast.anyio.sleep") as sleep,
+    ):
+        throttle = _Throttle(rate_per_second=10)
+        await throttle.wait(5)
+        sleep.assert_not_called()
+        await throttle.wait(5)
+        sleep.assert_called_once_with(pytest.approx(0.5))
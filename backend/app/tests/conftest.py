@@ -1,6 +1,8 @@
 from fastapi.testclient import TestClient
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Callable, Generator
+from typing import Any
 from sqlmodel import Session, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # from pytest_mock import MockerFixture
 import pytest
@@ -10,9 +12,11 @@ import pytest
 
 import app.tests.override_settings
 from app.core.config import settings
-from app.core.db import init_db, engine
+from app.core.db import async_engine, init_db, engine
 from app.main import app
-from app.models import Item, User
+from app.models import EmailOutbox, Item, User
+from app.tests.utils.queries import assert_query_budget
+from app.tests.utils.smtp import SMTPStandIn
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
@@ -42,6 +46,7 @@ def db() -> Generator[Session, None, None]:
         init_db(session)
         yield session
         # 清理測試資料
+        session.exec(delete(EmailOutbox))
         statement = delete(Item)
         session.exec(statement)
         statement = delete(User)
@@ -49,6 +54,26 @@ def db() -> Generator[Session, None, None]:
         session.commit()
 
 
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+    # 每個非同步測試使用各自的事件迴圈，連線不能跨迴圈重用
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def smtp_server() -> Generator[SMTPStandIn, None, None]:
+    """本機的 SMTP 伺服器，SMTP_* 設定在測試期間指向它，郵件不會送出本機"""
+    with SMTPStandIn().running() as server:
+        yield server
+
+
 @pytest.fixture(scope="module")
 def client() -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
@@ -65,3 +90,12 @@ def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]
     return authentication_token_from_email(
         client=client, email=settings.EMAIL_TEST_USER, db=db
     )
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., Any]:
+    """
+    用法：`with query_budget(2): client.get(...)`，區塊內每個請求的 SQL 語句數量
+    超過上限或出現 N+1 查詢時測試失敗
+    """
+    return assert_query_budget
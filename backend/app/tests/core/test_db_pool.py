@@ -0,0 +1,41 @@
+"""
+測試連線池設定與統計
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.pool import InstrumentedQueuePool, pool_metrics
+
+
+def test_engine_uses_configured_pool() -> None:
+    """測試引擎依設定建立連線池"""
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.pool.timeout() == settings.DB_POOL_TIMEOUT
+
+
+def test_checkout_is_recorded() -> None:
+    """測試取得與歸還連線會更新統計"""
+    before = pool_metrics.stats(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        during = pool_metrics.stats(engine)
+        assert during["checked_out"] >= 1
+    after = pool_metrics.stats(engine)
+    assert after["checkouts"] == before["checkouts"] + 1
+    assert after["held_ms"]["max"] > 0
+
+
+def test_metrics_expose_db_pool(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """測試連線池統計可透過 metrics 端點取得"""
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/metrics/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    db_pool = r.json()["db_pool"]
+    assert {"checked_out", "overflow", "wait_ms", "timeouts"} <= set(db_pool)
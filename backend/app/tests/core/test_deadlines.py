@@ -0,0 +1,143 @@
+"""
+測試請求期限與 statement_timeout
+"""
+
+import asyncio
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from psycopg.errors import QueryCanceled
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, text
+
+from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.core.deadlines import (
+    DeadlineExceeded,
+    deadline,
+    remaining_ms,
+    request_deadline,
+    without_deadline,
+)
+from app.core.pool import async_pool_metrics, pool_metrics
+from app.services.item import AsyncItemService
+
+
+def test_default_statement_timeout(db: Session) -> None:
+    """測試連線建立時即套用預設的 statement_timeout"""
+    assert db.execute(text("SHOW statement_timeout")).scalar_one() == "30s"
+
+
+def test_deadline_cancels_statement() -> None:
+    """測試超過期限的語句由 PostgreSQL 取消，連線歸還連線池"""
+    checked_out = pool_metrics.stats(engine)["checked_out"]
+    start = time.perf_counter()
+    with request_deadline(200), Session(engine) as session:
+        with pytest.raises(OperationalError) as exc_info:
+            session.execute(text("SELECT pg_sleep(5)"))
+    assert isinstance(exc_info.value.orig, QueryCanceled)
+    assert time.perf_counter() - start < 2
+    assert pool_metrics.stats(engine)["checked_out"] == checked_out
+
+
+def test_deadline_applies_to_every_transaction() -> None:
+    """測試 commit 之後的新交易以剩餘時間重新設定 statement_timeout"""
+    with request_deadline(10_000), Session(engine) as session:
+        first = int(session.execute(text("SHOW statement_timeout")).scalar_one()[:-2])
+        session.commit()
+        time.sleep(0.05)
+        second = int(session.execute(text("SHOW statement_timeout")).scalar_one()[:-2])
+    assert 9_000 < second < first <= 10_000
+
+
+def test_expired_deadline_raises_before_query() -> None:
+    """測試期限已過時不再開始新的交易"""
+    checked_out = pool_metrics.stats(engine)["checked_out"]
+    with request_deadline(1), Session(engine) as session:
+        time.sleep(0.01)
+        with pytest.raises(DeadlineExceeded):
+            session.execute(text("SELECT 1"))
+    assert pool_metrics.stats(engine)["checked_out"] == checked_out
+
+
+def test_without_deadline_clears_request_deadline() -> None:
+    """測試背景工作不沿用已過期的請求期限"""
+
+    @without_deadline
+    def job() -> float | None:
+        with Session(engine) as session:
+            session.execute(text("SELECT 1"))
+        return remaining_ms()
+
+    @without_deadline
+    async def async_job() -> float | None:
+        return remaining_ms()
+
+    with request_deadline(1):
+        time.sleep(0.01)
+        assert job() is None
+        assert asyncio.run(async_job()) is None
+        remaining = remaining_ms()
+        assert remaining is not None and remaining < 0
+
+
+def test_route_deadline_only_tightens() -> None:
+    """測試路由期限只能縮短請求期限"""
+    with request_deadline(100) as current:
+        deadline(60_000)()
+        remaining = current.remaining_ms()
+        assert remaining is not None and remaining <= 100
+        deadline(10)()
+        remaining = current.remaining_ms()
+        assert remaining is not None and remaining <= 10
+
+
+def test_request_timeout_header_returns_504(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """測試 X-Request-Timeout 到期時回傳 504，且連線未外洩"""
+
+    async def slow_page(self: AsyncItemService, **_kwargs: Any) -> Any:
+        await self.repository.session.execute(text("SELECT pg_sleep(5)"))
+
+    pool = async_engine.sync_engine
+    checked_out = async_pool_metrics.stats(pool)["checked_out"]
+    with patch.object(AsyncItemService, "get_page", slow_page):
+        r = client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers={**superuser_token_headers, "X-Request-Timeout": "200"},
+        )
+    assert r.status_code == 504
+    assert r.json()["detail"] == "Request deadline exceeded"
+    assert async_pool_metrics.stats(pool)["checked_out"] == checked_out
+
+
+def test_other_operational_error_returns_503(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """測試非逾時的 OperationalError 回傳 503，而不是當作期限到期"""
+
+    async def lost_connection(_self: AsyncItemService, **_kwargs: Any) -> Any:
+        raise OperationalError(
+            "SELECT 1", {}, Exception("server closed the connection")
+        )
+
+    with patch.object(AsyncItemService, "get_page", lost_connection):
+        r = client.get(f"{settings.API_V1_STR}/items/", headers=superuser_token_headers)
+    assert r.status_code == 503
+    assert r.json()["detail"] == "Database is unavailable, please retry later"
+
+
+@pytest.mark.parametrize("value", ["abc", "0", "-5", "nan"])
+def test_invalid_request_timeout_header(
+    client: TestClient, superuser_token_headers: dict[str, str], value: str
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers={**superuser_token_headers, "X-Request-Timeout": value},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid X-Request-Timeout header"
@@ -0,0 +1,85 @@
+from collections.abc import Generator
+
+import pytest
+
+from app.core.email_metrics import EmailMetrics, Histogram, email_metrics
+from app.tests.utils.smtp import SMTPStandIn
+from app.utils import (
+    EmailData,
+    EmailSendError,
+    render_email_template,
+    send_email,
+    send_emails,
+)
+
+
+@pytest.fixture
+def metrics() -> Generator[EmailMetrics, None, None]:
+    email_metrics.reset()
+    yield email_metrics
+    email_metrics.reset()
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram([1, 10])
+    for seconds in (0.0005, 0.001, 0.005, 0.02):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["max_ms"] == 20
+    assert snapshot["avg_ms"] == pytest.approx(6.625)
+    # 上界包含在區間內
+    assert snapshot["buckets"] == {"le_1": 2, "le_10": 3, "le_inf": 4}
+
+
+def test_empty_histogram() -> None:
+    assert Histogram([1]).snapshot() == {
+        "count": 0,
+        "avg_ms": 0.0,
+        "max_ms": 0.0,
+        "buckets": {"le_1": 0, "le_inf": 0},
+    }
+
+
+def test_render_latency_per_template(metrics: EmailMetrics) -> None:
+    context = {"project_name": "Test", "username": "user@example.com"}
+    for _ in range(2):
+        render_email_template(template_name="test_email.html", context=context)
+
+    render = metrics.stats()["render_latency"]
+    assert list(render) == ["test_email.html"]
+    assert render["test_email.html"]["count"] == 2
+
+
+def test_send_success_and_failure(
+    smtp_server: SMTPStandIn, metrics: EmailMetrics
+) -> None:
+    send_email(email_to="a@example.com", subject="hi", html_content="<p>hi</p>")
+    with pytest.raises(EmailSendError):
+        send_email(email_to="refused@example.com", subject="hi", html_content="<p>")
+
+    stats = metrics.stats()
+    assert smtp_server.recipients == ["a@example.com"]
+    assert stats["sent"] == 1
+    assert stats["failed"] == 1
+    assert stats["failure_rate"] == 0.5
+    assert stats["send_latency"]["count"] == 2
+
+
+@pytest.mark.usefixtures("smtp_server")
+def test_bulk_send_records_each_message(metrics: EmailMetrics) -> None:
+    data = EmailData(html_content="<p>hi</p>", subject="hi")
+    errors = send_emails(
+        [
+            ("a@example.com", data),
+            ("refused@example.com", data),
+            ("b@example.com", data),
+        ]
+    )
+
+    stats = metrics.stats()
+    assert [error is None for error in errors] == [True, False, True]
+    assert stats["sent"] == 2
+    assert stats["failed"] == 1
+    assert stats["send_latency"]["count"] == 3
@@ -0,0 +1,74 @@
+import os
+from pathlib import Path
+
+import pytest
+from jinja2 import Template
+
+from app.core import email_templates
+from app.utils import render_email_template
+
+TEMPLATE_NAMES = sorted(
+    path.name for path in email_templates.TEMPLATES_DIR.glob("*.html")
+)
+
+CONTEXT = {
+    "project_name": "Project",
+    "username": "user@example.com",
+    "email": "user@example.com",
+    "password": "secret",
+    "valid_hours": 48,
+    "link": "http://localhost/reset-password?token=a&b",
+    "message": "Line <1>\nLine 2",
+}
+
+
+@pytest.mark.parametrize("template_name", TEMPLATE_NAMES)
+def test_render_matches_uncached_template(template_name: str) -> None:
+    source = (email_templates.TEMPLATES_DIR / template_name).read_text()
+    expected = Template(source).render(CONTEXT)
+
+    assert render_email_template(template_name=template_name, context=CONTEXT) == (
+        expected
+    )
+
+
+def test_templates_are_compiled_once() -> None:
+    environment = email_templates.create_environment()
+
+    assert email_templates.precompile(environment) == len(TEMPLATE_NAMES)
+    template = environment.get_template("test_email.html")
+    assert environment.get_template("test_email.html") is template
+
+
+def _write(path: Path, content: str, mtime: int) -> None:
+    path.write_text(content)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.mark.parametrize("auto_reload", [True, False])
+def test_auto_reload(tmp_path: Path, auto_reload: bool) -> None:
+    template_path = tmp_path / "hello.html"
+    _write(template_path, "Hello {{ name }}", 1_000_000)
+    environment = email_templates.create_environment(
+        auto_reload=auto_reload, templates_dir=tmp_path
+    )
+    assert environment.get_template("hello.html").render(name="a") == "Hello a"
+
+    _write(template_path, "Bye {{ name }}", 2_000_000)
+
+    expected = "Bye a" if auto_reload else "Hello a"
+    assert environment.get_template("hello.html").render(name="a") == expected
+
+
+def test_bytecode_cache_is_written(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "bytecode"
+    environment = email_templates.create_environment(bytecode_cache_dir=str(cache_dir))
+
+    email_templates.precompile(environment)
+
+    assert len(list(cache_dir.iterdir())) == len(TEMPLATE_NAMES)
+    # 新的 Environment 從磁碟快取載入，渲染結果相同
+    reloaded = email_templates.create_environment(bytecode_cache_dir=str(cache_dir))
+    assert reloaded.get_template("test_email.html").render(CONTEXT) == (
+        render_email_template(template_name="test_email.html", context=CONTEXT)
+    )
@@ -0,0 +1,38 @@
+"""
+測試行程內的背景工作登錄
+"""
+
+import pytest
+
+from app.core.jobs import JobRegistry
+from app.schemas import BackgroundJob
+
+
+def test_conflicting_active_job_is_rejected() -> None:
+    jobs: JobRegistry[BackgroundJob] = JobRegistry(max_jobs=10)
+    running = jobs.add(BackgroundJob())
+
+    with pytest.raises(ValueError):
+        jobs.add(BackgroundJob())
+    # 只與 conflicts 判斷為衝突的工作互斥
+    other = jobs.add(BackgroundJob(), conflicts=lambda job: job.id != running.id)
+    assert jobs.get(other.id) == other
+
+    running.status = "completed"
+    other.status = "failed"
+    assert jobs.add(BackgroundJob()).status == "pending"
+
+
+def test_oldest_finished_jobs_are_pruned() -> None:
+    jobs: JobRegistry[BackgroundJob] = JobRegistry(max_jobs=2)
+    first = jobs.add(BackgroundJob())
+    first.status = "completed"
+    second = jobs.add(BackgroundJob())
+    second.status = "failed"
+    third = jobs.add(BackgroundJob())
+
+    assert jobs.get(first.id) is None
+    assert jobs.get(second.id) == second
+    # 進度以複本回傳，查詢端無法修改
+    copy = jobs.get(third.id)
+    assert copy == third and copy is not third
@@ -0,0 +1,44 @@
+"""
+測試密碼雜湊執行器
+"""
+
+import threading
+
+import pytest
+
+from app.core.password_hasher import PasswordHasher, PasswordHasherBusyError
+from app.core.security import get_password_hash, password_hasher, verify_password
+
+
+def test_hash_and_verify_run_on_hasher() -> None:
+    """測試雜湊與驗證經由專用執行器執行"""
+    completed = password_hasher.stats()["completed"]
+    hashed = get_password_hash("some-password")
+    assert verify_password("some-password", hashed)
+    assert not verify_password("other-password", hashed)
+    assert password_hasher.stats()["completed"] == completed + 3
+
+
+def test_rejects_when_queue_is_full() -> None:
+    """測試執行中與排隊中的工作達上限時立即拒絕"""
+    hasher = PasswordHasher(workers=1, queue_size=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block() -> None:
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=hasher.run, args=(block,))
+    worker.start()
+    started.wait(5)
+    try:
+        assert hasher.stats()["in_flight"] == 1
+        with pytest.raises(PasswordHasherBusyError):
+            hasher.run(block)
+        assert hasher.stats()["rejected"] == 1
+    finally:
+        release.set()
+        worker.join()
+        hasher.shutdown()
+    assert hasher.stats()["completed"] == 1
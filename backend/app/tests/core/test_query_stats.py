@@ -0,0 +1,83 @@
+"""
+測試每個請求的 SQL 統計與 N+1 偵測
+"""
+
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.query_stats import fingerprint, query_recorder
+from app.models import Item, User
+from app.tests.utils.item import create_random_item
+
+
+def test_fingerprint_ignores_parameters() -> None:
+    """測試只有參數不同的語句得到相同的指紋"""
+    first = fingerprint(
+        'SELECT "user".id FROM "user"\n WHERE "user".id = %(id_1)s::UUID LIMIT 10'
+    )
+    second = fingerprint(
+        'SELECT "user".id FROM "user" WHERE "user".id = \'abc\' LIMIT 20'
+    )
+    assert first == second == 'SELECT "user".id FROM "user" WHERE "user".id = ? LIMIT ?'
+    assert fingerprint("SELECT 1 WHERE id IN (%s, %s, %s)") == fingerprint(
+        "SELECT 1 WHERE id IN (%s)"
+    )
+
+
+def test_record_detects_repeated_queries(db: Session) -> None:
+    """測試逐筆查詢會被標記為重複執行的語句"""
+    ids = [create_random_item(db).id for _ in range(3)]
+    with query_recorder.record() as stats:
+        for id in ids:
+            db.exec(select(Item).where(Item.id == id)).one()
+        db.exec(select(User).limit(1)).all()
+    assert stats.statements == 4
+    assert stats.total_seconds > 0
+    repeated = stats.repeated(3)
+    assert list(repeated.values()) == [3]
+    assert "FROM item" in next(iter(repeated))
+
+
+def test_queries_outside_record_are_ignored(db: Session) -> None:
+    """測試 record() 區塊之外執行的語句不會被計入"""
+    with query_recorder.record() as stats:
+        pass
+    db.exec(select(User).limit(1)).all()
+    assert stats.statements == 0
+
+
+@pytest.mark.anyio
+async def test_record_async_session(async_db: AsyncSession) -> None:
+    """測試非同步引擎的語句也會被計入"""
+    with query_recorder.record() as stats:
+        await async_db.exec(select(User).where(User.id == uuid.uuid4()))
+    assert stats.statements == 1
+
+
+def test_response_headers(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """測試非 production 環境以回應標頭回報 SQL 統計"""
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    assert int(r.headers["X-DB-Queries"]) >= 1
+    assert float(r.headers["X-DB-Time-Ms"]) > 0
+    assert "X-DB-Repeated-Queries" not in r.headers
+
+
+def test_query_budget_fails_when_exceeded(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    query_budget: Callable[..., Any],
+) -> None:
+    """測試查詢預算超出時會使測試失敗"""
+    with pytest.raises(AssertionError, match="exceed the budget of 0"):
+        with query_budget(0):
+            client.get(f"{settings.API_V1_STR}/items/", headers=superuser_token_headers)
@@ -0,0 +1,114 @@
+"""
+測試慢查詢記錄與執行計畫擷取
+"""
+
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select, text
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.slow_queries import redact_parameters, slow_query_log
+from app.models import User
+from app.repositories.email_outbox import EmailOutboxRepository
+from app.tests.utils.item import create_random_item
+
+
+@pytest.fixture
+def slow_queries() -> Generator[list[dict[str, Any]], None, None]:
+    """把門檻降到幾乎為 0，收集所有慢查詢記錄的 extra 欄位"""
+    records: list[dict[str, Any]] = []
+    handler_id = logger.configure_output(
+        lambda message: records.append(message.record["extra"]),
+        level="WARNING",
+        filter=lambda record: record["extra"].get("slow_query", False),
+    )
+    with patch("app.core.config.settings.SLOW_QUERY_THRESHOLD_MS", 0.001):
+        yield records
+    logger.remove_output(handler_id)
+
+
+def test_redact_parameters() -> None:
+    """測試參數值被替換為型別名稱"""
+    assert redact_parameters({"email_1": "a@example.com", "param_1": 10}) == {
+        "email_1": "str",
+        "param_1": "int",
+    }
+    assert redact_parameters([{"id": 1}, {"id": 2}], executemany=True) == {
+        "rows": 2,
+        "first": {"id": "int"},
+    }
+
+
+def test_slow_query_is_logged(db: Session, slow_queries: list[dict[str, Any]]) -> None:
+    """測試超過門檻的語句以正規化 SQL 與遮蔽的參數記錄"""
+    db.exec(select(User).where(User.email == "secret@example.com")).all()
+    [record] = [r for r in slow_queries if 'FROM "user"' in r["sql"]]
+    assert "secret@example.com" not in str(record)
+    assert record["parameters"] == {"email_1": "str"}
+    assert record["duration_ms"] > 0
+    assert record["route"] == "-"
+
+
+def test_slow_query_records_route(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    slow_queries: list[dict[str, Any]],
+) -> None:
+    """測試請求中的慢查詢記錄發出語句的路由"""
+    item = create_random_item(db)
+    r = client.get(
+        f"{settings.API_V1_STR}/items/{item.id}", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    routes = {record["route"] for record in slow_queries}
+    assert f"GET {settings.API_V1_STR}/items/{{id}}" in routes
+
+
+def test_threshold_disabled(db: Session) -> None:
+    """測試門檻為 0 時停用慢查詢記錄"""
+    before = slow_query_log.stats()["slow_queries"]
+    with patch("app.core.config.settings.SLOW_QUERY_THRESHOLD_MS", 0):
+        db.exec(select(User).limit(1)).all()
+    assert slow_query_log.stats()["slow_queries"] == before
+
+
+@pytest.mark.usefixtures("slow_queries")
+def test_explain_is_written_to_file(db: Session, tmp_path: Path) -> None:
+    """測試抽樣的慢查詢以 EXPLAIN (ANALYZE, BUFFERS) 寫入檔案，且不影響原交易"""
+    explain_file = tmp_path / "slow_queries.log"
+    with (
+        patch("app.core.config.settings.SLOW_QUERY_EXPLAIN_FILE", str(explain_file)),
+        patch("app.core.config.settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1.0),
+    ):
+        db.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).one()
+        # 更新語句不會被 EXPLAIN ANALYZE 再執行一次
+        db.execute(text("UPDATE item SET title = title WHERE false"))
+        assert db.execute(text("SELECT 1")).scalar_one() == 1
+        db.rollback()
+    slow_query_log.close()
+    content = explain_file.read_text()
+    assert 'FROM "user" WHERE "user".email = ?' in content
+    assert "actual time" in content
+    assert "UPDATE item" not in content
+
+
+@pytest.mark.usefixtures("slow_queries")
+def test_data_modifying_cte_is_not_explained(db: Session, tmp_path: Path) -> None:
+    """測試以 WITH 開頭的寄件匣領取語句不會被 EXPLAIN ANALYZE 再執行一次"""
+    explain_file = tmp_path / "slow_queries.log"
+    with (
+        patch("app.core.config.settings.SLOW_QUERY_EXPLAIN_FILE", str(explain_file)),
+        patch("app.core.config.settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1.0),
+        patch.object(slow_query_log, "_explain") as explain,
+    ):
+        # 不領取任何郵件，只執行領取語句
+        assert EmailOutboxRepository(db).claim(0, 60) == []
+    explained = [call.args[1] for call in explain.call_args_list]
+    assert not [sql for sql in explained if "email_outbox" in sql]
@@ -0,0 +1,114 @@
+import socket
+from unittest.mock import patch
+
+import pytest
+
+from app.core.smtp import Envelope, SMTPPool
+from app.tests.utils.smtp import SMTPStandIn
+from app.utils import EmailData, EmailSendError, send_email, send_emails
+
+
+@pytest.fixture
+def pool(smtp_server: SMTPStandIn) -> SMTPPool:
+    return smtp_server.pool
+
+
+def _envelope(email_to: str) -> Envelope:
+    return Envelope("from@example.com", [email_to], b"Subject: hi\r\n\r\nbody\r\n")
+
+
+def _break_idle_connection(pool: SMTPPool) -> None:
+    """模擬伺服器斷開閒置連線"""
+    (idle,) = pool._idle.values()
+    sock = idle[-1].smtp.sock
+    assert sock is not None
+    sock.shutdown(socket.SHUT_RDWR)
+
+
+def test_connection_is_reused(smtp_server: SMTPStandIn, pool: SMTPPool) -> None:
+    send_email(email_to="a@example.com", subject="first", html_content="<p>1</p>")
+    send_email(email_to="b@example.com", subject="second", html_content="<p>2</p>")
+
+    assert [m.rcpt_tos for m in smtp_server.messages] == [
+        ["a@example.com"],
+        ["b@example.com"],
+    ]
+    assert b"Subject: first" in smtp_server.messages[0].content
+    stats = pool.stats()
+    assert stats["opened"] == 1
+    assert stats["reused"] == 1
+    assert stats["idle"] == 1
+
+
+def test_send_many_uses_one_connection(
+    smtp_server: SMTPStandIn, pool: SMTPPool
+) -> None:
+    data = EmailData(html_content="<p>hi</p>", subject="bulk")
+    errors = send_emails(
+        [
+            ("a@example.com", data),
+            ("refused@example.com", data),
+            ("b@example.com", data),
+        ]
+    )
+
+    assert errors[0] is None
+    assert isinstance(errors[1], EmailSendError)
+    assert errors[2] is None
+    assert [m.rcpt_tos for m in smtp_server.messages] == [
+        ["a@example.com"],
+        ["b@example.com"],
+    ]
+    assert pool.stats()["opened"] == 1
+
+
+@pytest.mark.usefixtures("smtp_server")
+def test_refused_recipient_raises(pool: SMTPPool) -> None:
+    with pytest.raises(EmailSendError):
+        send_email(email_to="refused@example.com", subject="s", html_content="x")
+    # 被拒的郵件不影響連線，仍放回連線池
+    assert pool.stats()["idle"] == 1
+
+
+def test_stale_connection_is_replaced_after_noop(
+    smtp_server: SMTPStandIn, pool: SMTPPool
+) -> None:
+    pool.send(_envelope("a@example.com"))
+    _break_idle_connection(pool)
+
+    with patch("app.core.config.settings.SMTP_POOL_NOOP_AFTER_SECONDS", -1):
+        pool.send(_envelope("b@example.com"))
+
+    assert len(smtp_server.messages) == 2
+    stats = pool.stats()
+    assert stats["opened"] == 2
+    assert stats["discarded"] == 1
+
+
+def test_disconnect_during_send_is_retried(
+    smtp_server: SMTPStandIn, pool: SMTPPool
+) -> None:
+    pool.send(_envelope("a@example.com"))
+    _break_idle_connection(pool)
+
+    errors = pool.send_many([_envelope("b@example.com"), _envelope("c@example.com")])
+
+    assert errors == [None, None]
+    assert [m.rcpt_tos for m in smtp_server.messages] == [
+        ["a@example.com"],
+        ["b@example.com"],
+        ["c@example.com"],
+    ]
+    assert pool.stats()["opened"] == 2
+
+
+@pytest.mark.usefixtures("smtp_server")
+def test_idle_connections_are_closed_after_max_idle(pool: SMTPPool) -> None:
+    pool.send(_envelope("a@example.com"))
+
+    with patch("app.core.config.settings.SMTP_POOL_MAX_IDLE_SECONDS", -1):
+        pool.send(_envelope("b@example.com"))
+
+    stats = pool.stats()
+    assert stats["opened"] == 2
+    assert stats["reused"] == 0
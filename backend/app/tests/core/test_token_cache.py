@@ -0,0 +1,50 @@
+"""
+測試 JWT 內容快取功能
+"""
+
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.core.security import create_access_token, decode_access_token
+from app.core.token_cache import TokenPayloadCache, token_cache
+from app.schemas import TokenPayload
+
+
+def test_cache_hit_skips_signature_verification() -> None:
+    """測試快取命中時不再呼叫 jwt.decode"""
+    token = create_access_token("some-user", timedelta(minutes=5))
+    token_cache.clear()
+    assert decode_access_token(token).sub == "some-user"
+
+    with patch("app.core.security.jwt.decode") as decode_mock:
+        assert decode_access_token(token).sub == "some-user"
+        decode_mock.assert_not_called()
+    assert token_cache.hits == 1
+
+
+def test_entry_expires_at_token_exp() -> None:
+    """測試項目於令牌的 exp 時間過期"""
+    cache = TokenPayloadCache(max_size=10)
+    cache.set("token", TokenPayload(sub="a"), time.time() + 0.01)
+    assert cache.get("token") is not None
+    time.sleep(0.02)
+    assert cache.get("token") is None
+
+
+def test_expired_token_is_not_cached() -> None:
+    """測試已過期的令牌不會寫入快取"""
+    cache = TokenPayloadCache(max_size=10)
+    cache.set("token", TokenPayload(sub="a"), time.time() - 1)
+    assert cache.stats()["size"] == 0
+
+
+def test_bounded_size() -> None:
+    """測試超過容量時淘汰最久未使用的項目"""
+    cache = TokenPayloadCache(max_size=2)
+    expires_at = time.time() + 60
+    for token in ("a", "b", "c"):
+        cache.set(token, TokenPayload(sub=token), expires_at)
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
@@ -0,0 +1,177 @@
+"""
+測試用戶快取功能
+"""
+
+import time
+from collections.abc import Generator
+from unittest.mock import patch
+
+import psycopg
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.user_cache import UserCache, user_cache
+from app.schemas import UserCreate, UserUpdate
+from app.services.user import AsyncUserService
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import random_email, random_lower_string
+
+CHANNEL = "user_cache_test"
+
+
+@pytest.fixture
+def listener() -> Generator[psycopg.Connection, None, None]:
+    conninfo = engine.url.set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+    with psycopg.connect(conninfo, autocommit=True) as conn:
+        conn.execute(f"LISTEN {CHANNEL}")
+        yield conn
+
+
+def _payloads(listener: psycopg.Connection) -> list[str]:
+    return [notify.payload for notify in listener.notifies(timeout=0.2, stop_after=1)]
+
+
+def test_get_returns_user_attached_to_session(db: Session) -> None:
+    """測試快取命中時回傳附加於 session 的用戶"""
+    user = create_random_user(db)
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    assert cache.get(db, user.id) is None
+
+    cache.set(user)
+    cached = cache.get(db, user.id)
+    assert cached is not None
+    assert cached.id == user.id
+    assert cached.email == user.email
+    assert cached in db
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_expired_entry_is_a_miss(db: Session) -> None:
+    """測試過期項目視為未命中"""
+    user = create_random_user(db)
+    cache = UserCache(max_size=10, ttl_seconds=0.01)
+    cache.set(user)
+    time.sleep(0.02)
+    assert cache.get(db, user.id) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction(db: Session) -> None:
+    """測試超過容量時淘汰最久未使用的項目"""
+    users = [create_random_user(db) for _ in range(3)]
+    cache = UserCache(max_size=2, ttl_seconds=60)
+    cache.set(users[0])
+    cache.set(users[1])
+    assert cache.get(db, users[0].id) is not None
+    cache.set(users[2])
+
+    assert cache.get(db, users[1].id) is None
+    assert cache.get(db, users[0].id) is not None
+    assert cache.get(db, users[2].id) is not None
+    assert cache.evictions == 1
+
+
+def test_invalidate(db: Session) -> None:
+    """測試失效後不再命中"""
+    user = create_random_user(db)
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    cache.set(user)
+    cache.invalidate(user.id)
+    assert cache.get(db, user.id) is None
+    assert cache.invalidations == 1
+
+
+def test_invalidation_waits_for_commit(
+    db: Session, listener: psycopg.Connection
+) -> None:
+    """測試 commit 前不通知其他 worker、也不清除本行程的快取"""
+    user = create_random_user(db)
+    cache = UserCache(max_size=10, ttl_seconds=60, channel=CHANNEL)
+    cache.set(user)
+
+    user.full_name = "Uncommitted"
+    db.add(user)
+    cache.invalidate_on_commit(db, user.id)
+    db.flush()
+    assert _payloads(listener) == []
+    assert cache.stats()["size"] == 1
+
+    db.commit()
+    assert _payloads(listener) == [str(user.id)]
+    assert cache.get(db, user.id) is None
+
+
+def test_rolled_back_invalidation_is_discarded(
+    db: Session, listener: psycopg.Connection
+) -> None:
+    """測試交易 rollback 後不送出通知，也不影響之後的 commit"""
+    user = create_random_user(db)
+    cache = UserCache(max_size=10, ttl_seconds=60, channel=CHANNEL)
+    cache.set(user)
+
+    user.full_name = "Rolled back"
+    db.add(user)
+    cache.invalidate_on_commit(db, user.id)
+    db.flush()
+    db.rollback()
+    db.commit()
+
+    assert _payloads(listener) == []
+    assert cache.stats()["size"] == 1
+
+
+@pytest.mark.anyio
+async def test_async_update_notifies_on_callers_connection(
+    async_db: AsyncSession, listener: psycopg.Connection
+) -> None:
+    """測試非同步服務以呼叫端的 AsyncSession 送出通知，不使用同步引擎"""
+    user_service = AsyncUserService(async_db)
+    user = await user_service.create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    with (
+        patch.object(user_cache, "channel", CHANNEL),
+        patch.object(engine, "connect", side_effect=AssertionError("sync engine")),
+    ):
+        await user_service.update(user.id, UserUpdate(full_name="Async Name"))
+
+    assert _payloads(listener) == [str(user.id)]
+
+
+def test_update_me_is_visible_on_next_request(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    """測試更新自己的資料後，下一個請求不會讀到快取中的舊資料"""
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.status_code == 200
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/me",
+        headers=normal_user_token_headers,
+        json={"full_name": "Cached Name"},
+    )
+    assert r.status_code == 200
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.json()["full_name"] == "Cached Name"
+
+
+def test_metrics_expose_user_cache_counters(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """測試快取統計數據可透過 metrics 端點取得"""
+    client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/metrics/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    stats = r.json()["user_cache"]
+    assert stats["hits"] + stats["misses"] >= 1
+    assert {"hits", "misses", "hit_ratio", "evictions", "invalidations"} <= set(stats)
@@ -0,0 +1,46 @@
+"""
+以 EXPLAIN 確認熱門查詢使用索引
+"""
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.tests.utils.item import create_random_item
+from app.tests.utils.user import create_random_user
+
+
+def explain(session: Session, sql: str, **params: object) -> str:
+    # 測試資料量很小，規劃器會傾向循序掃描；停用後才能確認索引可被使用。
+    # 使用 SET LOCAL 並與 EXPLAIN 放在同一個交易中：commit 後 session 可能換到
+    # 連線池中的另一個連線，連線層級的 SET 不一定還有效
+    session.execute(text("SET LOCAL enable_seqscan = off"))
+    rows = session.execute(text(f"EXPLAIN {sql}"), params).all()
+    session.rollback()
+    return "\n".join(row[0] for row in rows)
+
+
+def test_get_by_email_uses_unique_index(db: Session) -> None:
+    user = create_random_user(db)
+    plan = explain(db, 'SELECT * FROM "user" WHERE email = :email', email=user.email)
+    assert "ix_user_email" in plan
+
+
+def test_items_by_owner_use_owner_index(db: Session) -> None:
+    item = create_random_item(db)
+    plan = explain(
+        db,
+        "SELECT * FROM item WHERE owner_id = :owner_id ORDER BY id LIMIT 10",
+        owner_id=item.owner_id,
+    )
+    assert "ix_item_owner_id_id" in plan
+    assert "Sort" not in plan
+
+
+def test_count_by_owner_uses_owner_index(db: Session) -> None:
+    item = create_random_item(db)
+    plan = explain(
+        db,
+        "SELECT count(*) FROM item WHERE owner_id = :owner_id",
+        owner_id=item.owner_id,
+    )
+    assert "ix_item_owner_id_id" in plan
@@ -0,0 +1,90 @@
+"""
+測試以 RETURNING 寫入與 unit_of_work 交易合併
+"""
+
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.models import Item
+from app.repositories import ItemRepository, unit_of_work
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import random_lower_string
+
+
+@pytest.fixture
+def statements() -> Generator[list[str], None, None]:
+    executed: list[str] = []
+
+    def record(*args: object) -> None:
+        executed.append(str(args[2]).split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_create_returns_row_without_refresh(db: Session, statements: list[str]) -> None:
+    """測試建立項目只需一個 INSERT ... RETURNING，不會再 SELECT"""
+    owner_id = create_random_user(db).id
+    statements.clear()
+
+    with Session(engine, expire_on_commit=False) as session:
+        item = ItemRepository(session).create_with_owner(
+            {"title": random_lower_string()}, owner_id=owner_id
+        )
+        assert item.id
+        assert item.owner_id == owner_id
+    assert statements == ["INSERT"]
+
+
+def test_update_returns_row_without_refresh(db: Session, statements: list[str]) -> None:
+    """測試更新項目只需一個 UPDATE ... RETURNING"""
+    user = create_random_user(db)
+    with Session(engine, expire_on_commit=False) as session:
+        repository = ItemRepository(session)
+        item = repository.create_with_owner({"title": "Old"}, owner_id=user.id)
+        session.expunge_all()
+        statements.clear()
+
+        updated = repository.update(item.id, {"title": "New"})
+        assert updated
+        assert updated.title == "New"
+    assert statements == ["UPDATE"]
+
+
+def test_unit_of_work_commits_once(db: Session) -> None:
+    """測試 unit_of_work 區塊內的多次寫入在區塊結束時一起 commit"""
+    user = create_random_user(db)
+    commits: list[Session] = []
+
+    with Session(engine, expire_on_commit=False) as session:
+        event.listen(session, "after_commit", commits.append)
+        repository = ItemRepository(session)
+        with unit_of_work(session):
+            first = repository.create_with_owner({"title": "A"}, owner_id=user.id)
+            second = repository.create_with_owner({"title": "B"}, owner_id=user.id)
+            repository.update(first.id, {"title": "A2"})
+            assert commits == []
+        assert len(commits) == 1
+
+    assert db.get(Item, first.id)
+    assert db.get(Item, second.id)
+
+
+def test_unit_of_work_rolls_back_on_error(db: Session) -> None:
+    """測試 unit_of_work 區塊內發生例外時所有寫入都被撤銷"""
+    user = create_random_user(db)
+
+    with Session(engine) as session:
+        repository = ItemRepository(session)
+        with pytest.raises(RuntimeError):
+            with unit_of_work(session):
+                item = repository.create_with_owner({"title": "A"}, owner_id=user.id)
+                item_id = item.id
+                raise RuntimeError("abort")
+
+    assert ItemRepository(db).get_by_id(item_id) is None
@@ -0,0 +1,69 @@
+"""
+測試 AsyncUserService 與 AsyncItemService 功能
+"""
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.schemas import ItemCreate, ItemUpdate, UserCreate, UserUpdate
+from app.services.item import AsyncItemService
+from app.services.user import AsyncUserService
+from app.tests.utils.utils import random_email, random_lower_string
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_and_authenticate_user(async_db: AsyncSession) -> None:
+    """測試非同步創建用戶並驗證密碼"""
+    email = random_email()
+    password = random_lower_string()
+    user_service = AsyncUserService(async_db)
+    user = await user_service.create(UserCreate(email=email, password=password))
+    assert user.email == email
+
+    assert await user_service.authenticate(email, password)
+    assert await user_service.authenticate(email, "wrong-password") is None
+
+    with pytest.raises(ValueError):
+        await user_service.create(UserCreate(email=email, password=password))
+
+
+async def test_update_user(async_db: AsyncSession) -> None:
+    """測試非同步更新用戶"""
+    user_service = AsyncUserService(async_db)
+    user = await user_service.create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    updated = await user_service.update(user.id, UserUpdate(full_name="Async Name"))
+    assert updated
+    assert updated.full_name == "Async Name"
+
+
+async def test_item_crud_and_pages(async_db: AsyncSession) -> None:
+    """測試非同步物品的建立、分頁、更新與刪除"""
+    user_service = AsyncUserService(async_db)
+    user = await user_service.create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    item_service = AsyncItemService(async_db)
+    for _ in range(3):
+        await item_service.create(ItemCreate(title=random_lower_string()), user.id)
+
+    items, count, count_exact = await item_service.get_page(
+        skip=0, limit=2, owner_id=user.id
+    )
+    assert len(items) == 2
+    assert count == 3
+    assert count_exact
+
+    first, cursor = await item_service.get_page_after(limit=2, owner_id=user.id)
+    assert cursor
+    rest, cursor = await item_service.get_page_after(cursor, limit=2, owner_id=user.id)
+    assert cursor is None
+    assert len({item.id for item in first + rest}) == 3
+
+    updated = await item_service.update(first[0].id, ItemUpdate(title="new"), user)
+    assert updated
+    assert updated.title == "new"
+    assert await item_service.delete(first[0].id, user)
+    assert await item_service.count_by_owner(user.id) == 2
@@ -0,0 +1,41 @@
+"""
+測試群發郵件服務
+"""
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.schemas import EmailBroadcast
+from app.services.email_broadcast import EmailBroadcastService
+from app.utils import EmailData
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_no_transaction_is_open_while_sending(async_db: AsyncSession) -> None:
+    """每批收件者各自一個短交易，寄送與等待期間不持有交易或連線"""
+    in_transaction: list[bool] = []
+    recipients: list[str] = []
+
+    def send(messages: list[tuple[str, Any]]) -> list[None]:
+        in_transaction.append(async_db.in_transaction())
+        recipients.extend(email for email, _ in messages)
+        return [None] * len(messages)
+
+    job = EmailBroadcast(subject="hi")
+    with (
+        patch("app.core.config.settings.EMAIL_BROADCAST_RATE_PER_SECOND", 0),
+        patch("app.utils.send_emails", side_effect=send),
+    ):
+        await EmailBroadcastService(async_db).run(
+            job, EmailData(html_content="<p>hi</p>", subject="hi"), batch_size=1
+        )
+
+    assert job.status == "completed"
+    assert job.sent == len(recipients) > 1
+    assert in_transaction and not any(in_transaction)
+    # keyset 分頁依 email 排序，不重複也不遺漏
+    assert recipients == sorted(set(recipients))
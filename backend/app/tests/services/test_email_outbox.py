@@ -0,0 +1,268 @@
+"""
+測試郵件寄件匣與背景 worker
+"""
+
+import time
+from collections.abc import Generator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, delete, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.email_metrics import email_metrics
+from app.models import EmailOutbox
+from app.services.email_outbox import (
+    EmailOutboxService,
+    EmailOutboxWorker,
+    backoff_seconds,
+)
+from app.tests.utils.smtp import SMTPStandIn
+from app.utils import EmailSendError
+
+
+@pytest.fixture
+def outbox(db: Session) -> Generator[EmailOutboxService, None, None]:
+    db.exec(delete(EmailOutbox))
+    db.commit()
+    yield EmailOutboxService(db)
+    db.exec(delete(EmailOutbox))
+    db.commit()
+
+
+@pytest.fixture
+def send_email() -> Generator[MagicMock, None, None]:
+    with patch("app.utils.send_email", return_value=None) as mock:
+        yield mock
+
+
+def _reload(db: Session, email: EmailOutbox) -> EmailOutbox:
+    db.expire_all()
+    reloaded = db.get(EmailOutbox, email.id)
+    assert reloaded
+    return reloaded
+
+
+@pytest.mark.usefixtures("outbox")
+def test_route_enqueues_without_sending(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    send_email: MagicMock,
+) -> None:
+    """路由只排入郵件，不在請求中連線 SMTP"""
+    with patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"):
+        r = client.post(
+            f"{settings.API_V1_STR}/utils/test-email/",
+            headers=superuser_token_headers,
+            params={"email_to": "outbox@example.com"},
+        )
+    assert r.status_code == 201
+    assert r.json() == {"message": "Test email sent"}
+    send_email.assert_not_called()
+    emails = db.exec(select(EmailOutbox)).all()
+    assert [(email.email_to, email.status) for email in emails] == [
+        ("outbox@example.com", "pending")
+    ]
+
+
+def test_worker_sends_due_email(
+    db: Session, outbox: EmailOutboxService, send_email: MagicMock
+) -> None:
+    email = outbox.enqueue("a@example.com", "subject", "<p>hi</p>")
+
+    assert EmailOutboxWorker().run_once() == 1
+
+    send_email.assert_called_once_with(
+        email_to="a@example.com", subject="subject", html_content="<p>hi</p>"
+    )
+    sent = _reload(db, email)
+    assert sent.status == "sent"
+    assert sent.attempts == 1
+    assert sent.sent_at is not None
+    assert EmailOutboxWorker().run_once() == 0
+
+
+@pytest.mark.usefixtures("outbox")
+def test_password_recovery_is_delivered(
+    client: TestClient, smtp_server: SMTPStandIn
+) -> None:
+    """從路由排入到 worker 以 SMTP 寄出，寄送與排隊時間都列入統計"""
+    email_metrics.reset()
+    r = client.post(
+        f"{settings.API_V1_STR}/password-recovery/{settings.FIRST_SUPERUSER}"
+    )
+    assert r.status_code == 200
+
+    assert EmailOutboxWorker().run_once() == 1
+
+    assert smtp_server.recipients == [settings.FIRST_SUPERUSER]
+    assert "Password recovery" in smtp_server.parsed()["Subject"]
+    stats = email_metrics.stats()
+    assert stats["sent"] == 1
+    assert stats["queue_time"]["count"] == 1
+    assert stats["render_latency"]["reset_password.html"]["count"] == 1
+    email_metrics.reset()
+
+
+def test_failed_email_is_retried_later(
+    db: Session, outbox: EmailOutboxService, send_email: MagicMock
+) -> None:
+    send_email.side_effect = EmailSendError("421 try again")
+    email = outbox.enqueue("a@example.com", "subject", "body")
+
+    assert EmailOutboxWorker().run_once() == 1
+
+    failed = _reload(db, email)
+    assert failed.status == "pending"
+    assert failed.attempts == 1
+    assert failed.last_error == "421 try again"
+    assert failed.locked_until is None
+    assert failed.next_attempt_at > datetime.now(timezone.utc)
+    # 尚未到期的郵件不會被領取
+    assert EmailOutboxWorker().run_once() == 0
+
+
+def test_email_is_dead_after_max_attempts(
+    db: Session, outbox: EmailOutboxService, send_email: MagicMock
+) -> None:
+    send_email.side_effect = EmailSendError("550 no such user")
+    email = outbox.enqueue("a@example.com", "subject", "body")
+
+    with patch("app.core.config.settings.EMAIL_OUTBOX_MAX_ATTEMPTS", 2):
+        worker = EmailOutboxWorker()
+        assert worker.run_once() == 1
+        retried = _reload(db, email)
+        retried.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.commit()
+        assert worker.run_once() == 1
+
+    dead = _reload(db, email)
+    assert dead.status == "dead"
+    assert dead.attempts == 2
+    assert dead.last_error == "550 no such user"
+    assert outbox.stats() == {"dead": 1}
+
+
+def test_locked_rows_are_skipped(
+    db: Session, outbox: EmailOutboxService, send_email: MagicMock
+) -> None:
+    """另一個 worker 鎖定中的郵件會被略過，而不是等待鎖釋放"""
+    locked = outbox.enqueue("locked@example.com", "subject", "body")
+    free = outbox.enqueue("free@example.com", "subject", "body")
+
+    with Session(engine) as other:
+        other.exec(
+            select(EmailOutbox).where(EmailOutbox.id == locked.id).with_for_update()
+        ).one()
+        assert EmailOutboxWorker().run_once() == 1
+        other.rollback()
+
+    send_email.assert_called_once()
+    assert send_email.call_args.kwargs["email_to"] == "free@example.com"
+    assert _reload(db, free).status == "sent"
+    assert _reload(db, locked).status == "pending"
+
+
+def test_expired_lease_is_reclaimed(
+    db: Session, outbox: EmailOutboxService, send_email: MagicMock
+) -> None:
+    """領取後中止的 worker 留下的郵件，在租約逾期後由其他 worker 重新寄送"""
+    email = outbox.enqueue("a@example.com", "subject", "body")
+    stale = _reload(db, email)
+    stale.status = "sending"
+    stale.attempts = 1
+    stale.locked_until = datetime.now(timezone.utc) + timedelta(minutes=5)
+    db.commit()
+
+    assert EmailOutboxWorker().run_once() == 0
+
+    stale = _reload(db, email)
+    stale.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+
+    assert EmailOutboxWorker().run_once() == 1
+    reclaimed = _reload(db, email)
+    assert reclaimed.status == "sent"
+    assert reclaimed.attempts == 2
+    send_email.assert_called_once()
+
+
+def test_lease_is_renewed_before_each_send(
+    outbox: EmailOutboxService, send_email: MagicMock
+) -> None:
+    """整批依序寄送可能超過租約，每封寄送前都延長租約"""
+    for i in range(2):
+        outbox.enqueue(f"{i}@example.com", "subject", "body")
+    # 每次寄送時所有郵件的租約
+    leases: list[dict[str, datetime | None]] = []
+
+    def record_leases(**_kwargs: Any) -> None:
+        with Session(engine) as other:
+            emails = other.exec(select(EmailOutbox)).all()
+            leases.append({email.email_to: email.locked_until for email in emails})
+        time.sleep(0.01)
+
+    send_email.side_effect = record_leases
+    assert EmailOutboxWorker().run_once() == 2
+
+    claimed, renewed = leases[0]["1@example.com"], leases[1]["1@example.com"]
+    assert claimed is not None and renewed is not None
+    assert renewed > claimed
+
+
+def test_reclaimed_email_is_left_to_new_owner(
+    db: Session, outbox: EmailOutboxService, send_email: MagicMock
+) -> None:
+    """租約被其他 worker 接手後，原 worker 不寄送也不覆寫狀態"""
+    first = outbox.enqueue("a@example.com", "subject", "body")
+    second = outbox.enqueue("b@example.com", "subject", "body")
+    taken_over = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    def take_over(**_kwargs: Any) -> None:
+        # 模擬寄送第一封期間租約逾期，兩封都被另一個 worker 重新領取
+        with Session(engine) as other:
+            for email in other.exec(select(EmailOutbox)).all():
+                email.locked_until = taken_over
+            other.commit()
+
+    send_email.side_effect = take_over
+    assert EmailOutboxWorker().run_once() == 2
+
+    send_email.assert_called_once()
+    for email in (first, second):
+        reloaded = _reload(db, email)
+        assert reloaded.status == "sending"
+        assert reloaded.locked_until == taken_over
+        assert reloaded.sent_at is None
+
+
+def test_claim_order_and_batch_size(
+    db: Session,
+    outbox: EmailOutboxService,
+    send_email: MagicMock,
+) -> None:
+    for i in range(3):
+        outbox.enqueue(f"{i}@example.com", "subject", "body")
+
+    assert EmailOutboxWorker().run_once(batch_size=2) == 2
+    assert [call.kwargs["email_to"] for call in send_email.call_args_list] == [
+        "0@example.com",
+        "1@example.com",
+    ]
+    statuses = db.exec(
+        select(EmailOutbox.status).order_by(col(EmailOutbox.created_at))
+    ).all()
+    assert statuses == ["sent", "sent", "pending"]
+
+
+def test_backoff_grows_exponentially_up_to_limit() -> None:
+    base = settings.EMAIL_OUTBOX_BACKOFF_SECONDS
+    assert base / 2 <= backoff_seconds(1) <= base
+    assert base * 2 <= backoff_seconds(3) <= base * 4
+    limit = settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS
+    assert limit / 2 <= backoff_seconds(30) <= limit
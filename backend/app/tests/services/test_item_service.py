@@ -2,6 +2,9 @@
 測試 ItemService 功能
 """
 
+import uuid
+
+import pytest
 from sqlmodel import Session
 
 from app.services.item import ItemService
@@ -147,3 +150,86 @@ def test_get_multi(db: Session) -> None:
     # 獲取項目並檢查數量
     items = item_service.get_multi_by_owner(owner_id=user.id, skip=0, limit=10)
     assert len(items) >= items_count  # 可能有其他測試的項目
+
+
+def test_count_by_owner(db: Session) -> None:
+    """測試計算特定用戶的項目數量"""
+    user = UserService(db).create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    item_service = ItemService(db)
+    assert item_service.count_by_owner(user.id) == 0
+
+    for _ in range(3):
+        item_in = ItemCreate(title=random_lower_string())
+        item_service.create(item_in=item_in, owner_id=user.id)
+
+    assert item_service.count_by_owner(user.id) == 3
+
+
+def test_get_page_with_count(db: Session) -> None:
+    """測試以單一查詢取得分頁與總數"""
+    user = UserService(db).create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    item_service = ItemService(db)
+    for _ in range(5):
+        item_in = ItemCreate(title=random_lower_string())
+        item_service.create(item_in=item_in, owner_id=user.id)
+
+    items, count, count_exact = item_service.get_page(skip=1, limit=2, owner_id=user.id)
+    assert len(items) == 2
+    assert count == 5
+    assert count_exact
+
+    items, count, _ = item_service.get_page(skip=10, limit=2, owner_id=user.id)
+    assert items == []
+    assert count == 5
+
+    items, count, _ = item_service.get_page(
+        skip=0, limit=2, owner_id=user.id, include_count=False
+    )
+    assert len(items) == 2
+    assert count is None
+
+
+def test_update_item_not_owner(db: Session) -> None:
+    """測試更新他人物品時拒絕，更新不存在的物品時回傳 None"""
+    user_service = UserService(db)
+    owner = user_service.create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    other = user_service.create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    item_service = ItemService(db)
+    item = item_service.create(ItemCreate(title="Mine"), owner_id=owner.id)
+
+    with pytest.raises(ValueError):
+        item_service.update(item.id, ItemUpdate(title="Stolen"), other)
+    stored = item_service.get(item.id)
+    assert stored is not None
+    assert stored.title == "Mine"
+    assert item_service.update(uuid.uuid4(), ItemUpdate(title="X"), owner) is None
+
+
+def test_delete_item_not_owner(db: Session) -> None:
+    """測試刪除他人物品時拒絕，刪除不存在的物品時回傳 None"""
+    user_service = UserService(db)
+    owner = user_service.create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    other = user_service.create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+    item_service = ItemService(db)
+    item = item_service.create(ItemCreate(title="Mine"), owner_id=owner.id)
+
+    with pytest.raises(ValueError):
+        item_service.delete(item.id, other)
+    assert item_service.get(item.id)
+
+    deleted = item_service.delete(item.id, owner)
+    assert deleted
+    assert deleted.title == "Mine"
+    assert item_service.delete(item.id, owner) is None
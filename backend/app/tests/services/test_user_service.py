@@ -2,7 +2,10 @@
 測試 UserService 功能
 """
 
+from unittest.mock import patch
+
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
 from sqlmodel import Session
 
 from app.services.user import UserService
@@ -170,3 +173,34 @@ def test_count_users(db: Session) -> None:
 
     final_count = UserService(db).count()
     assert final_count == initial_count + 3
+
+
+def test_count_total_small_table_is_exact(db: Session) -> None:
+    """測試小型資料表即使允許估計值也回傳精確計數"""
+    user_service = UserService(db)
+    count, count_exact = user_service.count_total(approximate=True)
+    assert count_exact
+    assert count == user_service.count()
+
+
+def test_count_total_uses_estimate_above_threshold(db: Session) -> None:
+    """測試估計值達到 APPROXIMATE_COUNT_MIN_ROWS 時改用 pg_class.reltuples"""
+    db.execute(text('ANALYZE "user"'))
+    reltuples = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = '\"user\"'::regclass")
+    ).scalar_one()
+    user_service = UserService(db)
+    # ANALYZE 之後新增的用戶不會反映在估計值中
+    user_service.create(
+        UserCreate(email=random_email(), password=random_lower_string())
+    )
+
+    with patch("app.core.config.settings.APPROXIMATE_COUNT_MIN_ROWS", reltuples):
+        assert user_service.count_total(approximate=True) == (reltuples, False)
+        users, count, count_exact = user_service.get_page(limit=1, approximate=True)
+        assert (count, count_exact) == (reltuples, False)
+        assert len(users) == 1
+        assert user_service.count_total() == (reltuples + 1, True)
+
+    with patch("app.core.config.settings.APPROXIMATE_COUNT_MIN_ROWS", reltuples + 1):
+        assert user_service.count_total(approximate=True) == (reltuples + 1, True)
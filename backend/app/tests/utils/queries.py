@@ -0,0 +1,37 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app.core.config import settings
+from app.core.query_stats import QueryStats, query_recorder
+
+
+@contextmanager
+def assert_query_budget(
+    max_queries: int, repeated_threshold: int | None = None
+) -> Iterator[list[QueryStats]]:
+    """
+    檢查區塊內完成的每個請求最多執行 max_queries 個 SQL 語句，且沒有 N+1 查詢
+
+    Args:
+        max_queries: 每個請求的語句數量上限
+        repeated_threshold: 相同語句的執行次數上限（不含），
+            預設為 QUERY_STATS_REPEATED_THRESHOLD
+
+    Yields:
+        區塊內各請求的 SQL 統計
+    """
+    threshold = repeated_threshold or settings.QUERY_STATS_REPEATED_THRESHOLD
+    recorded: list[QueryStats] = []
+    query_recorder.add_listener(recorded.append)
+    try:
+        yield recorded
+    finally:
+        query_recorder.remove_listener(recorded.append)
+    assert recorded, "no request finished inside the query budget block"
+    for stats in recorded:
+        assert stats.statements <= max_queries, (
+            f"{stats.statements} queries exceed the budget of {max_queries}: "
+            f"{dict(stats.fingerprints)}"
+        )
+        repeated = stats.repeated(threshold)
+        assert not repeated, f"repeated queries (N+1?): {repeated}"
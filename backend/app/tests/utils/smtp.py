@@ -0,0 +1,79 @@
+import socket
+from collections.abc import Iterator
+from contextlib import contextmanager
+from email import message_from_bytes
+from email.message import Message
+from typing import Any
+from unittest.mock import patch
+
+from aiosmtpd.controller import Controller
+
+from app.core.smtp import SMTPPool
+
+
+class SMTPStandIn:
+    """
+    在本行程中執行的 SMTP 伺服器，收下的郵件保留在 messages 中
+
+    以 refused@ 開頭的收件者會被拒絕（550），用於測試寄送失敗的路徑。
+    """
+
+    def __init__(self) -> None:
+        self.messages: list[Any] = []
+        # 測試期間 app.utils 使用的連線池
+        self.pool = SMTPPool(max_idle=2)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port: int = sock.getsockname()[1]
+        self._controller = Controller(self, hostname="127.0.0.1", port=self.port)
+
+    async def handle_RCPT(
+        self,
+        _server: Any,
+        _session: Any,
+        envelope: Any,
+        address: str,
+        _rcpt_options: list[str],
+    ) -> str:
+        if address.startswith("refused@"):
+            return "550 no such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, _server: Any, _session: Any, envelope: Any) -> str:
+        self.messages.append(envelope)
+        return "250 OK"
+
+    @property
+    def recipients(self) -> list[str]:
+        """依收到順序排列的所有收件者"""
+        return [address for message in self.messages for address in message.rcpt_tos]
+
+    def parsed(self, index: int = -1) -> Message:
+        """將收到的郵件解析為 email.message.Message"""
+        return message_from_bytes(self.messages[index].content)
+
+    @contextmanager
+    def running(self) -> Iterator["SMTPStandIn"]:
+        """
+        啟動伺服器，並讓 SMTP_* 設定與 app.utils 的連線池指向它
+
+        Yields:
+            伺服器本身
+        """
+        self._controller.start()
+        try:
+            with (
+                patch("app.core.config.settings.SMTP_HOST", "127.0.0.1"),
+                patch("app.core.config.settings.SMTP_PORT", self.port),
+                patch("app.core.config.settings.SMTP_TLS", False),
+                patch("app.core.config.settings.SMTP_SSL", False),
+                patch("app.core.config.settings.SMTP_USER", None),
+                patch("app.core.config.settings.SMTP_PASSWORD", None),
+                patch("app.core.config.settings.EMAILS_FROM_EMAIL", "from@example.com"),
+                patch("app.utils.smtp_pool", self.pool),
+            ):
+                yield self
+        finally:
+            self.pool.close()
+            self._controller.stop()
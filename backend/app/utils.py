@@ -1,21 +1,28 @@
 import logging
+import smtplib
+import time
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
 from typing import Any
 
 import emails  # type: ignore
 import jwt
-from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
 
-from app.core import security
+from app.core import email_templates, security
 from app.core.config import settings
+from app.core.email_metrics import email_metrics
+from app.core.smtp import Envelope, smtp_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class EmailSendError(Exception):
+    """SMTP 伺服器拒絕或無法寄出郵件"""
+
+
 @dataclass
 class EmailData:
     html_content: str
@@ -23,36 +30,87 @@ class EmailData:
 
 
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
+    start = time.perf_counter()
+    html_content = email_templates.get_template(template_name).render(context)
+    email_metrics.record_render(template_name, time.perf_counter() - start)
     return html_content
 
 
+def _envelope(email_to: str, subject: str, html_content: str) -> Envelope:
+    assert settings.emails_enabled, "no provided configuration for email variables"
+    message = emails.Message(
+        subject=subject,
+        html=html_content,
+        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+        mail_to=email_to,
+    )
+    return Envelope(
+        mail_from=str(settings.EMAILS_FROM_EMAIL),
+        recipients=[email_to],
+        message=message.as_bytes(),
+    )
+
+
 def send_email(
     *,
     email_to: str,
     subject: str = "",
     html_content: str = "",
 ) -> None:
-    assert settings.emails_enabled, "no provided configuration for email variables"
-    message = emails.Message(
-        subject=subject,
-        html=html_content,
-        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+    envelope = _envelope(email_to, subject, html_content)
+    start = time.perf_counter()
+    try:
+        smtp_pool.send(envelope)
+    except (smtplib.SMTPException, OSError) as e:
+        email_metrics.record_send(time.perf_counter() - start, success=False)
+        raise EmailSendError(f"sending email to {email_to} failed: {e!r}") from e
+    seconds = time.perf_counter() - start
+    email_metrics.record_send(seconds, success=True)
+    logger.info(f"sent email to {email_to} in {seconds * 1000:.1f} ms")
+
+
+def send_emails(
+    messages: Sequence[tuple[str, EmailData]],
+) -> list[EmailSendError | None]:
+    """
+    以同一條 SMTP 連線寄送多封郵件
+
+    Args:
+        messages: 收件者與郵件內容
+
+    Returns:
+        與 messages 對應的錯誤，寄送成功為 None
+
+    Raises:
+        EmailSendError: 無法連線到 SMTP 伺服器
+    """
+    envelopes = [
+        _envelope(email_to, data.subject, data.html_content)
+        for email_to, data in messages
+    ]
+    start = time.perf_counter()
+    try:
+        errors = smtp_pool.send_many(envelopes)
+    except OSError as e:
+        # 無法確定哪些郵件已寄出，整批計為失敗
+        seconds = time.perf_counter() - start
+        for _ in envelopes:
+            email_metrics.record_send(seconds / len(envelopes), success=False)
+        raise EmailSendError(f"connecting to SMTP server failed: {e!r}") from e
+    seconds = time.perf_counter() - start
+    # 同一批郵件共用連線，每封的耗時以平均值記錄
+    for error in errors:
+        email_metrics.record_send(seconds / len(errors), success=error is None)
+    logger.info(
+        f"sent {errors.count(None)} of {len(envelopes)} emails in one SMTP session "
+        f"in {seconds * 1000:.1f} ms"
     )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
-    logger.info(f"send email result: {response}")
+    return [
+        EmailSendError(f"sending email to {email_to} failed: {error!r}")
+        if error
+        else None
+        for (email_to, _), error in zip(messages, errors, strict=True)
+    ]
 
 
 def generate_test_email(email_to: str) -> EmailData:
@@ -100,6 +158,14 @@ def generate_new_account_email(
     return EmailData(html_content=html_content, subject=subject)
 
 
+def generate_broadcast_email(subject: str, message: str) -> EmailData:
+    html_content = render_email_template(
+        template_name="broadcast.html",
+        context={"project_name": settings.PROJECT_NAME, "message": message},
+    )
+    return EmailData(html_content=html_content, subject=subject)
+
+
 def generate_password_reset_token(email: str) -> str:
     delta = timedelta(hours=settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS)
     now = datetime.now(timezone.utc)